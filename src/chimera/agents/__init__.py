@@ -1,7 +1,14 @@
 """Agent implementations for the Hierarchical Swarm Architecture."""
 
 from .planner import PlannerAgent
-from .workers import WorkerAgent
+from .workers import ContentWorker, DeliveryWorker, EconomicWorker, TrendWorker
 from .judge import JudgeAgent
 
-__all__ = ["PlannerAgent", "WorkerAgent", "JudgeAgent"]
+__all__ = [
+    "PlannerAgent",
+    "TrendWorker",
+    "ContentWorker",
+    "EconomicWorker",
+    "DeliveryWorker",
+    "JudgeAgent",
+]
@@ -1,27 +1,151 @@
 """Judge Agent - Symbolic Guardian for safety and quality validation."""
 
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+from chimera.core.security import (
+    APPROVE_THRESHOLD,
+    FLAG_THRESHOLD,
+    GuardianRuleEngine,
+)
+
+BATCH_CHUNK_SIZE = 32
+
+VALIDATOR_CATEGORIES = {
+    "brand_safety": "brand_score",
+    "security": "security_score",
+    "compliance": "compliance_score",
+}
+
+
+def _is_auto_reject(violation: dict) -> bool:
+    """Critical rules whose action is reject (JUDGE-001/003/007) reject outright."""
+    return violation["severity"] == "critical" and violation["action"] == "reject"
+
+
+def _validation(category: str, result: dict) -> dict:
+    """One validator's share of a Guardian evaluation."""
+    return {
+        "validator": category,
+        "score": result["scores"][VALIDATOR_CATEGORIES[category]],
+        "violations": [v for v in result["violations"] if v["category"] == category],
+    }
+
 
 class JudgeAgent:
-    """Validates content against symbolic rules before human approval."""
+    """Validates content against symbolic rules before human approval.
 
-    def __init__(self) -> None:
-        pass
+    ``evaluate`` scans the content once against every rule and splits the
+    violations into the three validators' results. The scan holds the GIL
+    throughout, so it runs inline: a thread per validator only made it
+    slower. An auto-reject violation in the scan decides the outcome. Each
+    decision reports the scan time and, per validator, how many rules fired
+    and how many matches they had.
+    """
+
+    def __init__(self, engine: GuardianRuleEngine | None = None) -> None:
+        self.engine = engine if engine is not None else GuardianRuleEngine()
 
-    async def validate_brand_safety(self, content: dict) -> dict:
+    async def _validate(self, category: str, content: dict, artifact_type: str) -> dict:
+        result = self.engine.evaluate(artifact_type, content, frozenset((category,)))
+        return _validation(category, result)
+
+    async def validate_brand_safety(self, content: dict, artifact_type: str = "content") -> dict:
         """Validate content against brand safety rules."""
-        pass
+        return await self._validate("brand_safety", content, artifact_type)
 
-    async def validate_security(self, content: dict) -> dict:
+    async def validate_security(self, content: dict, artifact_type: str = "content") -> dict:
         """Validate content against security rules."""
-        pass
+        return await self._validate("security", content, artifact_type)
 
-    async def validate_compliance(self, content: dict) -> dict:
+    async def validate_compliance(self, content: dict, artifact_type: str = "content") -> dict:
         """Validate content against compliance rules."""
-        pass
+        return await self._validate("compliance", content, artifact_type)
+
+    async def evaluate(self, judge_input: dict, artifact_type: str = "content") -> dict:
+        """Scan once, split the result per validator and decide."""
+        started = time.perf_counter()
+        content = judge_input.get("content", judge_input)
+        result = self.engine.evaluate(artifact_type, content)
+        scanned = time.perf_counter()
+        critical = next((v for v in result["violations"] if _is_auto_reject(v)), None)
+        validations = [_validation(category, result) for category in VALIDATOR_CATEGORIES]
+        decision = await self.make_decision(validations)
+        decision.update(
+            contentId=judge_input.get("contentId"),
+            first_critical_rule=critical["rule_id"] if critical is not None else None,
+            validator_counts={
+                validation["validator"]: {
+                    "violations": len(validation["violations"]),
+                    "hits": sum(violation["hits"] for violation in validation["violations"]),
+                }
+                for validation in validations
+            },
+            scan_ms=round((scanned - started) * 1000, 3),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+        return decision
+
+    async def evaluate_batch(
+        self,
+        variants: list[dict],
+        artifact_type: str = "content",
+        chunk_size: int = BATCH_CHUNK_SIZE,
+    ) -> AsyncIterator[dict]:
+        """Evaluate campaign variants, yielding each decision as its chunk finishes.
+
+        All variants are scanned against one rule snapshot, with the same
+        results as :meth:`evaluate`; fields shared across variants go through
+        the keyword pass once. Every decision carries the variant's position
+        in ``variant_index``.
+        """
+        scanner = self.engine.batch()
+        for first in range(0, len(variants), chunk_size):
+            chunk = variants[first : first + chunk_size]
+            results = [scanner.evaluate(artifact_type, variant.get("content", variant)) for variant in chunk]
+            for offset, (variant, result) in enumerate(zip(chunk, results)):
+                validations = [_validation(category, result) for category in VALIDATOR_CATEGORIES]
+                decision = await self.make_decision(validations)
+                decision.update(variant_index=first + offset, contentId=variant.get("contentId"))
+                yield decision
+            # Let other tasks run between chunks of a large campaign.
+            await asyncio.sleep(0)
+
+    async def rank_variants(self, variants: list[dict], artifact_type: str = "content") -> list[dict]:
+        """Decisions for all variants, best ``overall_score`` first (ties keep input order)."""
+        decisions = [decision async for decision in self.evaluate_batch(variants, artifact_type)]
+        decisions.sort(key=lambda decision: (-decision["scores"]["overall_score"], decision["variant_index"]))
+        return decisions
 
     async def make_decision(self, validations: list[dict]) -> dict:
         """Make final decision based on all validations."""
-        pass
+        scores = {key: None for key in VALIDATOR_CATEGORIES.values()}
+        violations = []
+        for validation in validations:
+            scores[VALIDATOR_CATEGORIES[validation["validator"]]] = validation["score"]
+            violations.extend(validation["violations"])
+        completed = [score for score in scores.values() if score is not None]
+        overall = round(sum(completed) / len(completed), 4) if completed else 0.0
+        scores["overall_score"] = overall
+
+        actions = {violation["action"] for violation in violations}
+        if any(_is_auto_reject(violation) for violation in violations) or overall < FLAG_THRESHOLD:
+            clearance = "rejected"
+        elif overall < APPROVE_THRESHOLD or actions & {"flag", "escalate"}:
+            clearance = "flagged"
+        else:
+            clearance = "approved"
+        return {
+            "scores": scores,
+            "clearance": clearance,
+            "violations": violations,
+            "recommendations": [
+                f"Revise content to resolve {violation['rule_id']}"
+                + (f": {violation['description']}" if violation["description"] else "")
+                for violation in violations
+            ],
+        }
 
     async def escalate(self, content: dict, reason: str) -> dict:
         """Escalate content to human governor."""
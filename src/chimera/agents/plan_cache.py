@@ -0,0 +1,165 @@
+"""Goal templating and memoised plan decomposition.
+
+Goals are normalised into a template plus bindings: platforms, quoted
+subjects, hashtags, handles, URLs and numbers become numbered slots, so
+"Respond to trend 'AI art' on TikTok" and "respond to trend \"lo-fi beats\" on
+YouTube" share the template ``respond to trend {subject_0} on {platform_0}``.
+Decomposed plans are cached per template with their slots left in place and
+instantiated by substituting a goal's bindings.
+
+The cache is an in-memory LRU with a TTL, backed by an optional SQLite file so
+that templates survive restarts.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+DEFAULT_CAPACITY = 1024
+DEFAULT_TTL = 24 * 3600.0
+
+PLATFORMS = ("tiktok", "youtube", "twitter", "instagram")
+
+# Order matters: earlier slots are extracted before later ones can match inside them.
+_SLOT_PATTERNS = (
+    ("url", re.compile(r"https?://\S+")),
+    ("subject", re.compile(r"\"([^\"]+)\"|'([^']+)'|“([^”]+)”")),
+    ("hashtag", re.compile(r"#\w+")),
+    ("handle", re.compile(r"@\w+")),
+    ("platform", re.compile(r"\b(" + "|".join(PLATFORMS) + r")\b", re.IGNORECASE)),
+    ("number", re.compile(r"\b\d+(?:\.\d+)?\b")),
+)
+_PLACEHOLDER = re.compile(r"\{(\w+_\d+)\}")
+_SPACES = re.compile(r"\s+")
+
+
+def normalise_goal(goal: str) -> tuple[str, dict[str, str]]:
+    """Split ``goal`` into a lower-case template and the values of its slots."""
+    bindings: dict[str, str] = {}
+    text = goal.replace("{", "(").replace("}", ")")
+    for kind, pattern in _SLOT_PATTERNS:
+        count = 0
+
+        def slot(match: re.Match, kind: str = kind) -> str:
+            nonlocal count
+            value = next((group for group in match.groups() if group), match.group(0))
+            if kind == "platform":
+                value = value.lower()
+            name = f"{kind}_{count}"
+            count += 1
+            bindings[name] = value
+            return "{" + name + "}"
+
+        text = pattern.sub(slot, text)
+    return _SPACES.sub(" ", text).strip().lower(), bindings
+
+
+def instantiate(plan: Any, bindings: dict[str, str]) -> Any:
+    """Copy ``plan`` with every ``{slot}`` in its strings replaced from ``bindings``."""
+    if isinstance(plan, str):
+        if "{" not in plan:
+            return plan
+        return _PLACEHOLDER.sub(lambda m: bindings.get(m.group(1), m.group(0)), plan)
+    if isinstance(plan, dict):
+        return {key: instantiate(value, bindings) for key, value in plan.items()}
+    if isinstance(plan, list):
+        return [instantiate(value, bindings) for value in plan]
+    return plan
+
+
+class PlanTemplateCache:
+    """LRU + TTL cache of decomposed plan templates with an optional SQLite store."""
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        ttl: float = DEFAULT_TTL,
+        path: str | None = None,
+    ) -> None:
+        self.capacity = capacity
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS plan_templates "
+                "(template TEXT PRIMARY KEY, plan TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, template: str) -> Any | None:
+        """The cached plan for ``template``, or None if absent or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(template)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._entries.move_to_end(template)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[template]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT plan, stored_at FROM plan_templates WHERE template = ?", (template,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    plan = json.loads(row[0])
+                    self._remember(template, row[1], plan)
+                    self.hits += 1
+                    return plan
+            self.misses += 1
+            return None
+
+    def put(self, template: str, plan: Any) -> None:
+        stored_at = time.time()
+        with self._lock:
+            self._remember(template, stored_at, plan)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO plan_templates VALUES (?, ?, ?)",
+                    (template, json.dumps(plan), stored_at),
+                )
+                self._db.commit()
+
+    def _remember(self, template: str, stored_at: float, plan: Any) -> None:
+        self._entries[template] = (stored_at, plan)
+        self._entries.move_to_end(template)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Drop expired templates from memory and the store; return how many were removed."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [key for key, (stored_at, _) in self._entries.items() if stored_at <= cutoff]
+            for key in expired:
+                del self._entries[key]
+            removed = len(expired)
+            if self._db is not None:
+                cursor = self._db.execute("DELETE FROM plan_templates WHERE stored_at <= ?", (cutoff,))
+                self._db.commit()
+                removed = max(removed, cursor.rowcount)
+        return removed
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "ttl": self.ttl,
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,20 +1,150 @@
 """Planner Agent - Strategic goal decomposition and resource allocation."""
 
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from chimera.core.singleflight import SingleFlight
+
+from .plan_cache import PlanTemplateCache, instantiate, normalise_goal
+from .scheduling import DEFAULT_AGENT_CONCURRENCY, CancellationScope, TaskGraph, execute, list_schedule
+
+Decomposer = Callable[[str], Awaitable[list[dict]]]
+
+
+def _step(step_id: str, agent: str, action: str, duration: float, depends_on: list[str], **parameters: Any) -> dict:
+    return {
+        "id": step_id,
+        "agent": agent,
+        "action": action,
+        "duration": duration,
+        "depends_on": depends_on,
+        "parameters": parameters,
+    }
+
+
+async def pattern_decomposer(template: str) -> list[dict]:
+    """Decompose a goal template along the workflow patterns in specs/agent_rules.md.
+
+    Works on the template, not the goal, so the slots it copies into step
+    parameters are filled in per goal when the cached plan is instantiated.
+    """
+    platform = "{platform_0}" if "{platform_0}" in template else None
+    subject = next(
+        ("{" + slot + "}" for slot in ("subject_0", "hashtag_0") if "{" + slot + "}" in template),
+        template,
+    )
+    if "campaign" in template:
+        return [
+            _step("schedule", "planner-001", "create_campaign_schedule", 1, [], goal=template),
+            _step("variants", "content-worker-001", "generate_script", 5, ["schedule"], topic=subject, platform=platform),
+            _step("judge", "judge-001", "evaluate_batch", 0.5, ["variants"]),
+            _step("select", "planner-001", "select_variants", 0.2, ["judge"]),
+            _step("publish", "delivery-worker-001", "upload_video", 3, ["select"], platform=platform),
+        ]
+    steps = []
+    if "trend" in template:
+        steps.append(_step("detect", "trend-worker-001", "discover_trends", 2, [], topic=subject, platform=platform))
+    steps += [
+        _step("generate", "content-worker-001", "generate_script", 5, [s["id"] for s in steps], topic=subject, platform=platform),
+        _step("judge", "judge-001", "evaluate", 0.5, ["generate"]),
+        _step("publish", "delivery-worker-001", "upload_video", 3, ["judge"], platform=platform),
+    ]
+    return steps
+
 
 class PlannerAgent:
-    """Orchestrates high-level goal decomposition and resource allocation."""
+    """Orchestrates high-level goal decomposition and resource allocation.
 
-    def __init__(self) -> None:
-        pass
+    ``concurrency_caps`` maps an agent id to how many of its tasks may run at
+    once (PLAN-002); agents not listed get ``default_concurrency``.
+    """
+
+    def __init__(
+        self,
+        concurrency_caps: dict[str, int] | None = None,
+        default_concurrency: int = DEFAULT_AGENT_CONCURRENCY,
+        decomposer: Decomposer = pattern_decomposer,
+        plan_cache: PlanTemplateCache | None = None,
+    ) -> None:
+        self.concurrency_caps = dict(concurrency_caps or {})
+        self.default_concurrency = default_concurrency
+        self.decomposer = decomposer
+        self.plan_cache = plan_cache if plan_cache is not None else PlanTemplateCache()
+        self._decomposing: SingleFlight[list[dict]] = SingleFlight()
 
     async def decompose_goal(self, goal: str) -> dict:
-        """Decompose a high-level goal into actionable tasks."""
-        pass
+        """Decompose a high-level goal into actionable tasks.
+
+        The decomposer runs once per goal template; repeats of the same shape
+        instantiate the cached plan with their own bindings. Concurrent misses
+        on one template share a single decomposition.
+        """
+        template, bindings = normalise_goal(goal)
+        steps = self.plan_cache.get(template)
+        cached = steps is not None
+        if not cached:
+            steps, _ = await self._decomposing.do(template, lambda: self._decompose(template))
+        return {
+            "goal": goal,
+            "template": template,
+            "bindings": bindings,
+            "cached": cached,
+            "tasks": instantiate(steps, bindings),
+        }
+
+    async def _decompose(self, template: str) -> list[dict]:
+        steps = await self.decomposer(template)
+        TaskGraph(steps)  # never cache a plan that cannot be scheduled
+        self.plan_cache.put(template, steps)
+        return steps
 
     async def allocate_resources(self, tasks: list[dict]) -> dict:
         """Allocate resources to tasks based on priority."""
-        pass
+        graph = TaskGraph(tasks)
+        timeline, makespan = list_schedule(graph, self.concurrency_caps, self.default_concurrency)
+        peaks: dict[str, int] = {}
+        events = sorted(
+            [(entry["start"], 1, entry["agent"]) for entry in timeline]
+            + [(entry["end"], -1, entry["agent"]) for entry in timeline]
+        )
+        running: dict[str, int] = {}
+        for _, delta, agent in events:
+            running[agent] = running.get(agent, 0) + delta
+            peaks[agent] = max(peaks.get(agent, 0), running[agent])
+        return {
+            "agentAssignments": [
+                {"agentId": entry["agent"], "stepId": entry["id"]} for entry in timeline
+            ],
+            "estimatedDuration": makespan,
+            "estimatedCost": sum(float(task.get("cost", 0.0)) for task in tasks),
+            "criticalPath": graph.critical_path(),
+            "criticalPathDuration": graph.critical_length,
+            "peakConcurrency": peaks,
+            "queuedSteps": [entry["id"] for entry in timeline if entry["queued"] > 0],
+        }
 
     async def create_timeline(self, tasks: list[dict]) -> list[dict]:
         """Create a timeline for task execution."""
-        pass
+        timeline, _ = list_schedule(TaskGraph(tasks), self.concurrency_caps, self.default_concurrency)
+        return timeline
+
+    async def execute_plan(
+        self,
+        tasks: list[dict],
+        run_task: Callable[[dict], Awaitable[Any]],
+        scope: CancellationScope | None = None,
+        on_fail_fast: Callable[[dict], Any] | None = None,
+    ) -> dict:
+        """Run ``tasks`` in dependency order, dispatching each as soon as it is ready.
+
+        A failure on the critical path cancels the rest of the plan (PLAN-005);
+        ``on_fail_fast`` is called with the cancellation report.
+        """
+        return await execute(
+            TaskGraph(tasks),
+            run_task,
+            self.concurrency_caps,
+            self.default_concurrency,
+            scope=scope,
+            on_fail_fast=on_fail_fast,
+        )
@@ -0,0 +1,425 @@
+"""DAG scheduling for planner workflows.
+
+Tasks are plain step dicts: an ``id``, the ``agent`` that runs it, an
+estimated ``duration`` in seconds, a ``priority`` and the ids it
+``depends_on``. :class:`TaskGraph` validates the graph once and computes each
+task's bottom level (the longest path from the task to the end of the plan),
+which yields the critical path. :func:`list_schedule` simulates the plan
+under per-agent concurrency caps (PLAN-002) and :func:`execute` runs it,
+starting each task as soon as its dependencies are done and a slot on its
+agent is free. Both pick ready tasks by priority first and then by the
+longest remaining path, so critical-path work is never starved by shorter
+branches.
+
+Each execution runs inside a :class:`CancellationScope`. When a task on the
+critical path fails, the scope cancels everything still in flight, nothing
+further is dispatched and the compensating hooks registered by tasks are run
+(PLAN-005: fail fast on critical path failures).
+"""
+
+import asyncio
+import heapq
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from contextvars import ContextVar
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+# Matches the max_concurrent_tasks an agent registers with by default.
+DEFAULT_AGENT_CONCURRENCY = 5
+DEFAULT_DURATION = 1.0
+UNASSIGNED = "unassigned"
+
+_ID_KEYS = ("id", "step_id", "stepId", "task_id")
+_DEPENDENCY_KEYS = ("depends_on", "dependencies", "dependsOn")
+_AGENT_KEYS = ("agent", "agent_id", "agentId")
+_DURATION_KEYS = ("duration", "estimated_duration", "estimatedDuration")
+
+
+class PlanError(ValueError):
+    """Raised when a plan's tasks do not form a valid dependency graph."""
+
+
+class PlanCycleError(PlanError):
+    """Raised when task dependencies contain a cycle."""
+
+    def __init__(self, cycle: list[str]) -> None:
+        self.cycle = cycle
+        super().__init__("dependency cycle: " + " -> ".join(cycle))
+
+
+def _first(task: dict, keys: tuple[str, ...], default: Any = None) -> Any:
+    for key in keys:
+        if key in task:
+            return task[key]
+    return default
+
+
+class TaskGraph:
+    """Validated dependency graph with topological order and bottom levels."""
+
+    def __init__(self, tasks: list[dict]) -> None:
+        self.tasks = tasks
+        self.ids: list[str] = []
+        self.index: dict[str, int] = {}
+        for position, task in enumerate(tasks):
+            task_id = _first(task, _ID_KEYS)
+            if task_id is None:
+                raise PlanError(f"task at position {position} has no id")
+            task_id = str(task_id)
+            if task_id in self.index:
+                raise PlanError(f"duplicate task id {task_id!r}")
+            self.index[task_id] = position
+            self.ids.append(task_id)
+
+        count = len(tasks)
+        self.agents = [str(_first(task, _AGENT_KEYS, UNASSIGNED)) for task in tasks]
+        self.durations = [float(_first(task, _DURATION_KEYS, DEFAULT_DURATION)) for task in tasks]
+        self.ranks = [PRIORITY_RANK.get(task.get("priority", "medium"), 2) for task in tasks]
+        self.successors: list[list[int]] = [[] for _ in range(count)]
+        self.predecessors: list[list[int]] = [[] for _ in range(count)]
+        for position, task in enumerate(tasks):
+            for dependency in _first(task, _DEPENDENCY_KEYS, ()) or ():
+                parent = self.index.get(str(dependency))
+                if parent is None:
+                    raise PlanError(f"task {self.ids[position]!r} depends on unknown {dependency!r}")
+                self.successors[parent].append(position)
+                self.predecessors[position].append(parent)
+
+        self.order = self._topological_order()
+        bottom = [0.0] * count
+        for node in reversed(self.order):
+            longest = 0.0
+            for child in self.successors[node]:
+                if bottom[child] > longest:
+                    longest = bottom[child]
+            bottom[node] = self.durations[node] + longest
+        self.bottom_levels = bottom
+        self.critical_length = max(bottom, default=0.0)
+        # Heap keys for ready tasks: priority, then longest remaining path, then input order.
+        self.ready_keys = [(self.ranks[n], -bottom[n], n) for n in range(count)]
+
+    def _topological_order(self) -> list[int]:
+        indegree = [len(parents) for parents in self.predecessors]
+        order = [node for node, degree in enumerate(indegree) if degree == 0]
+        for node in order:  # the list grows while we walk it
+            for child in self.successors[node]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    order.append(child)
+        if len(order) < len(self.tasks):
+            raise PlanCycleError(self._find_cycle(indegree))
+        return order
+
+    def _find_cycle(self, indegree: list[int]) -> list[str]:
+        # Every node left with indegree > 0 has a parent that is also left, so
+        # walking parents from any of them must revisit a node.
+        node = next(node for node, degree in enumerate(indegree) if degree > 0)
+        seen: dict[int, int] = {}
+        path: list[int] = []
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(parent for parent in self.predecessors[node] if indegree[parent] > 0)
+        cycle = [self.ids[n] for n in reversed(path[seen[node] :])]
+        return cycle + cycle[:1]
+
+    def earliest_starts(self) -> list[float]:
+        """Start times with unlimited agents: each task starts when its last parent ends."""
+        starts = [0.0] * len(self.tasks)
+        for node in self.order:
+            end = starts[node] + self.durations[node]
+            for child in self.successors[node]:
+                if end > starts[child]:
+                    starts[child] = end
+        return starts
+
+    def slacks(self) -> list[float]:
+        """How far each task can slip, with unlimited agents, before the plan gets longer."""
+        earliest = self.earliest_starts()
+        return [
+            max(0.0, self.critical_length - self.bottom_levels[n] - earliest[n])
+            for n in range(len(self.tasks))
+        ]
+
+    def critical_nodes(self) -> set[int]:
+        """Tasks with no slack, plus any task explicitly marked ``"critical": True``."""
+        return {
+            node
+            for node, slack in enumerate(self.slacks())
+            if slack < 1e-9 or self.tasks[node].get("critical") is True
+        }
+
+    def critical_path(self) -> list[str]:
+        """Task ids along the longest duration path through the plan."""
+        if not self.tasks:
+            return []
+        bottom = self.bottom_levels
+        node = max(
+            (n for n in range(len(self.tasks)) if not self.predecessors[n]), key=bottom.__getitem__
+        )
+        path = [node]
+        while self.successors[node]:
+            node = max(self.successors[node], key=bottom.__getitem__)
+            path.append(node)
+        return [self.ids[n] for n in path]
+
+
+def _agent_limits(
+    agents: Iterable[str], caps: dict[str, int] | None, default_cap: int
+) -> dict[str, int]:
+    # A cap below one would leave that agent's ready queue waiting forever.
+    limits = {agent: (caps or {}).get(agent, default_cap) for agent in agents}
+    for agent, cap in limits.items():
+        if cap <= 0:
+            raise ValueError(f"concurrency cap for agent {agent!r} must be positive, got {cap}")
+    return limits
+
+
+def list_schedule(
+    graph: TaskGraph, caps: dict[str, int] | None = None, default_cap: int = DEFAULT_AGENT_CONCURRENCY
+) -> tuple[list[dict], float]:
+    """Simulate the plan under per-agent caps; return per-task timings and the makespan."""
+    count = len(graph.tasks)
+    remaining = [len(parents) for parents in graph.predecessors]
+    ready_at = [0.0] * count
+    start = [0.0] * count
+    finishing: list[tuple[float, int]] = []
+    durations, agents, successors = graph.durations, graph.agents, graph.successors
+    keys = graph.ready_keys
+    ready: dict[str, list] = {agent: [] for agent in set(agents)}
+    running = dict.fromkeys(ready, 0)
+    limit = _agent_limits(ready, caps, default_cap)
+
+    dirty: set[str] = set()
+    for node in range(count):
+        if not remaining[node]:
+            ready[agents[node]].append(keys[node])
+            dirty.add(agents[node])
+    for queue in ready.values():
+        heapq.heapify(queue)
+
+    now = 0.0
+    while True:
+        for agent in dirty:
+            queue = ready[agent]
+            while queue and running[agent] < limit[agent]:
+                node = heapq.heappop(queue)[2]
+                running[agent] += 1
+                start[node] = now
+                heapq.heappush(finishing, (now + durations[node], node))
+        dirty.clear()
+        if not finishing:
+            break
+        now = finishing[0][0]
+        while finishing and finishing[0][0] == now:
+            node = heapq.heappop(finishing)[1]
+            running[agents[node]] -= 1
+            dirty.add(agents[node])
+            for child in successors[node]:
+                remaining[child] -= 1
+                if not remaining[child]:
+                    ready_at[child] = now
+                    heapq.heappush(ready[agents[child]], keys[child])
+                    dirty.add(agents[child])
+
+    makespan = max((start[n] + durations[n] for n in range(count)), default=0.0)
+    slacks = graph.slacks()
+    timeline = []
+    for node in range(count):
+        timeline.append(
+            {
+                "id": graph.ids[node],
+                "agent": agents[node],
+                "priority": graph.tasks[node].get("priority", "medium"),
+                "start": start[node],
+                "end": start[node] + durations[node],
+                "duration": durations[node],
+                "queued": start[node] - ready_at[node],
+                "slack": slacks[node],
+                "critical": slacks[node] < 1e-9,
+                "depends_on": [graph.ids[parent] for parent in graph.predecessors[node]],
+            }
+        )
+    timeline.sort(key=lambda entry: (entry["start"], graph.index[entry["id"]]))
+    return timeline, makespan
+
+
+class CancellationScope:
+    """Cancellation scope of one executing plan.
+
+    Code running inside a plan's task reaches the scope through
+    :func:`current_scope` to check :attr:`cancelled` or to register a
+    compensating hook with :meth:`on_cancel` (release a reservation, delete a
+    half-uploaded asset). :meth:`cancel` cancels every in-flight task, waits
+    for them to unwind and then runs the hooks, most recent first. Hooks of
+    tasks that already finished run too, so a step can hold a resource for
+    the rest of the plan and drop the hook once it is no longer needed.
+    """
+
+    def __init__(self) -> None:
+        self.cancelled = False
+        self.reason: str | None = None
+        self.cancellation_ms: float | None = None
+        self.hook_errors: list[BaseException] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._hooks: list[Callable[[], Any]] = []
+
+    def attach(self, task: asyncio.Task) -> None:
+        """Cancel ``task`` with the scope; it is forgotten once it finishes."""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def on_cancel(self, hook: Callable[[], Any]) -> Callable[[], None]:
+        """Run ``hook`` (sync or async) if the scope is cancelled; returns a remover."""
+        self._hooks.append(hook)
+
+        def remove() -> None:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+        return remove
+
+    async def cancel(self, reason: str = "cancelled") -> list[asyncio.Task]:
+        """Cancel the scope's in-flight tasks, run its hooks; return the tasks cancelled."""
+        if self.cancelled:
+            return []
+        self.cancelled = True
+        self.reason = reason
+        started = time.perf_counter()
+        current = asyncio.current_task()
+        cancelled = [task for task in self._tasks if not task.done() and task is not current]
+        for task in cancelled:
+            task.cancel()
+        await asyncio.gather(*cancelled, return_exceptions=True)
+        self.cancellation_ms = (time.perf_counter() - started) * 1000
+        while self._hooks:
+            hook = self._hooks.pop()
+            try:
+                outcome = hook()
+                if inspect.isawaitable(outcome):
+                    await outcome
+            except Exception as exc:
+                logger.warning("compensating hook %r failed: %s", hook, exc)
+                self.hook_errors.append(exc)
+        return cancelled
+
+
+_current_scope: ContextVar[CancellationScope | None] = ContextVar("chimera_plan_scope", default=None)
+
+
+def current_scope() -> CancellationScope | None:
+    """The scope of the plan whose task is running, or None outside a plan."""
+    return _current_scope.get()
+
+
+async def execute(
+    graph: TaskGraph,
+    run_task: Callable[[dict], Awaitable[Any]],
+    caps: dict[str, int] | None = None,
+    default_cap: int = DEFAULT_AGENT_CONCURRENCY,
+    fail_fast: bool = True,
+    scope: CancellationScope | None = None,
+    on_fail_fast: Callable[[dict], Any] | None = None,
+) -> dict:
+    """Run ``run_task`` for every task as soon as its dependencies have succeeded.
+
+    At most ``caps[agent]`` tasks per agent run at once; the rest wait in a
+    per-agent ready queue. A failed task's descendants are never started and
+    are reported as skipped; independent branches carry on unless the failed
+    task is critical (see :meth:`TaskGraph.critical_nodes`) and ``fail_fast``
+    is set, in which case the whole scope is cancelled. ``on_fail_fast``
+    receives the report's ``fail_fast`` entry, e.g. to notify a supervisor.
+    Cancelling ``scope`` from outside stops the plan the same way.
+    """
+    limit = _agent_limits(set(graph.agents), caps, default_cap)
+    scope = scope or CancellationScope()
+    critical = graph.critical_nodes() if fail_fast else set()
+    remaining = [len(parents) for parents in graph.predecessors]
+    ready: dict[str, list] = {}
+    running: dict[str, int] = {}
+    in_flight: dict[asyncio.Task, int] = {}
+    results: dict[str, Any] = {}
+    errors: dict[str, BaseException] = {}
+    cancelled: list[str] = []
+    failure: dict | None = None
+    agents = graph.agents
+
+    for node in range(len(graph.tasks)):
+        if not remaining[node]:
+            heapq.heappush(ready.setdefault(agents[node], []), graph.ready_keys[node])
+
+    token = _current_scope.set(scope)
+    try:
+        while not scope.cancelled:
+            for agent, queue in ready.items():
+                while queue and running.get(agent, 0) < limit[agent]:
+                    node = heapq.heappop(queue)[2]
+                    running[agent] = running.get(agent, 0) + 1
+                    task = asyncio.ensure_future(run_task(graph.tasks[node]))
+                    scope.attach(task)
+                    in_flight[task] = node
+            if not in_flight:
+                break
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                node = in_flight.pop(task)
+                running[agents[node]] -= 1
+                if task.cancelled() and scope.cancelled:
+                    cancelled.append(graph.ids[node])
+                    continue
+                error = asyncio.CancelledError() if task.cancelled() else task.exception()
+                if error is not None:
+                    errors[graph.ids[node]] = error
+                    if node in critical and failure is None:
+                        failure = {"task": graph.ids[node], "error": repr(error)}
+                    continue
+                results[graph.ids[node]] = task.result()
+                for child in graph.successors[node]:
+                    remaining[child] -= 1
+                    if not remaining[child]:
+                        heapq.heappush(ready.setdefault(agents[child], []), graph.ready_keys[child])
+            if failure is not None:
+                await scope.cancel(f"critical task {failure['task']!r} failed")
+        if in_flight:
+            # Only reached once the scope is cancelled: collect what it stopped.
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            for task, node in in_flight.items():
+                if task.cancelled():
+                    cancelled.append(graph.ids[node])
+                elif task.exception() is not None:
+                    errors[graph.ids[node]] = task.exception()
+                else:
+                    results[graph.ids[node]] = task.result()
+            in_flight.clear()
+    finally:
+        _current_scope.reset(token)
+        for task in in_flight:
+            task.cancel()
+
+    finished = results.keys() | errors.keys() | set(cancelled)
+    report = {
+        "results": results,
+        "errors": errors,
+        "cancelled": cancelled,
+        "skipped": [task_id for task_id in graph.ids if task_id not in finished],
+        "fail_fast": None,
+    }
+    if scope.cancelled:
+        report["fail_fast"] = {
+            **(failure or {"task": None, "error": None}),
+            "reason": scope.reason,
+            "cancelled": len(cancelled),
+            "skipped": len(report["skipped"]),
+            "cancellation_ms": scope.cancellation_ms,
+            "hook_errors": [repr(exc) for exc in scope.hook_errors],
+        }
+        if on_fail_fast is not None:
+            outcome = on_fail_fast(report["fail_fast"])
+            if inspect.isawaitable(outcome):
+                await outcome
+    return report
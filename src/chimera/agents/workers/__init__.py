@@ -4,5 +4,13 @@ from .trend_worker import TrendWorker
 from .content_worker import ContentWorker
 from .economic_worker import EconomicWorker
 from .delivery_worker import DeliveryWorker
+from .dispatch import NoCapableWorker, WorkStealingDispatcher
 
-__all__ = ["TrendWorker", "ContentWorker", "EconomicWorker", "DeliveryWorker"]
+__all__ = [
+    "TrendWorker",
+    "ContentWorker",
+    "EconomicWorker",
+    "DeliveryWorker",
+    "WorkStealingDispatcher",
+    "NoCapableWorker",
+]
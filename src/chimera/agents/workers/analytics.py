@@ -0,0 +1,212 @@
+"""Bulk analytics collection with freshness-tiered caching.
+
+Posts are grouped by platform and their ids split into the largest batch
+each platform's API accepts (YouTube ``videos.list`` takes 50 ids, TikTok's
+video query 20); the batches run concurrently. Metrics are cached with a
+refresh interval that depends on the post's age: a post from the last hour
+is refetched every 30 seconds, one from the last day every five minutes,
+one from the last week hourly and anything older once a day. A dashboard
+refreshing every 30 seconds therefore only reaches the platform for the
+posts whose tier is due; everything else is served from the cache. Posts a
+platform leaves out of its answer (deleted or unknown) are cached as
+missing on the same schedule, rather than asked for on every read.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime
+
+from chimera.core.singleflight import Abandoned, settle
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZES = {"youtube": 50, "tiktok": 20, "twitter": 100, "instagram": 50}
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_MAX_CONCURRENCY = 8
+
+# (maximum post age, refresh interval) in seconds, youngest first.
+FRESHNESS_TIERS = (
+    (3600.0, 30.0),
+    (86400.0, 300.0),
+    (7 * 86400.0, 3600.0),
+    (math.inf, 86400.0),
+)
+
+# fetch(video_ids) -> {video_id: metrics}; ids the platform doesn't know are left out.
+BatchFetcher = Callable[[list[str]], Awaitable[dict[str, dict]]]
+
+
+def refresh_interval(age: float | None, tiers: tuple[tuple[float, float], ...] = FRESHNESS_TIERS) -> float:
+    """How long metrics for a post of ``age`` seconds stay fresh; unknown ages count as new."""
+    if age is None:
+        return tiers[0][1]
+    for max_age, interval in tiers:
+        if age <= max_age:
+            return interval
+    return tiers[-1][1]
+
+
+def _timestamp(value) -> float | None:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class AnalyticsCollector:
+    """Fetches post metrics in platform-sized batches and caches them by freshness tier."""
+
+    def __init__(
+        self,
+        fetchers: dict[str, BatchFetcher],
+        batch_sizes: dict[str, int] = MAX_BATCH_SIZES,
+        tiers: tuple[tuple[float, float], ...] = FRESHNESS_TIERS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.fetchers = fetchers
+        self.batch_sizes = batch_sizes
+        self.tiers = tiers
+        self.max_concurrency = max_concurrency
+        self._clock = clock
+        self.calls = 0
+        self.fetched = 0
+        self._published: dict[tuple[str, str], float | None] = {}
+        # key -> (metrics, or None if the platform doesn't know the post; fetched at)
+        self._entries: dict[tuple[str, str], tuple[dict | None, float]] = {}
+        self._in_flight: dict[tuple[str, str], asyncio.Future] = {}
+        self._slots: asyncio.Semaphore | None = None
+
+    def track(self, content_id: str, platform: str, published_at: float | None = None) -> None:
+        """Follow a post so :meth:`refresh` keeps it current; ``published_at`` sets its tier."""
+        key = (content_id, platform)
+        if published_at is not None or key not in self._published:
+            self._published[key] = published_at
+
+    def _fresh(self, key: tuple[str, str], now: float) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        published = self._published.get(key)
+        age = None if published is None else now - published
+        return now - entry[1] < refresh_interval(age, self.tiers)
+
+    def cached(self, content_id: str, platform: str) -> dict | None:
+        """The last metrics fetched for a post, however old, without calling the platform."""
+        entry = self._entries.get((content_id, platform))
+        return entry[0] if entry is not None else None
+
+    def due(self) -> list[tuple[str, str]]:
+        """Tracked posts whose tier says they should be refetched."""
+        now = self._clock()
+        return [key for key in self._published if not self._fresh(key, now)]
+
+    async def collect(
+        self, items: Iterable[tuple[str, str]], force: bool = False
+    ) -> dict[tuple[str, str], dict]:
+        """Metrics for ``(content_id, platform)`` pairs, fetching only stale ones.
+
+        If a batch fails, its posts fall back to their last cached metrics;
+        the error is raised only for posts that have none. Posts the
+        platform doesn't know are left out.
+        """
+        loop = asyncio.get_running_loop()
+        now = self._clock()
+        results: dict[tuple[str, str], dict] = {}
+        waiting: dict[tuple[str, str], asyncio.Future] = {}
+        stale: dict[str, list[str]] = defaultdict(list)
+        for key in dict.fromkeys(items):
+            self.track(*key)
+            if not force and self._fresh(key, now):
+                if self._entries[key][0] is not None:
+                    results[key] = self._entries[key][0]
+            elif key in self._in_flight:
+                waiting[key] = self._in_flight[key]
+            else:
+                waiting[key] = self._in_flight[key] = loop.create_future()
+                stale[key[1]].append(key[0])
+
+        batches = []
+        for platform, ids in stale.items():
+            size = self.batch_sizes.get(platform, DEFAULT_BATCH_SIZE)
+            batches.extend((platform, ids[start : start + size]) for start in range(0, len(ids), size))
+        await asyncio.gather(*(self._fetch(platform, ids) for platform, ids in batches))
+
+        abandoned = []
+        for key, future in waiting.items():
+            try:
+                metrics = await asyncio.shield(future)
+            except Abandoned:
+                # The collect() fetching it was cancelled; fetch it ourselves.
+                abandoned.append(key)
+                continue
+            except Exception:
+                if key not in self._entries:
+                    raise
+                logger.warning("serving stale analytics for %s on %s", *key)
+                metrics = self._entries[key][0]
+            if metrics is not None:
+                results[key] = metrics
+        if abandoned:
+            results.update(await self.collect(abandoned, force))
+        return results
+
+    async def get(self, content_id: str, platform: str) -> dict:
+        key = (content_id, platform)
+        return (await self.collect([key])).get(key, {})
+
+    async def refresh(self) -> int:
+        """Refetch every tracked post that is due; returns how many were due."""
+        due = self.due()
+        if due:
+            await self.collect(due)
+        return len(due)
+
+    async def _fetch(self, platform: str, ids: list[str]) -> None:
+        keys = [(content_id, platform) for content_id in ids]
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            fetcher = self.fetchers.get(platform)
+            if fetcher is None:
+                raise LookupError(f"no analytics fetcher for platform {platform!r}")
+            async with self._slots:
+                self.calls += 1
+                metrics = await fetcher(ids)
+            if metrics is None:
+                # Caching that as "no such posts" would hide the broken fetcher.
+                raise TypeError(f"analytics fetcher for {platform!r} returned None, not a dict")
+        except asyncio.CancelledError as exc:
+            for key in keys:
+                settle(self._in_flight.pop(key), exc)
+            raise
+        except Exception as exc:
+            logger.warning("analytics batch of %d for %s failed: %s", len(ids), platform, exc)
+            for key in keys:
+                settle(self._in_flight.pop(key), exc)  # collect() decides whether it matters
+            return
+        now = self._clock()
+        self.fetched += len(ids)
+        for content_id, key in zip(ids, keys):
+            result = metrics.get(content_id)
+            self._entries[key] = (result, now)
+            if result is not None and self._published.get(key) is None:
+                self._published[key] = _timestamp(result.get("publishedAt"))
+            self._in_flight.pop(key).set_result(result)
+
+    def info(self) -> dict:
+        return {
+            "tracked": len(self._published),
+            "cached": len(self._entries),
+            "missing": sum(entry[0] is None for entry in self._entries.values()),
+            "calls": self.calls,
+            "fetched": self.fetched,
+        }
@@ -0,0 +1,227 @@
+"""Content-addressed asset store and render queue for the Content Worker.
+
+Every intermediate asset (a voiceover clip, a b-roll cut, a thumbnail) is
+keyed by a hash of what it is made from: its kind, the segment text, the
+style and the render parameters. Variants of a script that share a segment
+therefore share the asset, which is rendered once and then read back from
+disk. The store is bounded in bytes and evicts the least recently used
+assets, except ones pinned by a consumer that is still reading them. The
+render queue runs renderers in a bounded process pool and
+coalesces identical renders that are already in flight.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+from chimera.core.singleflight import SingleFlight
+
+DEFAULT_ASSET_DIR = os.environ.get(
+    "CHIMERA_ASSET_DIR", os.path.join(tempfile.gettempdir(), "chimera-assets")
+)
+DEFAULT_MAX_BYTES = 2 * 1024**3
+DEFAULT_RENDER_WORKERS = 2
+
+# renderer(text, style, params) -> bytes; must be picklable to run in a process.
+Renderer = Callable[[str, str, dict], bytes]
+
+
+class NoRenderer(LookupError):
+    """Raised when no renderer is registered for an asset kind."""
+
+
+def asset_key(kind: str, text: str, style: str, params: dict | None = None) -> str:
+    """Hash of everything an asset is rendered from."""
+    payload = json.dumps([kind, text, style, params or {}], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class AssetStore:
+    """Assets on local disk under their key, evicted least recently used past ``max_bytes``."""
+
+    def __init__(self, root: str = DEFAULT_ASSET_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._pins: dict[str, int] = {}
+        self._bytes = 0
+        os.makedirs(root, exist_ok=True)
+        # Rebuild recency from modification times, which get() refreshes.
+        found = []
+        for directory, _, files in os.walk(root):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                stat = os.stat(os.path.join(directory, name))
+                found.append((stat.st_mtime, name, stat.st_size))
+        for _, key, size in sorted(found):
+            self._sizes[key] = size
+            self._bytes += size
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._sizes
+
+    def get(self, key: str, pin: bool = False) -> str | None:
+        """Path of the asset stored under ``key``, or None.
+
+        With ``pin``, the asset is not evicted until :meth:`unpin` is called.
+        """
+        with self._lock:
+            if key not in self._sizes:
+                self.misses += 1
+                return None
+            self._sizes.move_to_end(key)
+            self.hits += 1
+            if pin:
+                self._pins[key] = self._pins.get(key, 0) + 1
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._bytes -= self._sizes.pop(key, 0)
+            if pin:
+                self.unpin(key)
+            return None
+        return path
+
+    def put(self, key: str, data: bytes, pin: bool = False) -> str:
+        """Store ``data`` under ``key`` and return its path, pinned if ``pin``."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(handle, "wb") as out:
+            out.write(data)
+        os.replace(temporary, path)
+        with self._lock:
+            self._bytes += len(data) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(data)
+            if pin:
+                self._pins[key] = self._pins.get(key, 0) + 1
+            self._evict()
+        return path
+
+    def unpin(self, *keys: str) -> None:
+        """Release pins taken by :meth:`get` or :meth:`put`, evicting if over budget."""
+        with self._lock:
+            for key in keys:
+                count = self._pins.get(key, 0) - 1
+                if count > 0:
+                    self._pins[key] = count
+                else:
+                    self._pins.pop(key, None)
+            self._evict()
+
+    def _evict(self) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+        for key in list(self._sizes):
+            if self._bytes <= self.max_bytes or len(self._sizes) <= 1:
+                break
+            if key in self._pins:
+                continue
+            self._bytes -= self._sizes.pop(key)
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def info(self) -> dict:
+        return {
+            "entries": len(self._sizes),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "pinned": len(self._pins),
+        }
+
+
+class RenderQueue:
+    """Produces assets through ``renderers[kind]`` in a bounded pool, at most once per key.
+
+    A render that is already stored is served from the store; one that is
+    in flight is awaited rather than started again. ``render(..., pin=True)``
+    pins the asset in the store until the caller unpins it.
+    """
+
+    def __init__(
+        self,
+        store: AssetStore,
+        renderers: dict[str, Renderer],
+        max_workers: int = DEFAULT_RENDER_WORKERS,
+        executor: Executor | None = None,
+    ) -> None:
+        self.store = store
+        self.renderers = dict(renderers)
+        self.max_workers = max_workers
+        self.rendered = 0
+        self.coalesced = 0
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._flights: SingleFlight[str] = SingleFlight()
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        return self._executor
+
+    async def render(
+        self, kind: str, text: str, style: str, params: dict | None = None, pin: bool = False
+    ) -> dict:
+        """``{"kind", "key", "path", "cached"}`` for the asset, rendering it if needed."""
+        params = params or {}
+        key = asset_key(kind, text, style, params)
+        while True:
+            path = self.store.get(key, pin)
+            if path is not None:
+                return {"kind": kind, "key": key, "path": path, "cached": True}
+            renderer = self.renderers.get(kind)
+            if renderer is None:
+                raise NoRenderer(f"no renderer for {kind!r} assets")
+            path, shared = await self._flights.do(key, lambda: self._render(key, renderer, text, style, params, pin))
+            if not shared:
+                return {"kind": kind, "key": key, "path": path, "cached": False}
+            self.coalesced += 1
+            if not pin:
+                return {"kind": kind, "key": key, "path": path, "cached": True}
+            # Pin it through the store; if it was evicted meanwhile, render it again.
+
+    async def _render(self, key: str, renderer: Renderer, text: str, style: str, params: dict, pin: bool) -> str:
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(self._pool(), renderer, text, style, params)
+        stored = loop.run_in_executor(None, self.store.put, key, data, pin)
+        try:
+            path = await asyncio.shield(stored)
+        except asyncio.CancelledError:
+            if pin:
+                # The write finishes anyway; drop the pin nobody will release.
+                stored.add_done_callback(lambda done: done.cancelled() or done.exception() or self.store.unpin(key))
+            raise
+        self.rendered += 1
+        return path
+
+    def stats(self) -> dict[str, Any]:
+        return {"rendered": self.rendered, "coalesced": self.coalesced, "store": self.store.info()}
+
+    def close(self) -> None:
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown()
+            self._executor = None
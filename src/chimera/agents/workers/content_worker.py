@@ -1,22 +1,153 @@
 """Content Worker - Video script generation and editing."""
 
+import asyncio
+from concurrent.futures import Executor
+
+from .assets import DEFAULT_RENDER_WORKERS, AssetStore, RenderQueue, Renderer
+from .script_templates import ScriptTemplateEngine, SegmentWriter
+
+ASPECT_RATIOS = {"tiktok": "9:16", "youtube": "16:9", "twitter": "16:9", "instagram": "9:16"}
+
+
+def _segments(script: dict) -> list[dict]:
+    """Script segments with the duration each covers until the next one starts."""
+    segments = sorted(script.get("content", []), key=lambda segment: segment["timestamp"])
+    total = script.get("duration_seconds")
+    timed = []
+    for index, segment in enumerate(segments):
+        if index + 1 < len(segments):
+            end = segments[index + 1]["timestamp"]
+        else:
+            end = total if total is not None else segment["timestamp"]
+        timed.append({**segment, "duration": max(0, end - segment["timestamp"])})
+    return timed
+
+
+def _voice_params(script: dict) -> dict:
+    return {"voice": script.get("voice", "default"), "language": script.get("language", "en")}
+
+
+def _summary(refs: list[dict]) -> dict:
+    rendered = sum(not ref["cached"] for ref in refs)
+    return {"rendered": rendered, "reused": len(refs) - rendered}
+
 
 class ContentWorker:
-    """Generates video scripts, edits video, and synthesizes voiceovers."""
+    """Generates video scripts, edits video, and synthesizes voiceovers.
+
+    Intermediate assets are produced by ``renderers`` (``"voiceover"``,
+    ``"broll"``, ``"thumbnail"``, ``"video"``) through a content-addressed
+    :class:`RenderQueue`, so segments shared between variants of a script
+    are rendered once. Scripts come from precompiled per-platform, per-style
+    skeletons (:class:`ScriptTemplateEngine`); ``writer`` optionally
+    rewrites each segment's draft, and only segments whose inputs changed
+    are written again.
+    """
 
-    def __init__(self) -> None:
-        pass
+    def __init__(
+        self,
+        renderers: dict[str, Renderer] | None = None,
+        store: AssetStore | None = None,
+        render_workers: int = DEFAULT_RENDER_WORKERS,
+        executor: Executor | None = None,
+        writer: SegmentWriter | None = None,
+    ) -> None:
+        self.scripts = ScriptTemplateEngine(writer)
+        self.renderers = renderers or {}
+        self.store = store
+        self.render_workers = render_workers
+        self.executor = executor
+        self._queue: RenderQueue | None = None
+
+    @property
+    def render_queue(self) -> RenderQueue:
+        if self._queue is None:
+            store = self.store if self.store is not None else AssetStore()
+            self._queue = RenderQueue(store, self.renderers, self.render_workers, self.executor)
+        return self._queue
 
     async def generate_script(
         self, topic: str, target_duration: int, style: str, platform: str
     ) -> dict:
         """Generate a video script for the given topic."""
-        pass
+        return await self.scripts.render(topic, target_duration, style, platform)
 
     async def edit_video(self, script: dict, assets: list[dict]) -> dict:
-        """Edit video from script and assets."""
-        pass
+        """Edit video from script and assets.
+
+        Renders b-roll per segment and a thumbnail alongside the voiceover,
+        then the final cut from all of them; any asset whose inputs match an
+        earlier render is reused. The clips and cuts are pinned in the store
+        until the final cut has been rendered from them.
+        """
+        queue = self.render_queue
+        pinned: list[str] = []
+        try:
+            return await self._edit(queue, script, assets, pinned)
+        finally:
+            queue.store.unpin(*pinned)
+
+    async def _edit(self, queue: RenderQueue, script: dict, assets: list[dict], pinned: list[str]) -> dict:
+        style = script.get("style", "default")
+        platform = script.get("platform", "youtube")
+        aspect = ASPECT_RATIOS.get(platform, "16:9")
+        segments = _segments(script)
+
+        async def part(kind: str, text: str, params: dict) -> dict:
+            ref = await queue.render(kind, text, style, params, pin=True)
+            pinned.append(ref["key"])
+            return ref
+
+        voice = _voice_params(script)
+        # Wait for every render, even after a failure, so none pins after the caller unpins.
+        results = await asyncio.gather(
+            *(part("voiceover", segment["text"], voice) for segment in segments),
+            *(part("broll", segment["text"], {"aspect": aspect, "duration": segment["duration"]}) for segment in segments),
+            queue.render("thumbnail", script.get("title", ""), style, {"aspect": aspect}),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        clips, broll, thumbnail = results[: len(segments)], results[len(segments) : -1], results[-1]
+        voiceover = {"clips": [{**clip, "timestamp": segment["timestamp"]} for clip, segment in zip(clips, segments)]}
+        timeline = [
+            {
+                "timestamp": segment["timestamp"],
+                "duration": segment["duration"],
+                "voiceover": clip["key"],
+                "broll": cut["key"],
+            }
+            for segment, clip, cut in zip(segments, voiceover["clips"], broll)
+        ]
+        parts = [clip["path"] for clip in voiceover["clips"]] + [cut["path"] for cut in broll]
+        video = await queue.render(
+            "video",
+            repr([(entry["voiceover"], entry["broll"]) for entry in timeline]),
+            style,
+            {"aspect": aspect, "parts": parts, "assets": [asset.get("id", asset.get("url")) for asset in assets]},
+        )
+        refs = voiceover["clips"] + list(broll) + [thumbnail, video]
+        return {
+            "scriptId": script.get("id"),
+            "platform": platform,
+            "video": video,
+            "thumbnail": thumbnail,
+            "timeline": timeline,
+            **_summary(refs),
+        }
 
     async def synthesize_voiceover(self, script: dict) -> dict:
-        """Generate synthetic voiceover from script."""
-        pass
+        """Generate synthetic voiceover from script, one clip per segment."""
+        params = _voice_params(script)
+        style = script.get("style", "default")
+        segments = _segments(script)
+        clips = await asyncio.gather(
+            *(self.render_queue.render("voiceover", segment["text"], style, params) for segment in segments)
+        )
+        clips = [{**clip, "timestamp": segment["timestamp"]} for clip, segment in zip(clips, segments)]
+        return {"scriptId": script.get("id"), "clips": clips, **_summary(clips)}
+
+    def close(self) -> None:
+        if self._queue is not None:
+            self._queue.close()
@@ -1,25 +1,119 @@
 """Delivery Worker - Multi-platform content publishing."""
 
+from collections.abc import Callable
+from typing import Any
+
+from chimera.integrations.uploads import ContentMismatch, UploadError
+
+from .analytics import AnalyticsCollector
+from .publishing import RETRY_DELAYS, PlatformLimiter, PublishScheduler
+from .ratelimit import RateLimited
+
 
 class DeliveryWorker:
-    """Publishes content to YouTube, TikTok, and other platforms."""
+    """Publishes content to YouTube, TikTok, and other platforms.
 
-    def __init__(self) -> None:
-        pass
+    ``adapters`` maps a platform name to its integration adapter
+    (:class:`~chimera.integrations.YouTubeAdapter`,
+    :class:`~chimera.integrations.TikTokAdapter`), which uploads in
+    resumable chunks. Uploads go through a :class:`PublishScheduler`, which
+    keeps each platform and credential within its rate limit and retries
+    failures on the retry table before escalating to ``on_escalate``.
+    Analytics are collected in platform-sized batches through an
+    :class:`AnalyticsCollector` and served from its cache while fresh; an
+    adapter takes part once it has a ``get_analytics_batch`` method, or pass
+    ``analytics`` with the fetchers to use.
+    """
+
+    def __init__(
+        self,
+        adapters: dict[str, Any] | None = None,
+        limiter: PlatformLimiter | None = None,
+        retry_delays: tuple[float, ...] = RETRY_DELAYS,
+        on_escalate: Callable[[dict, BaseException], Any] | None = None,
+        analytics: AnalyticsCollector | None = None,
+    ) -> None:
+        self.adapters = adapters or {}
+        self.limiter = limiter if limiter is not None else PlatformLimiter()
+        self.retry_delays = retry_delays
+        self.on_escalate = on_escalate
+        self._publisher: PublishScheduler | None = None
+        self._analytics = analytics
+
+    @property
+    def publisher(self) -> PublishScheduler:
+        if self._publisher is None:
+            self._publisher = PublishScheduler(
+                self._upload,
+                self.limiter,
+                self.retry_delays,
+                fatal=(ContentMismatch,),
+                on_escalate=self.on_escalate,
+            )
+        return self._publisher
+
+    @property
+    def analytics(self) -> AnalyticsCollector:
+        if self._analytics is None:
+            self._analytics = AnalyticsCollector(
+                {
+                    platform: adapter.get_analytics_batch
+                    for platform, adapter in self.adapters.items()
+                    if hasattr(adapter, "get_analytics_batch")
+                }
+            )
+        return self._analytics
 
     async def authenticate(self, platform: str, credentials: dict) -> str:
-        """Authenticate with the specified platform."""
-        pass
+        """Authenticate with the specified platform.
+
+        ``credentials`` holds the OAuth ``auth_code`` (and ``redirect_uri``
+        if the platform wants it). The adapter keeps the token fresh.
+        """
+        if platform not in self.adapters:
+            raise ValueError(f"no adapter configured for platform {platform!r}")
+        return await self.adapters[platform].authenticate(credentials["auth_code"], credentials.get("redirect_uri"))
 
     async def upload_video(
         self, video_path: str, metadata: dict, platform: str
     ) -> str:
-        """Upload video to specified platform."""
-        pass
+        """Upload video to specified platform.
+
+        ``metadata`` carries the title, description and tags, and the
+        approved version's ``contentHash``; the upload is abandoned if the
+        file's hash differs (DELIVERY-004). A failed upload retried with the
+        same file resumes where it stopped. ``metadata["credential"]``
+        names the account whose quota the upload counts against.
+        """
+        if platform not in self.adapters:
+            raise ValueError(f"no adapter configured for platform {platform!r}")
+        job = {
+            "platform": platform,
+            "credential": metadata.get("credential"),
+            "video_path": video_path,
+            "metadata": metadata,
+        }
+        return (await self.publisher.publish(job))["video_id"]
+
+    async def _upload(self, job: dict) -> dict:
+        # The whole upload result goes back to the publisher, so the limiter
+        # sees the rate-limit headers of successful uploads too.
+        platform, metadata = job["platform"], job["metadata"]
+        fields = {"title": metadata.get("title", ""), "description": metadata.get("description", "")}
+        if platform == "youtube":
+            fields["tags"] = metadata.get("tags", [])
+        try:
+            return await self.adapters[platform].upload(
+                job["video_path"], fields, expected_sha256=metadata.get("contentHash")
+            )
+        except UploadError as exc:
+            if exc.status == 429:
+                raise RateLimited(headers=exc.headers) from exc
+            raise
 
     async def get_analytics(self, content_id: str, platform: str) -> dict:
-        """Fetch performance metrics."""
-        pass
+        """Fetch performance metrics, from the analytics cache while they are fresh."""
+        return await self.analytics.get(content_id, platform)
 
     async def validate_content(self, content: dict, platform: str) -> dict:
         """Pre-upload platform policy validation."""
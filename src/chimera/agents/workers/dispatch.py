@@ -0,0 +1,228 @@
+"""Work-stealing dispatch of tasks across worker agent instances.
+
+Every worker instance owns a local queue with one lane per priority. A task
+(``{"action": ..., "parameters": {...}, "priority": ...}``, as carried in an
+MCP ``task_request`` payload) is only placed with a worker whose class
+implements ``action``. Workers take from the head of their own lanes, highest
+priority first; a worker with nothing to do steals from the tail of the
+busiest peer that can run the task there, so one backed-up instance does not
+leave the rest of its pool idle.
+"""
+
+import asyncio
+import inspect
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+PRIORITIES = ("critical", "high", "medium", "low")
+_RANK = {priority: rank for rank, priority in enumerate(PRIORITIES)}
+
+Handler = Callable[[object, dict], Awaitable[Any]]
+
+
+class NoCapableWorker(LookupError):
+    """Raised when no registered worker can run a task's action."""
+
+
+def capabilities_of(worker: object) -> frozenset[str]:
+    """Public coroutine methods of ``worker``; each is an action it can run."""
+    return frozenset(
+        name
+        for name, _ in inspect.getmembers(type(worker), inspect.iscoroutinefunction)
+        if not name.startswith("_")
+    )
+
+
+async def call_action(worker: object, task: dict) -> Any:
+    """Default handler: ``worker.<action>(**parameters)``."""
+    return await getattr(worker, task["action"])(**task.get("parameters", {}))
+
+
+class _Slot:
+    """One worker instance with its local priority lanes and counters."""
+
+    def __init__(self, slot_id: str, worker: object, capabilities: frozenset[str]) -> None:
+        self.slot_id = slot_id
+        self.worker = worker
+        self.capabilities = capabilities
+        self.lanes: tuple[deque, ...] = tuple(deque() for _ in PRIORITIES)
+        self.peers: list["_Slot"] = []
+        self.wakeup = asyncio.Event()
+        self.idle = False
+        self.executed = 0
+        self.stolen = 0
+        self.stolen_from = 0
+        self.busy_seconds = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(lane) for lane in self.lanes)
+
+    def pop_head(self) -> tuple | None:
+        for lane in self.lanes:
+            if lane:
+                return lane.popleft()
+        return None
+
+    def steal_tail(self, capabilities: frozenset[str]) -> tuple | None:
+        for lane in self.lanes:
+            if lane and lane[-1][0]["action"] in capabilities:
+                return lane.pop()
+        return None
+
+
+class WorkStealingDispatcher:
+    """Distributes tasks over worker instances with per-worker deques and stealing.
+
+    ``handler(worker, task)`` runs one task; it defaults to calling the
+    worker method named by the task's ``action``. Set ``steal=False`` to keep
+    tasks on the instance they were placed with.
+    """
+
+    def __init__(
+        self,
+        workers: list[object],
+        handler: Handler = call_action,
+        steal: bool = True,
+        seed: int | None = None,
+    ) -> None:
+        self.handler = handler
+        self.steal = steal
+        self._rng = random.Random(seed)
+        counts: dict[str, int] = {}
+        self._slots: list[_Slot] = []
+        for worker in workers:
+            name = type(worker).__name__
+            counts[name] = counts.get(name, 0) + 1
+            self._slots.append(_Slot(f"{name}-{counts[name]}", worker, capabilities_of(worker)))
+        for slot in self._slots:
+            slot.peers = [
+                peer for peer in self._slots if peer is not slot and peer.capabilities & slot.capabilities
+            ]
+        self._by_action: dict[str, list[_Slot]] = {}
+        for slot in self._slots:
+            for action in slot.capabilities:
+                self._by_action.setdefault(action, []).append(slot)
+        self._loops: list[asyncio.Task] = []
+        self._started_at = 0.0
+
+    def workers_for(self, action: str) -> list[str]:
+        """Ids of the worker instances that can run ``action``."""
+        return [slot.slot_id for slot in self._by_action.get(action, ())]
+
+    def submit(self, task: dict, worker_id: str | None = None) -> asyncio.Future:
+        """Queue ``task``; the returned future resolves to the handler's result.
+
+        The task goes to ``worker_id`` when given, otherwise to the shorter
+        queue of two randomly chosen capable workers. Cancelling the future
+        drops a queued task and cancels one that is already running.
+        """
+        candidates = self._by_action.get(task["action"])
+        if not candidates:
+            raise NoCapableWorker(f"no worker can run {task['action']!r}")
+        if worker_id is not None:
+            slot = next((s for s in candidates if s.slot_id == worker_id), None)
+            if slot is None:
+                raise NoCapableWorker(f"{worker_id!r} cannot run {task['action']!r}")
+        elif len(candidates) == 1:
+            slot = candidates[0]
+        else:
+            first, second = self._rng.sample(candidates, 2)
+            slot = first if len(first) <= len(second) else second
+        future = asyncio.get_running_loop().create_future()
+        slot.lanes[_RANK.get(task.get("priority", "medium"), 2)].append((task, future))
+        slot.wakeup.set()
+        if self.steal and not slot.idle:
+            # Let one idle capable peer know there is work to take.
+            for peer in slot.peers:
+                if peer.idle and task["action"] in peer.capabilities:
+                    peer.wakeup.set()
+                    break
+        return future
+
+    def _take(self, slot: _Slot) -> tuple | None:
+        item = slot.pop_head()
+        if item is not None or not self.steal:
+            return item
+        victims = sorted((peer for peer in slot.peers if len(peer)), key=len, reverse=True)
+        for victim in victims:
+            item = victim.steal_tail(slot.capabilities)
+            if item is not None:
+                slot.stolen += 1
+                victim.stolen_from += 1
+                return item
+        return None
+
+    async def _run(self, slot: _Slot) -> None:
+        while True:
+            item = self._take(slot)
+            if item is None:
+                slot.idle = True
+                slot.wakeup.clear()
+                await slot.wakeup.wait()
+                slot.idle = False
+                continue
+            task, future = item
+            if future.cancelled():
+                continue
+            started = time.monotonic()
+            work = asyncio.ensure_future(self.handler(slot.worker, task))
+            # A caller that gives up (e.g. a plan failing fast) stops the handler too.
+            future.add_done_callback(lambda done, work=work: done.cancelled() and work.cancel())
+            try:
+                result = await work
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                future.cancel()
+                raise
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                slot.busy_seconds += time.monotonic() - started
+                slot.executed += 1
+
+    def start(self) -> None:
+        """Start one dispatch loop per worker instance on the running loop."""
+        if self._loops:
+            return
+        self._started_at = time.monotonic()
+        self._loops = [asyncio.create_task(self._run(slot)) for slot in self._slots]
+
+    async def stop(self) -> None:
+        """Stop the loops; queued tasks' futures are cancelled."""
+        for loop_task in self._loops:
+            loop_task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+        for slot in self._slots:
+            for lane in slot.lanes:
+                while lane:
+                    lane.popleft()[1].cancel()
+
+    def metrics(self) -> dict:
+        """Per-worker queue depth, executions, steals and utilisation."""
+        elapsed = max(time.monotonic() - self._started_at, 1e-9) if self._started_at else 0.0
+        workers = {
+            slot.slot_id: {
+                "queued": len(slot),
+                "executed": slot.executed,
+                "stolen": slot.stolen,
+                "stolen_from": slot.stolen_from,
+                "busy_seconds": round(slot.busy_seconds, 6),
+                "utilisation": round(min(1.0, slot.busy_seconds / elapsed), 4) if elapsed else 0.0,
+            }
+            for slot in self._slots
+        }
+        return {
+            "workers": workers,
+            "steals": sum(slot.stolen for slot in self._slots),
+            "executed": sum(slot.executed for slot in self._slots),
+            "queued": sum(len(slot) for slot in self._slots),
+        }
@@ -1,24 +1,122 @@
 """Economic Worker - Wallet operations and transaction management."""
 
+import asyncio
+import logging
+from typing import Any
+
+from chimera.integrations.coinbase import TransactionRejected
+
+from .gas import DEFAULT_FEE_TTL, FeeMarketFetcher, GasEstimator
+from .wallet import DEFAULT_REFRESH_INTERVAL, Reservation, WalletState
+
+logger = logging.getLogger(__name__)
+
 
 class EconomicWorker:
-    """Manages wallet operations, transactions, and economic incentives."""
+    """Manages wallet operations, transactions, and economic incentives.
 
-    def __init__(self) -> None:
-        pass
+    Balances and nonces come from ``kit`` (a
+    :class:`~chimera.integrations.CoinbaseAgentKit`) through a
+    :class:`WalletState`. It is fetched every ``refresh_interval`` seconds
+    or after a failed transfer, and tracked locally in between. Each transfer
+    reserves its funds and nonce up front, so many can be in flight at once.
+    Gas is estimated from each network's fee market, fetched from
+    ``fee_market`` (by default the kit's) at most once per ``fee_ttl``.
+    """
+
+    def __init__(
+        self,
+        kit: Any = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        fee_market: FeeMarketFetcher | None = None,
+        fee_ttl: float = DEFAULT_FEE_TTL,
+    ) -> None:
+        self.kit = kit
+        self.wallet = WalletState(self._fetch_wallet, refresh_interval)
+        if fee_market is None:
+            fee_market = getattr(kit, "get_fee_market", None)
+        self.gas = GasEstimator(fee_market, fee_ttl)
+        self._pending: dict[str, Reservation] = {}
+
+    async def _fetch_wallet(self) -> dict:
+        if self.kit is None:
+            raise RuntimeError("EconomicWorker needs a wallet kit to read balances")
+        return await self.kit.get_wallet_balance()
 
     async def initialize_wallet(self, seed_phrase: str) -> str:
         """Initialize or restore wallet."""
         pass
 
     async def get_balance(self) -> dict:
-        """Fetch current balances."""
-        pass
+        """Fetch current balances: confirmed, reserved by pending transfers, and available."""
+        await self.wallet.ensure_fresh()
+        return self.wallet.snapshot()
 
     async def transfer(self, recipient: str, amount: float, asset: str) -> dict:
-        """Execute transfer with Guardian pre-validation."""
-        pass
+        """Execute transfer with Guardian pre-validation.
+
+        The balance check (ECO-004) is made against the locally tracked
+        available balance. A transfer the kit reports as pending keeps its
+        reservation until :meth:`reconcile` settles it. If the send fails
+        with anything but :class:`TransactionRejected`, the transfer may
+        have been broadcast, so its nonce is not reused and the wallet is
+        fetched again before the error is raised.
+        """
+        reservation = await self.wallet.reserve(asset, amount)
+        try:
+            receipt = await self.kit.send_transaction(recipient, amount, asset, nonce=reservation.nonce)
+        except TransactionRejected as exc:
+            logger.error("transfer of %s %s to %s rejected: %s", amount, asset, recipient, exc)
+            self.wallet.release(reservation)
+            self.wallet.invalidate()
+            raise
+        except asyncio.CancelledError:
+            self.wallet.release(reservation, broadcast=True)
+            raise
+        except Exception as exc:
+            logger.error(
+                "transfer of %s %s to %s failed, maybe after broadcast: %s", amount, asset, recipient, exc
+            )
+            self.wallet.release(reservation, broadcast=True)
+            try:
+                await self.wallet.refresh()
+            except Exception as refresh_exc:
+                # The wallet stays stale; the next transfer fetches it first.
+                logger.warning("wallet refresh after failed transfer failed: %s", refresh_exc)
+            raise
+        transaction_id = receipt.get("transactionId") or receipt.get("hash")
+        status = receipt.get("status", "pending")
+        logger.info(
+            "transfer %s of %s %s to %s (nonce %d): %s",
+            transaction_id, amount, asset, recipient, reservation.nonce, status,
+        )
+        if status == "pending":
+            self._pending[transaction_id] = reservation
+        else:
+            self._settle(reservation, status, receipt.get("fee", 0), receipt.get("feeAsset"))
+        return {
+            "transactionId": transaction_id,
+            "status": status,
+            "hash": receipt.get("hash"),
+            "nonce": reservation.nonce,
+        }
+
+    def reconcile(self, transaction_id: str, status: str, fee: float = 0, fee_asset: str | None = None) -> None:
+        """Settle a pending transfer once it is ``"confirmed"`` or ``"failed"``."""
+        reservation = self._pending.pop(transaction_id, None)
+        if reservation is not None:
+            self._settle(reservation, status, fee, fee_asset)
+
+    def _settle(self, reservation: Reservation, status: str, fee: float, fee_asset: str | None) -> None:
+        if status == "confirmed":
+            self.wallet.confirm(reservation, fee, fee_asset)
+        else:
+            self.wallet.release(reservation, broadcast=True)
 
     async def estimate_gas(self, transaction: dict) -> float:
         """Estimate transaction costs."""
-        pass
+        return await self.gas.estimate(transaction)
+
+    async def estimate_gas_many(self, transactions: list[dict]) -> list[float]:
+        """Estimate costs for a batch of transactions with one fee lookup per network."""
+        return await self.gas.estimate_many(transactions)
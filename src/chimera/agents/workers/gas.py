@@ -0,0 +1,128 @@
+"""Gas estimation from a cached fee market.
+
+Fees move with blocks, not with calls, so the fee market of each network
+is fetched once and reused for ``ttl`` seconds (about a block). A
+transaction's estimate is its gas units times the base plus priority fee,
+in the network's native asset. :meth:`GasEstimator.estimate_many` fetches
+each distinct network's market once for a whole batch of payouts.
+:class:`LocalFeeOracle` stands in for the remote oracle in tests and
+benchmarks.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+
+from chimera.core.singleflight import SingleFlight
+
+DEFAULT_FEE_TTL = 2.0
+
+# Gas a transfer of each asset uses: a native transfer, an ERC-20 transfer,
+# and one signature on Solana.
+GAS_UNITS = {"ETH": 21_000, "USDC": 65_000, "SOL": 1}
+DEFAULT_GAS_UNITS = 100_000
+NETWORKS = {"ETH": "base", "USDC": "base", "SOL": "solana"}
+DEFAULT_NETWORK = "base"
+
+# fetch(network) -> {"baseFee", "priorityFee"} per gas unit in native units, and "block".
+FeeMarketFetcher = Callable[[str], Awaitable[dict]]
+
+
+def network_of(transaction: dict) -> str:
+    return transaction.get("network") or NETWORKS.get(transaction.get("asset", ""), DEFAULT_NETWORK)
+
+
+def gas_units(transaction: dict) -> int:
+    if "gasLimit" in transaction:
+        return int(transaction["gasLimit"])
+    return GAS_UNITS.get(transaction.get("asset", ""), DEFAULT_GAS_UNITS)
+
+
+class GasEstimator:
+    """Estimates transaction costs from fee markets cached per network."""
+
+    def __init__(
+        self,
+        fetch: FeeMarketFetcher | None,
+        ttl: float = DEFAULT_FEE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch
+        self.ttl = ttl
+        self._clock = clock
+        self.fetches = 0
+        self._markets: dict[str, tuple[dict, float]] = {}
+        self._flights: SingleFlight[dict] = SingleFlight()
+
+    async def market(self, network: str) -> dict:
+        """The network's fee market, fetched at most once per ``ttl``."""
+        cached = self._markets.get(network)
+        if cached is not None and self._clock() - cached[1] < self.ttl:
+            return cached[0]
+        if self._fetch is None:
+            raise RuntimeError("gas estimation needs a fee oracle")
+        market, _ = await self._flights.do(network, lambda: self._fetch_market(network))
+        return market
+
+    async def _fetch_market(self, network: str) -> dict:
+        self.fetches += 1
+        market = await self._fetch(network)
+        self._markets[network] = (market, self._clock())
+        return market
+
+    @staticmethod
+    def _cost(transaction: dict, market: dict) -> float:
+        return gas_units(transaction) * (market["baseFee"] + market.get("priorityFee", 0.0))
+
+    async def estimate(self, transaction: dict) -> float:
+        return self._cost(transaction, await self.market(network_of(transaction)))
+
+    async def estimate_many(self, transactions: Iterable[dict]) -> list[float]:
+        """Estimates in order, with one market lookup per distinct network."""
+        transactions = list(transactions)
+        networks = list(dict.fromkeys(network_of(transaction) for transaction in transactions))
+        markets = dict(zip(networks, await asyncio.gather(*(self.market(network) for network in networks))))
+        return [self._cost(transaction, markets[network_of(transaction)]) for transaction in transactions]
+
+    def invalidate(self, network: str | None = None) -> None:
+        if network is None:
+            self._markets.clear()
+        else:
+            self._markets.pop(network, None)
+
+
+class LocalFeeOracle:
+    """A fee oracle with fixed, block-stepped fees for tests and benchmarks.
+
+    The base fee rises by ``step`` (a fraction) every ``block_time`` seconds.
+    """
+
+    def __init__(
+        self,
+        base_fees: dict[str, float] | None = None,
+        priority_fee: float = 1e-9,
+        block_time: float = 2.0,
+        step: float = 0.0,
+        latency_ms: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.base_fees = base_fees or {"base": 5e-9, "solana": 5e-6}
+        self.priority_fee = priority_fee
+        self.block_time = block_time
+        self.step = step
+        self.latency = latency_ms / 1000
+        self._clock = clock
+        self._origin = clock()
+        self.calls = 0
+
+    async def get_fee_market(self, network: str) -> dict:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        block = int((self._clock() - self._origin) / self.block_time)
+        base_fee = self.base_fees.get(network, self.base_fees.get(DEFAULT_NETWORK, 5e-9))
+        return {
+            "baseFee": base_fee * (1 + self.step) ** block,
+            "priorityFee": self.priority_fee if network != "solana" else 0.0,
+            "block": block,
+        }
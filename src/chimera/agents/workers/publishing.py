@@ -0,0 +1,358 @@
+"""Rate-limited publishing with scheduled retries (DELIVERY-003, DELIVERY-006).
+
+Every publish draws a token from its platform's bucket and, when it has
+one, from its credential's bucket. The most specific bucket learns from the
+platform's responses. ``X-RateLimit-Remaining`` caps what it holds, and a
+remaining count of zero pauses it until ``X-RateLimit-Reset``. A 429's
+``Retry-After`` pauses it for that long, so one rejection holds back every
+publish sharing the limit instead of each one finding out for itself.
+
+Publishes wait in one queue ordered by next-attempt time. Nothing sleeps
+per publish: a single dispatcher moves due publishes into a FIFO lane per
+platform and credential, and starts lanes as their buckets allow. A failed
+publish goes back into the queue after the retry table's delay
+(immediate, 60 s, then 300 s). When the third attempt fails, the publish
+is escalated. A rate-limited attempt is requeued after ``Retry-After`` and
+does not count against the retry table.
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from .ratelimit import RateLimited, TokenBucket, parse_rate_limit_headers
+
+logger = logging.getLogger(__name__)
+
+# Delay before attempts 1, 2 and 3; see "Retry Strategy".
+RETRY_DELAYS = (0.0, 60.0, 300.0)
+# A publish that keeps being rate limited is escalated after this many rejections.
+MAX_RATE_LIMITED = 10
+# Pause used when a rate-limit rejection gives no Retry-After.
+DEFAULT_RATE_LIMIT_PAUSE = 1.0
+DEFAULT_MAX_CONCURRENCY = 16
+# Recheck delay for a lane whose bucket had a token but refused it (a waiter
+# in ``TokenBucket.acquire`` holds the bucket).
+MIN_LANE_RETRY = 0.01
+
+# (requests per minute, burst) per platform.
+PLATFORM_LIMITS = {
+    "youtube": (60.0, 10.0),
+    "tiktok": (30.0, 5.0),
+    "twitter": (50.0, 10.0),
+    "instagram": (25.0, 5.0),
+}
+DEFAULT_LIMIT = (30.0, 5.0)
+
+Publisher = Callable[[dict], Awaitable[Any]]
+
+
+class PublishEscalated(Exception):
+    """Raised for a publish that failed every attempt in the retry table."""
+
+    def __init__(self, job: dict, attempts: int, error: BaseException) -> None:
+        self.job = job
+        self.attempts = attempts
+        self.error = error
+        super().__init__(f"publish to {job.get('platform')} failed after {attempts} attempts: {error}")
+
+
+class PlatformLimiter:
+    """Token buckets per platform and per platform credential, tuned by response headers."""
+
+    def __init__(
+        self,
+        limits: Mapping[str, tuple[float, float]] = PLATFORM_LIMITS,
+        credential_limits: Mapping[str, tuple[float, float]] | None = None,
+    ) -> None:
+        self.limits = dict(limits)
+        self.credential_limits = dict(credential_limits) if credential_limits is not None else self.limits
+        self._buckets: dict[tuple[str, str | None], TokenBucket] = {}
+
+    def _bucket(self, platform: str, credential: str | None) -> TokenBucket:
+        key = (platform, credential)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            limits = self.limits if credential is None else self.credential_limits
+            requests, burst = limits.get(platform, DEFAULT_LIMIT)
+            bucket = self._buckets[key] = TokenBucket.per_minute(requests, burst)
+        return bucket
+
+    def buckets(self, platform: str, credential: str | None = None) -> list[TokenBucket]:
+        """The platform's bucket, then the credential's if there is one."""
+        buckets = [self._bucket(platform, None)]
+        if credential is not None:
+            buckets.append(self._bucket(platform, credential))
+        return buckets
+
+    def delay(self, platform: str, credential: str | None = None) -> float:
+        """Seconds until a publish could take a token from every bucket it needs."""
+        return max(bucket.delay() for bucket in self.buckets(platform, credential))
+
+    def try_acquire(self, platform: str, credential: str | None = None) -> bool:
+        """Take one token from each bucket if all of them have one now.
+
+        A bucket that refuses gives back nothing taken from the others.
+        """
+        taken = []
+        for bucket in self.buckets(platform, credential):
+            if not bucket.try_acquire():
+                for earlier in taken:
+                    earlier.refund()
+                return False
+            taken.append(bucket)
+        return True
+
+    def observe(self, platform: str, credential: str | None, headers: Mapping[str, str] | None) -> dict:
+        """Learn from a response's rate-limit headers; returns what was parsed.
+
+        The headers describe the credential's quota when there is one.
+        """
+        info = parse_rate_limit_headers(headers) if headers else {}
+        bucket = self.buckets(platform, credential)[-1]
+        if "remaining" in info:
+            bucket.limit_to(info["remaining"])
+            if info["remaining"] < 1 and "reset_after" in info:
+                bucket.pause(info["reset_after"])
+        if "retry_after" in info:
+            bucket.pause(info["retry_after"])
+        return info
+
+    def throttle(self, platform: str, credential: str | None, seconds: float) -> None:
+        """Pause the limit that rejected a publish (the credential's, if any) for ``seconds``."""
+        self.buckets(platform, credential)[-1].pause(seconds)
+
+
+class _Publish:
+    __slots__ = ("job", "future", "attempts", "rate_limited")
+
+    def __init__(self, job: dict, future: asyncio.Future) -> None:
+        self.job = job
+        self.future = future
+        self.attempts = 0
+        self.rate_limited = 0
+
+    @property
+    def lane(self) -> tuple[str, str | None]:
+        return self.job["platform"], self.job.get("credential")
+
+
+class PublishScheduler:
+    """Publishes jobs within platform rate limits, retrying on the retry table.
+
+    ``publish(job)`` does the work for a job dict with a ``"platform"`` and
+    optionally a ``"credential"``. It raises :class:`RateLimited` when the
+    platform rejects it. A result with ``headers`` (an HTTP response, or a
+    mapping with a ``"headers"`` item) is fed to the limiter. Exceptions in
+    ``fatal`` fail a publish without retrying. ``on_escalate(job, error)`` is
+    called, and may be a coroutine, when a publish runs out of attempts.
+
+    The wakeup event, the dispatcher and the publishes' futures belong to
+    the event loop that submitted them. They are created on first use and
+    again when publishes come from another loop (a second ``asyncio.run``);
+    publishes left behind by a closed loop are dropped. Use one loop at a
+    time.
+    """
+
+    def __init__(
+        self,
+        publish: Publisher,
+        limiter: PlatformLimiter | None = None,
+        delays: tuple[float, ...] = RETRY_DELAYS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        fatal: tuple[type[BaseException], ...] = (),
+        on_escalate: Callable[[dict, BaseException], Any] | None = None,
+    ) -> None:
+        self._publish = publish
+        self.limiter = limiter if limiter is not None else PlatformLimiter()
+        self.delays = delays
+        self.max_concurrency = max_concurrency
+        self.fatal = fatal
+        self.on_escalate = on_escalate
+        self.stats = {"published": 0, "failed": 0, "retried": 0, "rate_limited": 0, "escalated": 0}
+        self._delayed: list[tuple[float, int, _Publish]] = []
+        self._lanes: dict[tuple[str, str | None], deque[_Publish]] = {}
+        self._ready: list[tuple[float, int, tuple[str, str | None]]] = []
+        self._order = itertools.count()
+        self._active: set[asyncio.Task] = set()
+        self._pending: set[asyncio.Future] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        """The running loop, with the loop-bound state moved onto it if it is new."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return loop
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._dispatcher = None
+
+        def alive(future: asyncio.Future) -> bool:
+            return not future.get_loop().is_closed()
+
+        self._active = {task for task in self._active if alive(task)}
+        self._pending = {future for future in self._pending if alive(future)}
+        self._delayed = [item for item in self._delayed if alive(item[2].future)]
+        heapq.heapify(self._delayed)
+        for key, lane in list(self._lanes.items()):
+            lane = deque(entry for entry in lane if alive(entry.future))
+            if lane:
+                self._lanes[key] = lane
+            else:
+                del self._lanes[key]
+        self._ready = [(loop.time(), next(self._order), key) for key in self._lanes]
+        if self._delayed or self._lanes:
+            self._dispatcher = loop.create_task(self._dispatch())
+        return loop
+
+    def submit(self, job: dict) -> asyncio.Future:
+        """Queue ``job``; the future resolves to ``publish``'s result."""
+        loop = self._bind()
+        entry = _Publish(job, loop.create_future())
+        self._pending.add(entry.future)
+        entry.future.add_done_callback(self._pending.discard)
+        self._schedule(entry, loop.time() + self.delays[0])
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        return entry.future
+
+    async def publish(self, job: dict) -> Any:
+        return await self.submit(job)
+
+    async def join(self) -> None:
+        """Wait until every submitted publish has finished or escalated."""
+        self._bind()
+        while self._pending:
+            await asyncio.wait(set(self._pending))
+
+    async def close(self) -> None:
+        """Stop dispatching; queued and running publishes are cancelled."""
+        self._bind()
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+        for task in list(self._active):
+            task.cancel()
+        await asyncio.gather(*self._active, return_exceptions=True)
+        for future in list(self._pending):
+            future.cancel()
+
+    def queued(self) -> int:
+        return len(self._delayed) + sum(len(lane) for lane in self._lanes.values())
+
+    def _schedule(self, entry: _Publish, at: float) -> None:
+        heapq.heappush(self._delayed, (at, next(self._order), entry))
+        self._wakeup.set()
+
+    def _enqueue(self, entry: _Publish, now: float) -> None:
+        lane = self._lanes.get(entry.lane)
+        if lane is None:
+            lane = self._lanes[entry.lane] = deque()
+            heapq.heappush(self._ready, (now, next(self._order), entry.lane))
+        lane.append(entry)
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            while self._delayed and self._delayed[0][0] <= now:
+                self._enqueue(heapq.heappop(self._delayed)[2], now)
+            while self._ready and self._ready[0][0] <= now and len(self._active) < self.max_concurrency:
+                _, _, key = heapq.heappop(self._ready)
+                wait = self.limiter.delay(*key)
+                if wait > 0:
+                    heapq.heappush(self._ready, (now + wait, next(self._order), key))
+                    continue
+                lane = self._lanes[key]
+                entry = lane[0]
+                if not entry.future.done():
+                    if not self.limiter.try_acquire(*key):
+                        # Leave the entry at the head of its lane and look again later.
+                        wait = max(self.limiter.delay(*key), MIN_LANE_RETRY)
+                        heapq.heappush(self._ready, (now + wait, next(self._order), key))
+                        continue
+                    task = loop.create_task(self._attempt(entry))
+                    self._active.add(task)
+                    task.add_done_callback(self._finished)
+                lane.popleft()
+                if lane:
+                    heapq.heappush(self._ready, (now, next(self._order), key))
+                else:
+                    del self._lanes[key]
+
+            wakeups = [self._delayed[0][0]] if self._delayed else []
+            if self._ready and len(self._active) < self.max_concurrency:
+                wakeups.append(self._ready[0][0])
+            self._wakeup.clear()
+            timer = loop.call_at(min(wakeups), self._wakeup.set) if wakeups else None
+            try:
+                await self._wakeup.wait()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._active.discard(task)
+        self._wakeup.set()
+
+    async def _attempt(self, entry: _Publish) -> None:
+        loop = asyncio.get_running_loop()
+        platform, credential = entry.lane
+        entry.attempts += 1
+        try:
+            result = await self._publish(entry.job)
+        except asyncio.CancelledError:
+            entry.future.cancel()
+            raise
+        except RateLimited as exc:
+            self.stats["rate_limited"] += 1
+            entry.attempts -= 1
+            entry.rate_limited += 1
+            pause = self.limiter.observe(platform, credential, exc.headers).get("retry_after", exc.retry_after)
+            if pause is None:
+                pause = DEFAULT_RATE_LIMIT_PAUSE
+            self.limiter.throttle(platform, credential, pause)
+            if entry.rate_limited >= MAX_RATE_LIMITED:
+                await self._escalate(entry, exc)
+                return
+            logger.warning("publish to %s rate limited, retrying in %gs", platform, pause)
+            self._schedule(entry, loop.time() + pause)
+        except self.fatal as exc:
+            self.stats["failed"] += 1
+            logger.error("publish to %s failed: %s", platform, exc)
+            if not entry.future.done():
+                entry.future.set_exception(exc)
+        except Exception as exc:
+            if entry.attempts >= len(self.delays):
+                await self._escalate(entry, exc)
+                return
+            self.stats["retried"] += 1
+            delay = self.delays[entry.attempts]
+            logger.warning(
+                "publish to %s failed (attempt %d), retrying in %gs: %s", platform, entry.attempts, delay, exc
+            )
+            self._schedule(entry, loop.time() + delay)
+        else:
+            headers = result.get("headers") if isinstance(result, Mapping) else getattr(result, "headers", None)
+            self.limiter.observe(platform, credential, headers)
+            self.stats["published"] += 1
+            logger.info("published to %s after %d attempt(s)", platform, entry.attempts)
+            if not entry.future.done():
+                entry.future.set_result(result)
+
+    async def _escalate(self, entry: _Publish, error: BaseException) -> None:
+        self.stats["escalated"] += 1
+        logger.error("publish to %s escalated after %d attempt(s): %s", entry.job.get("platform"), entry.attempts, error)
+        if self.on_escalate is not None:
+            outcome = self.on_escalate(entry.job, error)
+            if inspect.isawaitable(outcome):
+                await outcome
+        if not entry.future.done():
+            entry.future.set_exception(PublishEscalated(entry.job, entry.attempts, error))
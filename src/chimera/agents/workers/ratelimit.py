@@ -0,0 +1,133 @@
+"""Token-bucket rate limiting shared by the worker agents."""
+
+import asyncio
+import time
+from collections.abc import Callable, Mapping
+from email.utils import parsedate_to_datetime
+
+# X-RateLimit-Reset values above this are epoch timestamps rather than seconds.
+_EPOCH_THRESHOLD = 10**9
+
+
+class RateLimited(Exception):
+    """Raised when a platform rejects a request for rate limiting.
+
+    ``headers`` are the response's headers, if any, for limiters to learn from.
+    """
+
+    def __init__(self, retry_after: float | None = None, headers: Mapping[str, str] | None = None) -> None:
+        if retry_after is None and headers is not None:
+            retry_after = parse_rate_limit_headers(headers).get("retry_after")
+        self.retry_after = retry_after
+        self.headers = headers
+        super().__init__(f"rate limited, retry after {retry_after}s" if retry_after else "rate limited")
+
+
+def _seconds(value: str, now: float) -> float | None:
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+        except (TypeError, ValueError):
+            return None
+    return max(0.0, seconds - now) if seconds > _EPOCH_THRESHOLD else max(0.0, seconds)
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str], now: float | None = None) -> dict[str, float]:
+    """``limit``, ``remaining``, ``reset_after`` and ``retry_after`` from response headers.
+
+    Reads ``X-RateLimit-*`` (and the unprefixed ``RateLimit-*``) and
+    ``Retry-After``; times may be seconds, epoch timestamps or HTTP dates.
+    Only the values present are returned.
+    """
+    now = time.time() if now is None else now
+    lowered = {key.lower(): value for key, value in headers.items()}
+    parsed: dict[str, float] = {}
+    for name in ("limit", "remaining"):
+        value = lowered.get(f"x-ratelimit-{name}", lowered.get(f"ratelimit-{name}"))
+        if value is not None:
+            try:
+                parsed[name] = float(value)
+            except ValueError:
+                pass
+    for name, header in (("reset_after", "x-ratelimit-reset"), ("retry_after", "retry-after")):
+        value = lowered.get(header, lowered.get("ratelimit-reset") if name == "reset_after" else None)
+        seconds = _seconds(value, now) if value is not None else None
+        if seconds is not None:
+            parsed[name] = seconds
+    return parsed
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average, in bursts of up to ``capacity``.
+
+    ``acquire`` waits for a token; waiters are served in arrival order so a
+    steady stream of callers cannot starve an earlier one.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: float | None = None) -> "TokenBucket":
+        return cls(requests / 60.0, burst)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if they are available right now."""
+        self._refill()
+        if self._tokens >= tokens and not self._lock.locked():
+            self._tokens -= tokens
+            return True
+        return False
+
+    def refund(self, tokens: float = 1.0) -> None:
+        """Give back ``tokens`` taken for a request that was never sent."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def limit_to(self, tokens: float) -> None:
+        """Never hold more than ``tokens``, e.g. what the platform says remains."""
+        self._refill()
+        self._tokens = min(self._tokens, tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out nothing for ``seconds``, then resume at the normal rate."""
+        self._refill()
+        self._tokens = min(self._tokens, 1.0 - seconds * self.rate)
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` would be available."""
+        self._refill()
+        return max(0.0, (tokens - self._tokens) / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                wait = self.delay(tokens)
+                if wait <= 0:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep(wait)
@@ -0,0 +1,189 @@
+"""Precompiled script skeletons with incremental segment regeneration.
+
+A skeleton is the ordered list of segments (hook, main point, conclusion,
+call to action) a script has for one platform and style, each with its
+share of the running time and a text template. Templates are parsed once
+into literal and field parts, and the fields a template uses are its inputs:
+the hook of an educational script only uses the topic, so it is the same
+segment on every platform, while the main point also uses its own length
+in seconds. Rendered segments are cached by template and input values, so
+regenerating a script after one input changes only re-renders the segments
+that use it.
+"""
+
+import asyncio
+import string
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from chimera.core.singleflight import SingleFlight
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Segment shares of the running time; each skeleton renormalises over the
+# segments it has.
+SEGMENT_SHARES = {"hook": 0.1, "main": 0.6, "conclusion": 0.2, "cta": 0.1}
+
+PLATFORM_SEGMENTS = {
+    "tiktok": ("hook", "main", "cta"),
+    "youtube": ("hook", "main", "conclusion", "cta"),
+    "twitter": ("hook", "main"),
+    "instagram": ("hook", "main", "cta"),
+}
+
+STYLE_TEMPLATES = {
+    "educational": {
+        "hook": "Hook: {Topic} is changing content creation...",
+        "main": "Main point: here's how {topic} works, step by step, in {seconds} seconds.",
+        "conclusion": "Conclusion: start with {topic} today!",
+    },
+    "entertaining": {
+        "hook": "Hook: you won't believe what {topic} can do.",
+        "main": "Main point: {seconds} seconds of the wildest {topic} moments.",
+        "conclusion": "Conclusion: which {topic} moment was your favourite?",
+    },
+    "news": {
+        "hook": "Hook: breaking - {Topic} is trending right now.",
+        "main": "Main point: what happened with {topic} and why it matters, in {seconds} seconds.",
+        "conclusion": "Conclusion: we'll keep following {topic}.",
+    },
+}
+
+CTA_TEMPLATES = {
+    "tiktok": "Follow for part two on {topic}!",
+    "youtube": "Subscribe for the full {topic} series.",
+    "twitter": "Repost if this helped.",
+    "instagram": "Save this for your next {topic} project.",
+}
+
+# writer(role, draft, inputs) -> final text, e.g. a model call that polishes the draft.
+SegmentWriter = Callable[[str, str, dict], Awaitable[str]]
+
+_formatter = string.Formatter()
+
+
+class CompiledTemplate:
+    """A template parsed once into literal and field parts."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.parts: list[tuple[str, str | None]] = [
+            (literal, field) for literal, field, _, _ in _formatter.parse(source)
+        ]
+        self.fields = tuple(sorted({field for _, field in self.parts if field}))
+
+    def render(self, values: dict) -> str:
+        return "".join(
+            literal + (str(values[field]) if field else "") for literal, field in self.parts
+        )
+
+
+class Skeleton:
+    """The compiled segments of one platform and style."""
+
+    def __init__(self, platform: str, style: str) -> None:
+        self.platform = platform
+        self.style = style
+        templates = STYLE_TEMPLATES.get(style, STYLE_TEMPLATES["educational"])
+        roles = PLATFORM_SEGMENTS.get(platform, PLATFORM_SEGMENTS["youtube"])
+        total = sum(SEGMENT_SHARES[role] for role in roles)
+        self.segments: list[tuple[str, CompiledTemplate, float]] = [
+            (
+                role,
+                CompiledTemplate(CTA_TEMPLATES.get(platform, "") if role == "cta" else templates[role]),
+                SEGMENT_SHARES[role] / total,
+            )
+            for role in roles
+        ]
+
+    def layout(self, duration: int) -> list[tuple[str, CompiledTemplate, int, int]]:
+        """Segments with their start timestamp and length in whole seconds."""
+        laid_out = []
+        start = 0
+        for index, (role, template, share) in enumerate(self.segments):
+            length = duration - start if index == len(self.segments) - 1 else round(duration * share)
+            laid_out.append((role, template, start, length))
+            start += length
+        return laid_out
+
+
+class ScriptTemplateEngine:
+    """Renders scripts from precompiled skeletons, re-rendering only changed segments."""
+
+    def __init__(self, writer: SegmentWriter | None = None, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.writer = writer
+        self.cache_size = cache_size
+        self.rendered = 0
+        self.reused = 0
+        self._skeletons: dict[tuple[str, str], Skeleton] = {}
+        self._segments: OrderedDict[tuple, str] = OrderedDict()
+        self._flights: SingleFlight[str] = SingleFlight()
+
+    def skeleton(self, platform: str, style: str) -> Skeleton:
+        key = (platform, style)
+        skeleton = self._skeletons.get(key)
+        if skeleton is None:
+            skeleton = self._skeletons[key] = Skeleton(platform, style)
+        return skeleton
+
+    async def _segment(self, role: str, template: CompiledTemplate, values: dict) -> tuple[str, bool]:
+        """The segment's text and whether it was rendered now."""
+        inputs = {field: values[field] for field in template.fields}
+        key = (role, template.source, tuple(inputs.items()))
+        text = self._segments.get(key)
+        if text is not None:
+            self._segments.move_to_end(key)
+            self.reused += 1
+            return text, False
+        text, shared = await self._flights.do(key, lambda: self._write(key, role, template, values, inputs))
+        if shared:
+            self.reused += 1
+        return text, not shared
+
+    async def _write(self, key: tuple, role: str, template: CompiledTemplate, values: dict, inputs: dict) -> str:
+        text = template.render(values)
+        if self.writer is not None:
+            text = await self.writer(role, text, inputs)
+        self.rendered += 1
+        if self.cache_size:
+            self._segments[key] = text
+            while len(self._segments) > self.cache_size:
+                self._segments.popitem(last=False)
+        return text
+
+    async def render(self, topic: str, duration: int, style: str, platform: str) -> dict:
+        """A script in the fixture format, with how many segments were rendered and reused."""
+        skeleton = self.skeleton(platform, style)
+        base = {
+            "topic": topic,
+            "Topic": topic[:1].upper() + topic[1:],
+            "platform": platform,
+            "style": style,
+            "duration": duration,
+        }
+        layout = skeleton.layout(duration)
+        results = await asyncio.gather(
+            *(self._segment(role, template, {**base, "seconds": length}) for role, template, _, length in layout)
+        )
+        return {
+            "id": str(uuid.uuid4()),
+            "title": f"{base['Topic']} ({style}, {platform})",
+            "content": [
+                {"timestamp": start, "text": text, "segment": role}
+                for (role, _, start, _), (text, _) in zip(layout, results)
+            ],
+            "duration_seconds": duration,
+            "style": style,
+            "platform": platform,
+            "segmentsRendered": sum(fresh for _, fresh in results),
+            "segmentsReused": sum(not fresh for _, fresh in results),
+        }
+
+    def info(self) -> dict:
+        return {
+            "skeletons": len(self._skeletons),
+            "segments": len(self._segments),
+            "rendered": self.rendered,
+            "reused": self.reused,
+        }
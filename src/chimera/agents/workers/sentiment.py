@@ -0,0 +1,256 @@
+"""Lexicon-based sentiment scoring for batches of posts.
+
+The lexicon is compiled once into a token → id hash table and numpy arrays
+of weights, negator flags and booster factors. A batch is tokenised on its
+raw bytes into one flat id array with the post each token belongs to, without
+building a Python string per token; negation, boosting, the per-post sums and
+the per-topic aggregates are then whole-array operations rather than a
+Python loop per post. Large batches are split across a process
+pool.
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+
+import numpy as np
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "lexicons", "sentiment.json")
+# Batches at least this large are scored in the process pool.
+DEFAULT_PROCESS_THRESHOLD = 50_000
+CHUNK_SIZE = 20_000
+# Posts encoded at once; keeps the per-byte arrays small enough to stay in cache.
+SCORE_CHUNK = 4096
+
+NEGATION_WINDOW = 3
+NEGATION_SCALE = -0.74
+# Normalises a post's summed weight into (-1, 1), as VADER does.
+NORMALISATION_ALPHA = 15.0
+# Scores within this distance of zero count as neutral.
+NEUTRAL_BAND = 0.05
+
+# Bytes that make up tokens: ASCII letters and digits, plus an apostrophe
+# between a word character and a letter ("don't").
+_WORD_BYTES = np.zeros(256, dtype=bool)
+_WORD_BYTES[list(b"abcdefghijklmnopqrstuvwxyz0123456789")] = True
+_ALPHA_BYTES = np.zeros(256, dtype=bool)
+_ALPHA_BYTES[list(b"abcdefghijklmnopqrstuvwxyz")] = True
+_APOSTROPHE = ord("'")
+_SEPARATOR = "\x00"
+
+# Tokens are hashed as sum(byte_i * BASE**i) mod 2**64. BASE is odd, so it is
+# invertible and a token's hash can be cut out of the prefix sums of a whole
+# batch without knowing where the token starts.
+_HASH_BASE = 1099511628211
+_HASH_INVERSE = pow(_HASH_BASE, -1, 2**64)
+_powers = (np.ones(1, dtype=np.uint64), np.ones(1, dtype=np.uint64))
+
+
+def _hash_powers(length: int) -> tuple[np.ndarray, np.ndarray]:
+    """BASE**i and BASE**-i mod 2**64 for i < ``length``, grown and cached as needed."""
+    global _powers
+    if len(_powers[0]) < length:
+        size = max(length, 2 * len(_powers[0]))
+        forward = np.full(size, _HASH_BASE, dtype=np.uint64)
+        inverse = np.full(size, _HASH_INVERSE, dtype=np.uint64)
+        forward[0] = inverse[0] = 1
+        _powers = (np.cumprod(forward, dtype=np.uint64), np.cumprod(inverse, dtype=np.uint64))
+    return _powers
+
+
+def token_hash(token: str) -> int:
+    return sum(byte * pow(_HASH_BASE, i, 2**64) for i, byte in enumerate(token.encode())) % 2**64
+
+
+class Lexicon:
+    """A sentiment lexicon compiled into lookup arrays; id 0 is the unknown token.
+
+    Tokens are lower-cased runs of ASCII letters and digits, optionally with
+    one inner apostrophe. The token → id table is a sorted array of token
+    hashes searched with ``np.searchsorted``.
+    """
+
+    def __init__(
+        self,
+        words: dict[str, float],
+        negators: list[str] | None = None,
+        boosters: dict[str, float] | None = None,
+    ) -> None:
+        negators = negators or []
+        boosters = boosters or {}
+        vocabulary = list(dict.fromkeys(chain(words, negators, boosters)))
+        self.source = {"words": dict(words), "negators": list(negators), "boosters": dict(boosters)}
+        self.ids = {token: index for index, token in enumerate(vocabulary, start=1)}
+        size = len(vocabulary) + 1
+        self.weights = np.zeros(size, dtype=np.float64)
+        self.negator = np.zeros(size, dtype=bool)
+        self.boost = np.zeros(size, dtype=np.float64)
+        for token, weight in words.items():
+            self.weights[self.ids[token]] = weight
+        for token in negators:
+            self.negator[self.ids[token]] = True
+        for token, factor in boosters.items():
+            self.boost[self.ids[token]] = factor
+
+        hashes = np.array([token_hash(token) for token in vocabulary], dtype=np.uint64)
+        order = np.argsort(hashes)
+        self._hashes = hashes[order]
+        self._hash_ids = (order + 1).astype(np.int32)
+        if len(np.unique(self._hashes)) != len(self._hashes):
+            raise ValueError("lexicon tokens collide in the token hash")
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_LEXICON_PATH) -> "Lexicon":
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data["words"], data.get("negators"), data.get("boosters"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def encode(self, posts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Token ids of every post, concatenated, and the post each token belongs to."""
+        text = _SEPARATOR.join(posts)
+        if text.count(_SEPARATOR) != max(0, len(posts) - 1):
+            text = _SEPARATOR.join(post.replace(_SEPARATOR, " ") for post in posts)
+        buffer = np.frombuffer(text.lower().encode("utf-8"), dtype=np.uint8)
+        if not len(buffer):
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64)
+
+        word = _WORD_BYTES[buffer]
+        joins = buffer == _APOSTROPHE
+        joins[0] = joins[-1] = False
+        joins[1:-1] &= word[:-2] & _ALPHA_BYTES[buffer[2:]]
+        edges = np.diff((word | joins).view(np.int8), prepend=np.int8(0), append=np.int8(0))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        forward, inverse = _hash_powers(len(buffer) + 1)
+        prefix = np.zeros(len(buffer) + 1, dtype=np.uint64)
+        np.cumsum(buffer * forward[: len(buffer)], out=prefix[1:])
+        hashes = (prefix[ends] - prefix[starts]) * inverse[starts]
+
+        slots = np.searchsorted(self._hashes, hashes)
+        slots[slots == len(self._hashes)] = 0
+        ids = np.where(self._hashes[slots] == hashes, self._hash_ids[slots], 0)
+        owner = np.searchsorted(np.flatnonzero(buffer == 0), starts)
+        return ids, owner
+
+    def score(self, posts: list[str]) -> np.ndarray:
+        """Compound score in [-1, 1] for each post."""
+        if len(posts) > SCORE_CHUNK:
+            return np.concatenate(
+                [self.score(posts[i : i + SCORE_CHUNK]) for i in range(0, len(posts), SCORE_CHUNK)]
+            )
+        count = len(posts)
+        ids, owner = self.encode(posts)
+        if not len(ids):
+            return np.zeros(count)
+        weights = self.weights[ids]
+
+        # A negator flips the sign of the next NEGATION_WINDOW tokens in its post.
+        negators = self.negator[ids]
+        negated = np.zeros(len(ids), dtype=bool)
+        for shift in range(1, NEGATION_WINDOW + 1):
+            negated[shift:] |= negators[:-shift] & (owner[shift:] == owner[:-shift])
+        weights = np.where(negated, weights * NEGATION_SCALE, weights)
+
+        # A booster ("very", "barely") scales the token right after it.
+        boost = self.boost[ids]
+        boosted = np.zeros(len(ids))
+        boosted[1:] = np.where(owner[1:] == owner[:-1], boost[:-1], 0.0)
+        weights *= 1.0 + boosted
+
+        totals = np.bincount(owner, weights=weights, minlength=count)
+        return totals / np.sqrt(totals * totals + NORMALISATION_ALPHA)
+
+
+def aggregate(scores: np.ndarray, topics: list[str]) -> dict[str, dict]:
+    """Per-topic mean score and positive/negative/neutral shares."""
+    if not len(scores):
+        return {}
+    names, owner = np.unique(np.asarray(topics, dtype=object), return_inverse=True)
+    counts = np.bincount(owner, minlength=len(names))
+    sums = np.bincount(owner, weights=scores, minlength=len(names))
+    positive = np.bincount(owner, weights=scores >= NEUTRAL_BAND, minlength=len(names))
+    negative = np.bincount(owner, weights=scores <= -NEUTRAL_BAND, minlength=len(names))
+    return {
+        str(name): {
+            "topic": str(name),
+            "sentiment": round(float(sums[i] / counts[i]), 4),
+            "positive": round(float(positive[i] / counts[i]), 4),
+            "negative": round(float(negative[i] / counts[i]), 4),
+            "neutral": round(float(1 - (positive[i] + negative[i]) / counts[i]), 4),
+            "posts": int(counts[i]),
+        }
+        for i, name in enumerate(names)
+    }
+
+
+_process_lexicon: Lexicon | None = None
+
+
+def _init_process(source: dict) -> None:
+    global _process_lexicon
+    _process_lexicon = Lexicon(source["words"], source["negators"], source["boosters"])
+
+
+def _score_in_process(posts: list[str]) -> np.ndarray:
+    return _process_lexicon.score(posts)
+
+
+class SentimentEngine:
+    """Scores batches of posts, using a process pool for large batches.
+
+    The pool is only started on the first batch that reaches
+    ``process_threshold`` and only when more than one CPU is available.
+    """
+
+    def __init__(
+        self,
+        lexicon: Lexicon | None = None,
+        process_threshold: int = DEFAULT_PROCESS_THRESHOLD,
+        max_workers: int | None = None,
+    ) -> None:
+        self.lexicon = lexicon if lexicon is not None else Lexicon.load()
+        self.process_threshold = process_threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _use_pool(self, count: int) -> bool:
+        return count >= self.process_threshold and self.max_workers > 1
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.max_workers, initializer=_init_process, initargs=(self.lexicon.source,)
+            )
+        return self._pool
+
+    def score(self, posts: list[str]) -> np.ndarray:
+        """Compound score in [-1, 1] for each post."""
+        if not self._use_pool(len(posts)):
+            return self.lexicon.score(posts)
+        chunks = [posts[i : i + CHUNK_SIZE] for i in range(0, len(posts), CHUNK_SIZE)]
+        return np.concatenate(list(self._executor().map(_score_in_process, chunks)))
+
+    async def score_async(self, posts: list[str]) -> np.ndarray:
+        """``score`` without blocking the event loop on large batches."""
+        if not self._use_pool(len(posts)):
+            return self.lexicon.score(posts)
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        chunks = [posts[i : i + CHUNK_SIZE] for i in range(0, len(posts), CHUNK_SIZE)]
+        parts = await asyncio.gather(*(loop.run_in_executor(pool, _score_in_process, c) for c in chunks))
+        return np.concatenate(parts)
+
+    def analyze(self, posts: list[str], topics: list[str]) -> dict[str, dict]:
+        """Score ``posts`` and aggregate them by the topic at the same index."""
+        return aggregate(self.score(posts), topics)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,274 @@
+"""Adaptive polling of platform trend feeds.
+
+One poller runs per platform × niche. Pollers start at jittered offsets and
+their fetches run concurrently, all drawing from one requests-per-minute
+budget. Each poller's interval adapts to what it sees: it halves while the
+feed's velocity is rising toward the alert threshold, backs off while the
+feed is quiet and honours ``retry_after`` when the platform rate-limits it.
+Quiet feeds never back off past ``max_interval``, which defaults to two
+thirds of the 30 second detection latency target so that a spike starting
+just after a poll is still caught in time.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from .ratelimit import RateLimited, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_EVERY = 10.0
+DEFAULT_ALERT_THRESHOLD = 200.0
+DEFAULT_REQUESTS_PER_MINUTE = 120.0
+DETECTION_LATENCY_TARGET = 30.0
+QUIET_INTERVAL_CAP = DETECTION_LATENCY_TARGET * 2 / 3
+# Velocity is a percentage increase, extrapolated to this window (seconds).
+VELOCITY_WINDOW = 60.0
+
+# (minimum velocity, urgency), highest first; see "Velocity Thresholds".
+URGENCY_LEVELS = ((1000.0, "critical"), (500.0, "high"), (200.0, "medium"), (0.0, "low"))
+
+Fetcher = Callable[[str, str], Awaitable[list[dict]]]
+
+
+def urgency_for(velocity: float) -> str:
+    for floor, urgency in URGENCY_LEVELS:
+        if velocity > floor:
+            return urgency
+    return "low"
+
+
+class _Poller:
+    """State of one platform × niche feed."""
+
+    def __init__(self, index: int, platform: str, niche: str, interval: float) -> None:
+        self.index = index
+        self.platform = platform
+        self.niche = niche
+        self.interval = interval
+        self.signal = 0.0
+        self.polls = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.volumes: dict[str, tuple[float, float]] = {}
+        self.alerting: set[str] = set()
+
+
+class AdaptivePollingScheduler:
+    """Polls every platform × niche feed within a global request budget.
+
+    ``fetch(platform, niche)`` returns observations such as
+    ``{"topic": ..., "volume": ..., "keywords": [...]}``; a ``velocity``
+    (percent increase) may be given directly, otherwise it is derived from
+    successive volumes. Every topic crossing ``alert_threshold`` is reported
+    once per rise, to ``on_trend`` as it is detected and in ``run``'s result.
+    Set ``adaptive=False`` to poll at a fixed ``check_every``. ``budget``
+    is the requests-per-minute bucket to draw from, if it is shared with
+    other schedulers. A scheduler can ``run`` again and again, keeping each
+    feed's interval and volumes, but only one run at a time; ``detections``
+    holds the latest run's trends.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetcher,
+        platforms: list[str],
+        niches: list[str],
+        check_every: float = DEFAULT_CHECK_EVERY,
+        alert_threshold: float = DEFAULT_ALERT_THRESHOLD,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        min_interval: float | None = None,
+        max_interval: float | None = None,
+        velocity_window: float = VELOCITY_WINDOW,
+        max_concurrency: int = 8,
+        adaptive: bool = True,
+        on_trend: Callable[[dict], Any] | None = None,
+        seed: int | None = None,
+        budget: TokenBucket | None = None,
+    ) -> None:
+        self.fetch = fetch
+        self.check_every = check_every
+        self.alert_threshold = alert_threshold
+        self.min_interval = min_interval if min_interval is not None else check_every / 4
+        self.max_interval = (
+            max_interval if max_interval is not None else max(check_every, QUIET_INTERVAL_CAP)
+        )
+        self.velocity_window = velocity_window
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive
+        self.on_trend = on_trend
+        feeds = [(platform, niche) for platform in platforms for niche in niches]
+        self.pollers = [_Poller(index, *feed, check_every) for index, feed in enumerate(feeds)]
+        # Trends of the current (or last) run only, so a reused scheduler stays small.
+        self.detections: list[dict] = []
+        self.detected = 0
+        if budget is None:
+            budget = TokenBucket.per_minute(requests_per_minute, burst=max(1.0, len(feeds) / 2))
+        self.budget = budget
+        self.running = False
+        self._rng = random.Random(seed)
+        self._due: list[tuple[float, int]] = []
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def calls(self) -> int:
+        return sum(poller.polls for poller in self.pollers)
+
+    async def run(self, duration: float) -> list[dict]:
+        """Poll for ``duration`` seconds and return the trends detected.
+
+        With ``duration=0`` every feed is polled exactly once.
+        """
+        if self.running:
+            raise RuntimeError("AdaptivePollingScheduler is already running")
+        self.running = True
+        try:
+            return await self._run(duration)
+        finally:
+            self.running = False
+
+    async def _run(self, duration: float) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        start = loop.time()
+        deadline = start + duration
+        once = duration <= 0
+        self._due = [
+            (start + (0.0 if once else self._rng.uniform(0, poller.interval)), index)
+            for index, poller in enumerate(self.pollers)
+        ]
+        heapq.heapify(self._due)
+        slots = asyncio.Semaphore(self.max_concurrency)
+        in_flight: set[asyncio.Task] = set()
+        self.detections = detections = []
+
+        try:
+            while self._due or in_flight:
+                if not self._due:
+                    # Every feed is being polled; each reschedules itself when done.
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                due, index = self._due[0]
+                if not once and due >= deadline:
+                    break
+                wait = due - loop.time()
+                if wait > 0:
+                    # A poll finishing early may schedule a feed ahead of this one.
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), wait)
+                    except TimeoutError:
+                        pass
+                    continue
+                heapq.heappop(self._due)
+                await self.budget.acquire()
+                if not once and loop.time() >= deadline:
+                    break
+                await slots.acquire()
+                task = asyncio.create_task(self._poll(self.pollers[index], slots, reschedule=not once))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            await asyncio.gather(*in_flight)
+        finally:
+            for task in in_flight:
+                task.cancel()
+        return detections
+
+    async def _poll(self, poller: _Poller, slots: asyncio.Semaphore, reschedule: bool) -> None:
+        loop = asyncio.get_running_loop()
+        retry_after = 0.0
+        try:
+            poller.polls += 1
+            observations = await self.fetch(poller.platform, poller.niche)
+        except RateLimited as exc:
+            poller.rate_limited += 1
+            retry_after = exc.retry_after or 0.0
+            if self.adaptive:
+                poller.interval = min(self.max_interval, poller.interval * 2)
+        except Exception as exc:
+            poller.errors += 1
+            logger.warning("trend poll %s/%s failed: %s", poller.platform, poller.niche, exc)
+            if self.adaptive:
+                poller.interval = min(self.max_interval, poller.interval * 2)
+        else:
+            signal = self._observe(poller, observations, loop.time())
+            if self.adaptive:
+                poller.interval = self._next_interval(poller, signal)
+            poller.signal = signal
+        finally:
+            slots.release()
+        if reschedule:
+            # The platform's retry_after wins even over max_interval.
+            delay = max(poller.interval, retry_after)
+            heapq.heappush(self._due, (loop.time() + delay, poller.index))
+            self._wakeup.set()
+
+    def _next_interval(self, poller: _Poller, signal: float) -> float:
+        threshold = self.alert_threshold
+        if signal >= threshold / 2 and signal > poller.signal:
+            interval = poller.interval / 2
+        elif signal < threshold / 4:
+            interval = poller.interval * 1.5
+        else:
+            # Neither rising nor quiet: drift back toward the configured interval.
+            interval = (poller.interval + self.check_every) / 2
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _observe(self, poller: _Poller, observations: list[dict], now: float) -> float:
+        """Update volumes, report threshold crossings, return the feed's peak velocity."""
+        signal = 0.0
+        for observation in observations:
+            topic = observation["topic"]
+            velocity = observation.get("velocity")
+            volume = float(observation.get("volume", 0.0))
+            previous = poller.volumes.get(topic)
+            if velocity is None:
+                velocity = 0.0
+                if previous is not None and previous[1] > 0 and now > previous[0]:
+                    growth = (volume - previous[1]) / previous[1]
+                    velocity = growth * self.velocity_window / (now - previous[0]) * 100
+            poller.volumes[topic] = (now, volume)
+            signal = max(signal, velocity)
+            if velocity < self.alert_threshold:
+                poller.alerting.discard(topic)
+                continue
+            if topic in poller.alerting:
+                continue
+            poller.alerting.add(topic)
+            trend = {
+                "topic": topic,
+                "keywords": list(observation.get("keywords", [])),
+                "velocity": round(velocity, 2),
+                "platform": poller.platform,
+                "niche": poller.niche,
+                "detectedAt": datetime.now(timezone.utc).isoformat(),
+                "urgency": urgency_for(velocity),
+                "engagement": observation.get("engagement"),
+            }
+            logger.info("trend detected: %s on %s (velocity %.0f%%)", topic, poller.platform, velocity)
+            self.detections.append(trend)
+            self.detected += 1
+            if self.on_trend is not None:
+                self.on_trend(trend)
+        return signal
+
+    def stats(self) -> dict:
+        """Calls made and current interval per feed."""
+        return {
+            "calls": self.calls,
+            "rate_limited": sum(poller.rate_limited for poller in self.pollers),
+            "errors": sum(poller.errors for poller in self.pollers),
+            "detections": self.detected,
+            "feeds": {
+                f"{poller.platform}/{poller.niche}": {
+                    "polls": poller.polls,
+                    "interval": round(poller.interval, 3),
+                }
+                for poller in self.pollers
+            },
+        }
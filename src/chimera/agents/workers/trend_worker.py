@@ -1,21 +1,128 @@
 """Trend Worker - Autonomous trend discovery and analysis."""
 
+from collections import OrderedDict
+
+from .ratelimit import TokenBucket
+from .sentiment import SentimentEngine, aggregate
+from .trend_polling import (
+    DEFAULT_ALERT_THRESHOLD,
+    DEFAULT_CHECK_EVERY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    AdaptivePollingScheduler,
+    Fetcher,
+)
+
+# TREND-006: avoid trend overload.
+MAX_TRENDS = 10
+# Polling schedulers kept per distinct discovery; the least recently used goes first.
+MAX_SCHEDULERS = 32
+
 
 class TrendWorker:
-    """Discovers trends, analyzes sentiment, and maps topics."""
+    """Discovers trends, analyzes sentiment, and maps topics.
 
-    def __init__(self) -> None:
-        pass
+    ``fetcher(platform, niche)`` reads one platform feed (see
+    :mod:`chimera.agents.workers.trend_polling`); every discovery shares the
+    worker's ``requests_per_minute`` budget across its pollers. The polling
+    scheduler of a discovery is kept for the next one over the same feeds,
+    so each feed's adaptive interval and last volumes carry over.
+    """
+
+    def __init__(
+        self,
+        fetcher: Fetcher | None = None,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        seed: int | None = None,
+        sentiment: SentimentEngine | None = None,
+    ) -> None:
+        self.fetcher = fetcher
+        self.sentiment = sentiment
+        self.requests_per_minute = requests_per_minute
+        self.seed = seed
+        self.last_poll_stats: dict | None = None
+        self.budget = TokenBucket.per_minute(requests_per_minute)
+        self._schedulers: OrderedDict[tuple, AdaptivePollingScheduler] = OrderedDict()
+
+    def _scheduler(self, platforms: list[str], niches: list[str], time_range: dict) -> AdaptivePollingScheduler:
+        check_every = float(time_range.get("checkEvery", DEFAULT_CHECK_EVERY))
+        alert_threshold = float(time_range.get("alertThreshold", DEFAULT_ALERT_THRESHOLD))
+        key = (tuple(platforms), tuple(niches), check_every, alert_threshold)
+        scheduler = self._schedulers.get(key)
+        if scheduler is not None and not scheduler.running:
+            self._schedulers.move_to_end(key)
+            return scheduler
+        scheduler = AdaptivePollingScheduler(
+            self.fetcher,
+            platforms,
+            niches,
+            check_every=check_every,
+            alert_threshold=alert_threshold,
+            seed=self.seed,
+            budget=self.budget,
+        )
+        if key not in self._schedulers:
+            # A discovery overlapping a running one over the same feeds polls on its own.
+            self._schedulers[key] = scheduler
+            if len(self._schedulers) > MAX_SCHEDULERS:
+                self._schedulers.popitem(last=False)
+        return scheduler
 
     async def discover_trends(
         self, platforms: list[str], niches: list[str], time_range: dict
     ) -> list[dict]:
-        """Discover trending topics across platforms."""
-        pass
+        """Discover trending topics across platforms.
 
-    async def analyze_sentiment(self, topic: str) -> dict:
-        """Analyze sentiment around a specific topic."""
-        pass
+        ``time_range`` takes the input contract's ``checkEvery`` and
+        ``alertThreshold`` plus a ``duration`` in seconds to keep polling for;
+        without a duration every feed is polled once. Trends outside the
+        niches are dropped (TREND-002), duplicates across platforms merged
+        (TREND-003) and the rest sorted by engagement potential (TREND-004)
+        and cut to the top ten (TREND-006).
+        """
+        if self.fetcher is None:
+            raise RuntimeError("TrendWorker has no fetcher configured")
+        scheduler = self._scheduler(platforms, niches, time_range)
+        detected = await scheduler.run(float(time_range.get("duration", 0.0)))
+        self.last_poll_stats = scheduler.stats()
+
+        lowered = [niche.lower() for niche in niches]
+        merged: dict[str, dict] = {}
+        for trend in detected:
+            text = " ".join([trend["topic"], *trend["keywords"]]).lower()
+            if not any(niche in text for niche in lowered):
+                continue
+            key = " ".join(trend["topic"].lower().split())
+            current = merged.get(key)
+            if current is None:
+                merged[key] = dict(trend)
+                continue
+            current["keywords"] = list(dict.fromkeys(current["keywords"] + trend["keywords"]))
+            if trend["velocity"] > current["velocity"]:
+                for field in ("velocity", "platform", "niche", "urgency", "engagement"):
+                    current[field] = trend[field]
+            current["detectedAt"] = min(current["detectedAt"], trend["detectedAt"])
+        ranked = sorted(
+            merged.values(),
+            key=lambda trend: (trend["engagement"] or 0.0, trend["velocity"]),
+            reverse=True,
+        )
+        return ranked[:MAX_TRENDS]
+
+    async def analyze_sentiment(self, topic: str, posts: list[str] | None = None) -> dict:
+        """Analyze sentiment around a specific topic.
+
+        Scores the whole batch of ``posts`` in one call and returns the mean
+        compound score in [-1, 1] with the share of positive, negative and
+        neutral posts.
+        """
+        posts = posts or []
+        if self.sentiment is None:
+            self.sentiment = SentimentEngine()
+        scores = await self.sentiment.score_async(posts)
+        profile = aggregate(scores, [topic] * len(posts)).get(topic)
+        if profile is None:
+            profile = {"topic": topic, "sentiment": 0.0, "positive": 0.0, "negative": 0.0, "neutral": 1.0, "posts": 0}
+        return profile
 
     async def map_topics(self, trends: list[dict]) -> list[dict]:
         """Map trends to content pillars and brand themes."""
@@ -0,0 +1,203 @@
+"""Local wallet state: balances, reservations and nonces.
+
+Checking the balance before every transaction (ECO-004) does not need a
+remote call each time. The wallet's confirmed balances and next nonce are
+fetched once and then tracked locally. Issuing a transfer reserves its
+amount and hands it the next nonce, so concurrent transfers neither
+overdraw the wallet nor collide on a nonce. When a transfer confirms, its
+reservation is settled into the confirmed balance. When it fails before
+broadcast, its funds are released and its nonce reused. The remote state is
+fetched again when ``refresh_interval`` has passed, or when something
+suggests the local copy has drifted (``invalidate``).
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from decimal import Decimal
+
+from chimera.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 30.0
+
+# fetch() -> {"balances": {asset: amount}, "nonce": next on-chain nonce}
+WalletFetcher = Callable[[], Awaitable[dict]]
+
+
+class InsufficientFunds(Exception):
+    """Raised when a transfer exceeds the available balance (ECO-004)."""
+
+    def __init__(self, asset: str, requested: Decimal, available: Decimal) -> None:
+        self.asset = asset
+        self.requested = requested
+        self.available = available
+        super().__init__(f"insufficient {asset}: requested {requested}, available {available}")
+
+
+def _amount(value) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+class Reservation:
+    """Funds and a nonce held for one transfer until it settles."""
+
+    __slots__ = ("id", "asset", "amount", "nonce", "settled", "mined")
+
+    def __init__(self, reservation_id: int, asset: str, amount: Decimal, nonce: int) -> None:
+        self.id = reservation_id
+        self.asset = asset
+        self.amount = amount
+        self.nonce = nonce
+        self.settled = False
+        # Set when a refresh shows the nonce used on chain: the fetched
+        # balances already include this transfer.
+        self.mined = False
+
+
+class WalletState:
+    """Confirmed balances and nonces from the remote wallet, with local reservations."""
+
+    def __init__(
+        self,
+        fetch: WalletFetcher,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self.refreshes = 0
+        self._confirmed: dict[str, Decimal] = {}
+        self._reserved: dict[str, Decimal] = {}
+        self._pending: dict[int, Reservation] = {}
+        self._next_nonce = 0
+        self._free_nonces: list[int] = []
+        self._ids = itertools.count(1)
+        self._refreshed_at: float | None = None
+        self._stale = True
+        self._refreshing: SingleFlight[None] = SingleFlight()
+        # Confirmations recorded while a fetch was in flight: (reservation, fee, fee asset).
+        self._confirmed_during_fetch: list[tuple[Reservation, Decimal, str]] = []
+
+    def invalidate(self) -> None:
+        """Mark the local copy as suspect; the next use refreshes it."""
+        self._stale = True
+
+    def needs_refresh(self) -> bool:
+        return (
+            self._stale
+            or self._refreshed_at is None
+            or self._clock() - self._refreshed_at >= self.refresh_interval
+        )
+
+    async def refresh(self) -> None:
+        """Fetch the remote state; concurrent callers share one fetch."""
+        await self._refreshing.do("remote", self._fetch_and_apply)
+
+    async def _fetch_and_apply(self) -> None:
+        self._confirmed_during_fetch = []
+        self._apply(await self._fetch())
+
+    def _apply(self, remote: dict) -> None:
+        self.refreshes += 1
+        self._confirmed = {asset: _amount(amount) for asset, amount in remote.get("balances", {}).items()}
+        replay, self._confirmed_during_fetch = self._confirmed_during_fetch, []
+        self._refreshed_at = self._clock()
+        self._stale = False
+        if "nonce" not in remote:
+            # Can't tell whether the fetched balances include transfers confirmed
+            # meanwhile: assume not, which can only understate, and check again.
+            for reservation, fee, fee_asset in replay:
+                self._debit(reservation.asset, reservation.amount, fee, fee_asset)
+            self._stale = self._stale or bool(replay)
+        else:
+            chain_nonce = int(remote["nonce"])
+            in_flight = set()
+            for reservation in self._pending.values():
+                reservation.mined = reservation.mined or reservation.nonce < chain_nonce
+                in_flight.add(reservation.nonce)
+            # Nonces below the chain's were used, by us or by someone else.
+            self._free_nonces = [nonce for nonce in self._free_nonces if nonce >= chain_nonce]
+            heapq.heapify(self._free_nonces)
+            for reservation, fee, fee_asset in replay:
+                if reservation.nonce >= chain_nonce:
+                    self._debit(reservation.asset, reservation.amount, fee, fee_asset)
+            if chain_nonce > self._next_nonce:
+                self._next_nonce = chain_nonce
+            elif not in_flight and chain_nonce < self._next_nonce:
+                # Nothing of ours is outstanding, so the chain is right about what's next.
+                self._next_nonce = chain_nonce
+                self._free_nonces = []
+
+    async def ensure_fresh(self) -> None:
+        if self.needs_refresh():
+            await self.refresh()
+
+    def available(self, asset: str) -> Decimal:
+        return self._confirmed.get(asset, Decimal(0)) - self._reserved.get(asset, Decimal(0))
+
+    async def reserve(self, asset: str, amount: float | Decimal) -> Reservation:
+        """Hold ``amount`` of ``asset`` and a nonce for a transfer about to be sent."""
+        await self.ensure_fresh()
+        amount = _amount(amount)
+        available = self.available(asset)
+        if amount > available:
+            raise InsufficientFunds(asset, amount, available)
+        if self._free_nonces:
+            nonce = heapq.heappop(self._free_nonces)
+        else:
+            nonce = self._next_nonce
+            self._next_nonce += 1
+        reservation = Reservation(next(self._ids), asset, amount, nonce)
+        self._reserved[asset] = self._reserved.get(asset, Decimal(0)) + amount
+        self._pending[reservation.id] = reservation
+        return reservation
+
+    def _unreserve(self, reservation: Reservation) -> bool:
+        if reservation.settled:
+            return False
+        reservation.settled = True
+        del self._pending[reservation.id]
+        self._reserved[reservation.asset] -= reservation.amount
+        return True
+
+    def confirm(self, reservation: Reservation, fee: float | Decimal = 0, fee_asset: str | None = None) -> None:
+        """The transfer confirmed: move its amount (and fee) out of the confirmed balance."""
+        if not self._unreserve(reservation) or reservation.mined:
+            return
+        fee, fee_asset = _amount(fee), fee_asset or reservation.asset
+        self._debit(reservation.asset, reservation.amount, fee, fee_asset)
+        if "remote" in self._refreshing:
+            self._confirmed_during_fetch.append((reservation, fee, fee_asset))
+
+    def _debit(self, asset: str, amount: Decimal, fee: Decimal, fee_asset: str) -> None:
+        self._confirmed[asset] = self._confirmed.get(asset, Decimal(0)) - amount
+        if fee:
+            self._confirmed[fee_asset] = self._confirmed.get(fee_asset, Decimal(0)) - fee
+        if any(balance < 0 for balance in self._confirmed.values()):
+            logger.warning("local %s balance went negative, refreshing wallet state", asset)
+            self.invalidate()
+
+    def release(self, reservation: Reservation, broadcast: bool = False) -> None:
+        """The transfer failed: return its funds, and its nonce unless it reached the chain."""
+        if not self._unreserve(reservation):
+            return
+        if broadcast:
+            # The nonce may or may not have been consumed; only the chain knows.
+            self.invalidate()
+        else:
+            heapq.heappush(self._free_nonces, reservation.nonce)
+
+    def snapshot(self) -> dict:
+        assets = sorted(set(self._confirmed) | set(self._reserved))
+        return {
+            "balances": {asset: float(self._confirmed.get(asset, 0)) for asset in assets},
+            "reserved": {asset: float(self._reserved.get(asset, 0)) for asset in assets},
+            "available": {asset: float(self.available(asset)) for asset in assets},
+            "nonce": self._next_nonce,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,6 @@
+"""Performance benchmarks for Chimera subsystems.
+
+Each module exposes a ``run`` function returning a results dict and can be
+executed with ``chimera bench <module> [options]`` or
+``python -m chimera.benchmarks.<module>``.
+"""
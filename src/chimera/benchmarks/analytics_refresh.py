@@ -0,0 +1,107 @@
+"""Dashboard analytics refresh: per-video calls vs batched, tiered collection.
+
+A catalogue of posts, spread over the last month and split between YouTube
+and TikTok, is shown on a dashboard that refreshes its content metrics
+every 30 seconds (specs/frontend.md). The per-video client calls the
+platform once per post per refresh. The collector batches each platform's
+due posts into its maximum batch size and serves the rest from its cache.
+Time is simulated, so an hour of refreshes runs instantly; every
+platform call costs ``latency_ms`` of real time so the per-refresh wall
+time can be compared.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from chimera.agents.workers.analytics import AnalyticsCollector
+
+DASHBOARD_REFRESH = 30.0
+PLATFORMS = ("youtube", "tiktok")
+
+
+class SimulatedPlatforms:
+    """Platform analytics APIs that count calls and sleep ``latency_ms`` per call."""
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    def fetcher(self, platform: str):
+        async def fetch(video_ids: list[str]) -> dict[str, dict]:
+            self.calls += 1
+            await asyncio.sleep(self.latency)
+            return {video_id: {"views": len(video_id), "platform": platform} for video_id in video_ids}
+
+        return fetch
+
+
+async def _run(posts: int, minutes: float, latency_ms: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    now = [0.0]
+    # (content id, platform, published at), up to a month before the dashboard opens.
+    catalogue = []
+    for index in range(posts):
+        platform = PLATFORMS[index % len(PLATFORMS)]
+        catalogue.append((f"{platform}-{index}", platform, -rng.uniform(0, 30 * 86400)))
+    refreshes = int(minutes * 60 / DASHBOARD_REFRESH)
+
+    per_video = SimulatedPlatforms(latency_ms)
+    fetchers = {platform: per_video.fetcher(platform) for platform in PLATFORMS}
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        await asyncio.gather(*(fetchers[platform]([content_id]) for content_id, platform, _ in catalogue))
+    naive_elapsed = time.perf_counter() - start
+
+    batched = SimulatedPlatforms(latency_ms)
+    collector = AnalyticsCollector({p: batched.fetcher(p) for p in PLATFORMS}, clock=lambda: now[0])
+    for content_id, platform, published_at in catalogue:
+        collector.track(content_id, platform, published_at)
+    items = [(content_id, platform) for content_id, platform, _ in catalogue]
+    cycle_ms = []
+    for cycle in range(refreshes):
+        now[0] = cycle * DASHBOARD_REFRESH
+        start = time.perf_counter()
+        await collector.collect(items)
+        cycle_ms.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "benchmark": "analytics_refresh",
+        "posts": posts,
+        "refreshes": refreshes,
+        "latency_ms": latency_ms,
+        "results": {
+            "per_video": {
+                "api_calls": per_video.calls,
+                "calls_per_refresh": round(per_video.calls / refreshes, 1),
+                "ms_per_refresh": round(naive_elapsed * 1000 / refreshes, 2),
+            },
+            "batched_tiered": {
+                "api_calls": batched.calls,
+                "calls_per_refresh": round(batched.calls / refreshes, 1),
+                "posts_fetched": collector.fetched,
+                "first_refresh_ms": round(cycle_ms[0], 2),
+                "ms_per_later_refresh": round(sum(cycle_ms[1:]) / max(1, len(cycle_ms) - 1), 2),
+            },
+        },
+    }
+
+
+def run(posts: int = 3000, minutes: float = 60.0, latency_ms: float = 2.0, seed: int = 7) -> dict:
+    """Refresh a dashboard of ``posts`` every 30 simulated seconds for ``minutes``, both ways."""
+    return asyncio.run(_run(posts, minutes, latency_ms, seed))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=3000)
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.posts, args.minutes, args.latency_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Gas estimation for a batch of creator payouts: per call vs cached and batched.
+
+Each fee-market lookup goes to an oracle that answers after ``latency_ms``.
+The per-call client looks the market up again for every payout, one after
+another, as a transfer loop calling ``estimate_gas`` would. The estimator
+fetches each network's market once per TTL, and ``estimate_gas_many`` prices
+the whole batch from one lookup per network.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from chimera.agents.workers import EconomicWorker
+from chimera.agents.workers.gas import GasEstimator, LocalFeeOracle, network_of
+
+
+def _payouts(count: int) -> list[dict]:
+    assets = ("USDC", "USDC", "USDC", "ETH", "SOL")
+    return [
+        {"recipient": f"0x{index:040x}", "amount": 2.5, "asset": assets[index % len(assets)]}
+        for index in range(count)
+    ]
+
+
+async def _measure(mode: str, payouts: list[dict], latency_ms: float) -> dict:
+    oracle = LocalFeeOracle(latency_ms=latency_ms)
+    start = time.perf_counter()
+    if mode == "per_call":
+        uncached = GasEstimator(oracle.get_fee_market, ttl=0.0)
+        estimates = [await uncached.estimate(payout) for payout in payouts]
+    elif mode == "cached":
+        worker = EconomicWorker(fee_market=oracle.get_fee_market)
+        estimates = [await worker.estimate_gas(payout) for payout in payouts]
+    else:
+        worker = EconomicWorker(fee_market=oracle.get_fee_market)
+        estimates = await worker.estimate_gas_many(payouts)
+    elapsed = time.perf_counter() - start
+    fees: dict[str, float] = {}
+    for payout, estimate in zip(payouts, estimates):
+        fees[network_of(payout)] = fees.get(network_of(payout), 0.0) + estimate
+    return {
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "oracle_calls": oracle.calls,
+        "total_fees": {network: round(total, 12) for network, total in fees.items()},
+    }
+
+
+def run(payouts: int = 500, latency_ms: float = 5.0) -> dict:
+    """Estimate gas for ``payouts`` transfers three ways."""
+    batch = _payouts(payouts)
+    results = {
+        mode: asyncio.run(_measure(mode, batch, latency_ms)) for mode in ("per_call", "cached", "estimate_gas_many")
+    }
+    return {"benchmark": "gas_estimation", "payouts": payouts, "latency_ms": latency_ms, "results": results}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payouts", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.payouts, args.latency_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
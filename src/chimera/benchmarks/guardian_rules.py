@@ -0,0 +1,113 @@
+"""GuardianRuleEngine evaluation latency against the 500ms budget with 10k rules."""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from chimera.core.security import GuardianRuleEngine
+
+BUDGET_MS = 500.0
+
+_WORDS = (
+    "creator audience launch trend video studio brand voice story hook reel caption "
+    "product review morning routine budget travel fitness recipe tutorial unboxing"
+).split()
+
+
+def _term(rng: random.Random) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(6, 12)))
+
+
+def synthetic_rules(count: int, regex_share: float = 0.02, seed: int = 7) -> list[dict]:
+    """Keyword rules plus a small share of regex rules, as a large tenant would ship."""
+    rng = random.Random(seed)
+    severities = ["low", "medium", "high", "critical"]
+    categories = ["brand_safety", "security", "compliance"]
+    rules = []
+    for index in range(count):
+        rule = {
+            "id": f"BENCH-{index:05d}",
+            "category": categories[index % 3],
+            "severity": severities[index % 4],
+        }
+        if rng.random() < regex_share:
+            rule["pattern"] = rf"\b{_term(rng)}\d{{2,4}}\b"
+        else:
+            rule["keywords"] = [_term(rng) for _ in range(rng.randint(1, 3))]
+        rules.append(rule)
+    return rules
+
+
+def synthetic_script(chars: int, planted: list[str], seed: int = 11) -> dict:
+    """A script artifact of roughly ``chars`` characters with ``planted`` terms mixed in."""
+    rng = random.Random(seed)
+    words: list[str] = []
+    size = 0
+    while size < chars:
+        word = rng.choice(planted) if planted and rng.random() < 0.001 else rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    text = " ".join(words)
+    step = 400
+    return {
+        "title": "Benchmark script",
+        "segments": [
+            {"timestamp": i // step, "text": text[i : i + step]} for i in range(0, len(text), step)
+        ],
+    }
+
+
+def run(rules: int = 10_000, chars: tuple[int, ...] = (2_000, 20_000, 100_000), repeat: int = 5) -> dict:
+    """Compile ``rules`` synthetic rules, then time evaluation of scripts of each length."""
+    rule_set = synthetic_rules(rules)
+    planted = [rule["keywords"][0] for rule in rule_set[:50] if "keywords" in rule]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rules.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"rules": rule_set}, handle)
+        start = time.perf_counter()
+        # No result cache: every repeat must scan the script again.
+        engine = GuardianRuleEngine(path, cache_size=0)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+    results = []
+    for length in chars:
+        script = synthetic_script(length, planted)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decision = engine.evaluate("script", script)
+            timings.append((time.perf_counter() - start) * 1000)
+        worst = max(timings)
+        results.append(
+            {
+                "chars": length,
+                "violations": len(decision["violations"]),
+                "ms_best": round(min(timings), 2),
+                "ms_worst": round(worst, 2),
+                "within_budget": worst < BUDGET_MS,
+            }
+        )
+    return {
+        "benchmark": "guardian_rules",
+        "rules": rules,
+        "compile_ms": round(compile_ms, 1),
+        "budget_ms": BUDGET_MS,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=10_000)
+    parser.add_argument("--chars", type=int, nargs="+", default=[2_000, 20_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.rules, tuple(args.chars), args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
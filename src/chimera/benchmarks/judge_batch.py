@@ -0,0 +1,81 @@
+"""JudgeAgent throughput on campaign variants: one-by-one evaluate vs evaluate_batch."""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from chimera.agents.judge import JudgeAgent
+from chimera.core.security import GuardianRuleEngine
+
+_HOOKS = [
+    "Stop scrolling: this changed how I plan content",
+    "Three tools every creator needs this week",
+    "I tried posting daily for a month",
+    "Nobody talks about this editing trick",
+]
+_CTAS = [
+    "Follow for part two",
+    "Save this for later",
+    "Comment your favourite tip",
+    "Share with a friend who needs it",
+    "Vote for the next topic in the comments",
+]
+
+
+def campaign_variants(count: int, seed: int = 3) -> list[dict]:
+    """Variants built from shared hooks, bodies and calls to action, as the Content Worker emits them."""
+    rng = random.Random(seed)
+    words = "creator video edit hook audience growth plan studio light sound story".split()
+    bodies = [" ".join(rng.choice(words) for _ in range(120)) for _ in range(6)]
+    combos = list(itertools.product(_HOOKS, bodies, _CTAS))
+    rng.shuffle(combos)
+    return [
+        {
+            "contentId": f"variant-{index}",
+            "content": {
+                "segments": [{"text": hook}, {"text": body}, {"text": cta}],
+                "platform": "tiktok",
+            },
+        }
+        for index, (hook, body, cta) in enumerate(itertools.islice(itertools.cycle(combos), count))
+    ]
+
+
+async def _run(variants: list[dict]) -> dict:
+    # Disable the evaluation cache so repeated variants are not free in the sequential run.
+    judge = JudgeAgent(GuardianRuleEngine(cache_size=0))
+    start = time.perf_counter()
+    for variant in variants:
+        await judge.evaluate(variant)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranked = await judge.rank_variants(variants)
+    batched = time.perf_counter() - start
+    return {
+        "benchmark": "judge_batch",
+        "variants": len(variants),
+        "sequential_variants_per_second": round(len(variants) / sequential, 1),
+        "batch_variants_per_second": round(len(variants) / batched, 1),
+        "speedup": round(sequential / batched, 2),
+        "top_variant": ranked[0]["contentId"],
+    }
+
+
+def run(variants: int = 2000) -> dict:
+    """Evaluate ``variants`` campaign variants both ways and report variants per second."""
+    return asyncio.run(_run(campaign_variants(variants)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--variants", type=int, default=2000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.variants), indent=2))
+
+
+if __name__ == "__main__":
+    main()
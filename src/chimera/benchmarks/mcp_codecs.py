@@ -0,0 +1,96 @@
+"""Encode/decode microbenchmark for the MCP wire codecs."""
+
+import argparse
+import json
+import time
+
+from chimera.core.mcp import make_request
+from chimera.core.wire import CODECS, decode_frame, encode_frame
+
+
+def _task_request(parameters: dict, artifacts: list) -> dict:
+    return make_request(
+        {
+            "mcp_version": "1.0",
+            "message_type": "task_request",
+            "sender": "planner-001",
+            "recipient": "content-worker-001",
+            "timestamp": "2024-01-01T00:00:00Z",
+            "payload": {
+                "task_id": "5f0c6a1e-8f7e-4a53-9d1c-2b7f3f1c9a10",
+                "action": "generate_script",
+                "parameters": parameters,
+                "artifacts": artifacts,
+            },
+            "trace_id": "c0ffee00-0000-4000-8000-000000000001",
+        },
+        1,
+    )
+
+
+def representative_messages() -> dict[str, object]:
+    """Small, nested and artifact-carrying messages, plus a batch of small ones."""
+    small = _task_request({}, [])
+    nested = _task_request(
+        {
+            "trend": {
+                "topic": "AI Content Creation",
+                "keywords": ["ai", "creator", "automation", "workflow"],
+                "velocity": 0.85,
+                "platform": "tiktok",
+            },
+            "brand": {"voice": "curious", "tone": "upbeat", "guidelines": ["no slang"] * 8},
+            "constraints": {"maxLength": 2200, "mediaRequired": True, "hashtags": True},
+        },
+        [
+            {"type": "script", "segments": [{"timestamp": t, "text": "segment " * 12} for t in range(0, 60, 5)]}
+        ],
+    )
+    artifact = _task_request(
+        {"render": "final"},
+        [{"name": "clip.mp4", "content_type": "video/mp4", "data": memoryview(bytes(4 * 1024 * 1024))}],
+    )
+    return {
+        "small": small,
+        "nested": nested,
+        "artifact_4mb": artifact,
+        "batch_64": [small] * 64,
+    }
+
+
+def run(iterations: int = 2000) -> dict:
+    """Time encode and decode of each representative message with every installed codec."""
+    results = []
+    for label, message in representative_messages().items():
+        rounds = max(1, iterations // 100) if label == "artifact_4mb" else iterations
+        for name, codec in CODECS.items():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                buffers = encode_frame(codec, message)
+            encode_us = (time.perf_counter() - start) / rounds * 1e6
+            frame = b"".join(bytes(buffer) for buffer in buffers)[4:]
+            start = time.perf_counter()
+            for _ in range(rounds):
+                decode_frame(codec, frame)
+            decode_us = (time.perf_counter() - start) / rounds * 1e6
+            results.append(
+                {
+                    "message": label,
+                    "codec": name,
+                    "frame_bytes": len(frame) + 4,
+                    "encode_us": round(encode_us, 2),
+                    "decode_us": round(decode_us, 2),
+                }
+            )
+    return {"benchmark": "mcp_codecs", "iterations": iterations, "results": results}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Load generator for MCPServer: routed messages per second on one event loop."""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from chimera.core.mcp import HELLO_METHOD, MCPServer, make_request
+from chimera.core.wire import (
+    CODECS,
+    DEFAULT_CODEC,
+    Codec,
+    decode_frame,
+    read_frame,
+    write_frame,
+)
+
+
+def _message(sender: int, seq: int) -> dict:
+    return {
+        "mcp_version": "1.0",
+        "message_type": "task_request",
+        "sender": f"agent-{sender}",
+        "recipient": "content-worker-001",
+        "timestamp": "2024-01-01T00:00:00Z",
+        "payload": {"task_id": f"{sender}-{seq}", "action": "noop", "parameters": {}, "artifacts": []},
+        "trace_id": f"trace-{sender}-{seq}",
+    }
+
+
+async def _hello(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, codec: str
+) -> Codec:
+    hello = {"jsonrpc": "2.0", "id": 0, "method": HELLO_METHOD, "params": {"codecs": [codec]}}
+    write_frame(writer, DEFAULT_CODEC, hello)
+    await writer.drain()
+    reply = decode_frame(DEFAULT_CODEC, await read_frame(reader))
+    return CODECS[reply["result"]["codec"]]
+
+
+async def _drive(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    codec: Codec,
+    sender: int,
+    messages: int,
+    batch_size: int,
+    window: int,
+) -> None:
+    """Keep up to ``window`` batches in flight on one connection."""
+    batches = -(-messages // batch_size)
+    sent = received = 0
+    seq = 0
+    while received < batches:
+        while sent < batches and sent - received < window:
+            batch = [
+                make_request(_message(sender, seq + i), seq + i) for i in range(batch_size)
+            ]
+            seq += batch_size
+            write_frame(writer, codec, batch)
+            sent += 1
+        await writer.drain()
+        await read_frame(reader)
+        received += 1
+
+
+async def _run(
+    transport: str, codec: str, connections: int, messages: int, batch_size: int, window: int
+) -> dict:
+    async def echo(message: dict) -> dict:
+        return {"task_id": message["payload"]["task_id"]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        unix_path = os.path.join(tmp, "mcp.sock") if transport == "unix" else None
+        server = MCPServer(port=0, unix_path=unix_path)
+        server.register_handler(echo, message_type="task_request")
+        await server.start()
+        try:
+            if unix_path:
+                streams = [await asyncio.open_unix_connection(unix_path) for _ in range(connections)]
+            else:
+                host, port = server.addresses[0][:2]
+                streams = [await asyncio.open_connection(host, port) for _ in range(connections)]
+            codecs = [await _hello(reader, writer, codec) for reader, writer in streams]
+            per_connection = messages // connections
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    _drive(reader, writer, codecs[index], index, per_connection, batch_size, window)
+                    for index, (reader, writer) in enumerate(streams)
+                )
+            )
+            elapsed = time.perf_counter() - start
+            for _, writer in streams:
+                writer.close()
+        finally:
+            await server.stop()
+    routed = server.stats["messages"]
+    return {
+        "transport": transport,
+        "codec": codecs[0].name,
+        "connections": connections,
+        "batch_size": batch_size,
+        "messages": routed,
+        "seconds": round(elapsed, 3),
+        "messages_per_second": round(routed / elapsed, 1),
+        "inboxes": server.metrics()["inboxes"],
+    }
+
+
+def run(
+    transport: str = "tcp",
+    codec: str = "json",
+    connections: int = 8,
+    messages: int = 100_000,
+    batch_size: int = 64,
+    window: int = 4,
+) -> dict:
+    """Route ``messages`` echo requests through a local server and report throughput."""
+    return asyncio.run(_run(transport, codec, connections, messages, batch_size, window))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transport", choices=["tcp", "unix"], default="tcp")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="json")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--window", type=int, default=4)
+    args = parser.parse_args(argv)
+    result = run(args.transport, args.codec, args.connections, args.messages, args.batch_size, args.window)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
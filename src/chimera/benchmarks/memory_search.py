@@ -0,0 +1,72 @@
+"""QPS-by-core-count scaling benchmark for MemoryManager.search_similar."""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from chimera.core.memory import MemoryManager
+
+
+async def _measure(
+    vectors: np.ndarray, queries: np.ndarray, workers: int, shard_size: int, limit: int
+) -> float:
+    manager = MemoryManager(provider="local", shard_size=shard_size, max_workers=workers)
+    try:
+        metadata = [{"row": row} for row in range(len(vectors))]
+        await manager.store_embeddings(vectors, metadata, "content")
+        await manager.search_similar(queries[0], "content", limit)  # warm-up
+        start = time.perf_counter()
+        for query in queries:
+            await manager.search_similar(query, "content", limit)
+        elapsed = time.perf_counter() - start
+    finally:
+        manager.close()
+    return len(queries) / elapsed
+
+
+def run(
+    vectors: int = 50_000,
+    dimension: int = 1536,
+    queries: int = 50,
+    limit: int = 10,
+    cores: list[int] | None = None,
+) -> dict:
+    """Measure search QPS for each worker count in ``cores``."""
+    cpu_count = os.cpu_count() or 1
+    if cores is None:
+        cores = sorted({1, 2, 4, 8, 16, 32, cpu_count} & set(range(1, cpu_count + 1)))
+    rng = np.random.default_rng(0)
+    corpus = rng.standard_normal((vectors, dimension), dtype=np.float32)
+    probe = rng.standard_normal((queries, dimension), dtype=np.float32)
+    results = []
+    for workers in cores:
+        # One shard per worker so every core has a slice of the namespace to scan.
+        shard_size = -(-vectors // workers)
+        qps = asyncio.run(_measure(corpus, probe, workers, shard_size, limit))
+        results.append({"cores": workers, "shards": workers, "qps": round(qps, 1)})
+    return {
+        "benchmark": "memory_search",
+        "vectors": vectors,
+        "dimension": dimension,
+        "limit": limit,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=50_000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--cores", type=int, nargs="*")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.vectors, args.dimension, args.queries, args.limit, args.cores), indent=2))
+
+
+if __name__ == "__main__":
+    main()
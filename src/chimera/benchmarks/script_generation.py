@@ -0,0 +1,91 @@
+"""Script generation cost per variant: full rebuild vs incremental templates.
+
+Each segment goes through a writer that stands in for a model call with a
+fixed latency. A campaign generates every topic for every platform and
+style, then a trend update regenerates the same scripts at a new length.
+The full rebuild writes every segment of every variant; the incremental
+engine writes only segments whose inputs are new.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from chimera.agents.workers.script_templates import PLATFORM_SEGMENTS, ScriptTemplateEngine
+
+TOPICS = ["ai art", "home workouts", "retro gaming", "meal prep", "budget travel", "coding tips"]
+STYLES = ("educational", "entertaining")
+
+
+def _variants(duration: int) -> list[tuple[str, int, str, str]]:
+    return [
+        (topic, duration, style, platform)
+        for topic in TOPICS
+        for style in STYLES
+        for platform in PLATFORM_SEGMENTS
+    ]
+
+
+async def _rebuild(engine: ScriptTemplateEngine, writer, variant: tuple[str, int, str, str]) -> int:
+    """Write every segment of a variant from scratch; return how many were written."""
+    topic, duration, style, platform = variant
+    values = {"topic": topic, "Topic": topic.capitalize(), "platform": platform, "style": style}
+    layout = engine.skeleton(platform, style).layout(duration)
+    await asyncio.gather(
+        *(writer(role, template.render({**values, "seconds": length}), values) for role, template, _, length in layout)
+    )
+    return len(layout)
+
+
+async def _run(latency_ms: float, durations: tuple[int, ...]) -> dict:
+    async def writer(role: str, draft: str, inputs: dict) -> str:
+        await asyncio.sleep(latency_ms / 1000)
+        return draft
+
+    results: dict[str, dict] = {"full_rebuild": {}, "incremental": {}}
+    rebuild_engine = ScriptTemplateEngine()
+    engine = ScriptTemplateEngine(writer)
+    for duration in durations:
+        variants = _variants(duration)
+        phase = f"duration_{duration}s"
+
+        start = time.perf_counter()
+        written = 0
+        for variant in variants:
+            written += await _rebuild(rebuild_engine, writer, variant)
+        results["full_rebuild"][phase] = _phase(variants, time.perf_counter() - start, written, latency_ms)
+
+        start = time.perf_counter()
+        before = engine.rendered
+        for variant in variants:
+            await engine.render(*variant)
+        written = engine.rendered - before
+        results["incremental"][phase] = _phase(variants, time.perf_counter() - start, written, latency_ms)
+    return {"benchmark": "script_generation", "writer_latency_ms": latency_ms, "results": results}
+
+
+def _phase(variants: list, elapsed: float, written: int, latency_ms: float) -> dict:
+    return {
+        "variants": len(variants),
+        "ms_per_variant": round(elapsed * 1000 / len(variants), 3),
+        "segments_written_per_variant": round(written / len(variants), 3),
+        # What the writer (a model call in production) is billed for.
+        "writer_ms_per_variant": round(written * latency_ms / len(variants), 3),
+    }
+
+
+def run(latency_ms: float = 5.0, durations: tuple[int, ...] = (60, 45)) -> dict:
+    """Generate a campaign at each length, one variant at a time, with and without reuse."""
+    return asyncio.run(_run(latency_ms, durations))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.latency_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
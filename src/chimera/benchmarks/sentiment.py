@@ -0,0 +1,117 @@
+"""Sentiment throughput: per-post loop vs vectorised lexicon vs process pool.
+
+Synthetic posts mix lexicon words, negators, boosters and filler. The
+per-post loop applies the same rules token by token and doubles as a
+reference: the vectorised scores must match it.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import time
+
+import numpy as np
+
+from chimera.agents.workers.sentiment import (
+    NEGATION_SCALE,
+    NEGATION_WINDOW,
+    NORMALISATION_ALPHA,
+    Lexicon,
+    SentimentEngine,
+    aggregate,
+)
+
+TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+FILLER = "the a this that my your it is was just new video post today people they we on in for with and".split()
+
+
+def posts_for(lexicon: Lexicon, count: int, seed: int = 9) -> list[str]:
+    rng = random.Random(seed)
+    words = list(lexicon.source["words"])
+    modifiers = lexicon.source["negators"] + list(lexicon.source["boosters"])
+    posts = []
+    for _ in range(count):
+        length = rng.randint(6, 30)
+        tokens = [
+            rng.choice(words) if roll < 0.2 else rng.choice(modifiers) if roll < 0.3 else rng.choice(FILLER)
+            for roll in (rng.random() for _ in range(length))
+        ]
+        posts.append(" ".join(tokens).capitalize() + rng.choice((".", "!", "!!", " #fyp")))
+    return posts
+
+
+def score_loop(lexicon: Lexicon, posts: list[str]) -> list[float]:
+    """One post at a time, one token at a time."""
+    words, negators, boosters = lexicon.source["words"], set(lexicon.source["negators"]), lexicon.source["boosters"]
+    scores = []
+    for post in posts:
+        tokens = TOKEN.findall(post.lower())
+        total = 0.0
+        for index, token in enumerate(tokens):
+            weight = words.get(token, 0.0)
+            if any(tokens[j] in negators for j in range(max(0, index - NEGATION_WINDOW), index)):
+                weight *= NEGATION_SCALE
+            if index and tokens[index - 1] in boosters:
+                weight *= 1.0 + boosters[tokens[index - 1]]
+            total += weight
+        scores.append(total / (total * total + NORMALISATION_ALPHA) ** 0.5)
+    return scores
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 1)
+
+
+def run(posts: int = 200_000, loop_posts: int = 20_000, topics: int = 50) -> dict:
+    """Score the same posts with each strategy and report posts per second."""
+    lexicon = Lexicon.load()
+    batch = posts_for(lexicon, posts)
+    labels = [f"topic-{index % topics}" for index in range(posts)]
+    results = {}
+
+    sample = batch[:loop_posts]
+    start = time.perf_counter()
+    reference = score_loop(lexicon, sample)
+    results["per_post_loop"] = {"posts_per_second": _rate(len(sample), time.perf_counter() - start)}
+
+    start = time.perf_counter()
+    scores = lexicon.score(batch)
+    profiles = aggregate(scores, labels)
+    results["vectorised"] = {"posts_per_second": _rate(posts, time.perf_counter() - start)}
+    max_error = float(np.max(np.abs(scores[:loop_posts] - np.asarray(reference))))
+
+    engine = SentimentEngine(lexicon, process_threshold=1)
+    if engine.max_workers > 1:
+        engine.score(batch[:1000])  # start the pool outside the timing
+        start = time.perf_counter()
+        engine.score(batch)
+        results["process_pool"] = {
+            "posts_per_second": _rate(posts, time.perf_counter() - start),
+            "workers": engine.max_workers,
+        }
+    engine.close()
+
+    return {
+        "benchmark": "sentiment",
+        "posts": posts,
+        "topics": len(profiles),
+        "cpus": os.cpu_count(),
+        "max_abs_error_vs_loop": max_error,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--loop-posts", type=int, default=20_000)
+    parser.add_argument("--topics", type=int, default=50)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.posts, args.loop_posts, args.topics), indent=2))
+
+
+if __name__ == "__main__":
+    main()
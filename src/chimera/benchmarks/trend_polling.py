@@ -0,0 +1,161 @@
+"""Trend polling simulation: fixed-interval vs adaptive polling.
+
+Simulated feeds (platform × niche) carry a handful of topics at a steady
+volume; at random times a topic spikes, its growth rate ramping up until its
+velocity passes the alert threshold. One platform rate-limits callers that
+exceed its own per-minute allowance. Time is compressed by ``scale`` so that
+a quarter of an hour runs in a few seconds; all reported figures are in
+simulated seconds.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+
+from chimera.agents.workers.trend_polling import (
+    DEFAULT_ALERT_THRESHOLD,
+    DEFAULT_CHECK_EVERY,
+    QUIET_INTERVAL_CAP,
+    VELOCITY_WINDOW,
+    AdaptivePollingScheduler,
+    RateLimited,
+)
+
+PLATFORMS = ("tiktok", "youtube", "twitter")
+NICHES = ("ai art", "fitness", "gaming", "cooking")
+TOPICS_PER_FEED = 5
+PEAK_VELOCITY = 600.0  # percent per velocity window
+RAMP = 30.0
+SPIKE_LENGTH = 120.0
+# twitter allows this many calls per simulated minute before rejecting.
+PLATFORM_LIMITS = {"twitter": 12}
+
+
+class SimulatedFeeds:
+    """Deterministic topic volumes with scheduled spikes, on a compressed clock."""
+
+    def __init__(self, duration: float, spikes: int, scale: float, seed: int = 3) -> None:
+        self.scale = scale
+        self.calls = 0
+        self._origin: float | None = None
+        self._window: dict[str, list[float]] = {}
+        rng = random.Random(seed)
+        feeds = [(platform, niche) for platform in PLATFORMS for niche in NICHES]
+        self.spikes: dict[tuple[str, str, str], float] = {}
+        for _ in range(spikes):
+            platform, niche = rng.choice(feeds)
+            topic = f"{niche} topic {rng.randrange(TOPICS_PER_FEED)}"
+            self.spikes.setdefault((platform, niche, topic), rng.uniform(30, duration - SPIKE_LENGTH))
+
+    def now(self) -> float:
+        loop_time = asyncio.get_running_loop().time()
+        if self._origin is None:
+            self._origin = loop_time
+        return (loop_time - self._origin) * self.scale
+
+    def crossing_time(self, start: float, threshold: float) -> float:
+        """When a spike starting at ``start`` first exceeds ``threshold``."""
+        return start + RAMP * min(1.0, threshold / PEAK_VELOCITY)
+
+    def _volume(self, key: tuple[str, str, str], now: float) -> float:
+        start = self.spikes.get(key)
+        if start is None or now <= start:
+            return 1000.0
+        rate = PEAK_VELOCITY / 100 / VELOCITY_WINDOW
+        elapsed = min(now - start, SPIKE_LENGTH)
+        if elapsed <= RAMP:
+            exponent = rate * elapsed**2 / (2 * RAMP)
+        else:
+            exponent = rate * RAMP / 2 + rate * (elapsed - RAMP)
+        return 1000.0 * math.exp(exponent)
+
+    async def fetch(self, platform: str, niche: str) -> list[dict]:
+        now = self.now()
+        self.calls += 1
+        limit = PLATFORM_LIMITS.get(platform)
+        if limit is not None:
+            window = [t for t in self._window.get(platform, []) if now - t < 60]
+            if len(window) >= limit:
+                self._window[platform] = window
+                raise RateLimited(retry_after=(60 - (now - window[0])) / self.scale)
+            self._window[platform] = window + [now]
+        await asyncio.sleep(0.05 / self.scale)
+        return [
+            {"topic": topic, "volume": self._volume((platform, niche, topic), now), "keywords": [niche]}
+            for topic in (f"{niche} topic {index}" for index in range(TOPICS_PER_FEED))
+        ]
+
+
+async def _simulate(adaptive: bool, duration: float, spikes: int, scale: float, rpm: float) -> dict:
+    feeds = SimulatedFeeds(duration, spikes, scale)
+    detected: dict[tuple[str, str, str], float] = {}
+
+    def on_trend(trend: dict) -> None:
+        detected.setdefault((trend["platform"], trend["niche"], trend["topic"]), feeds.now())
+
+    feeds.now()
+    scheduler = AdaptivePollingScheduler(
+        feeds.fetch,
+        list(PLATFORMS),
+        list(NICHES),
+        check_every=DEFAULT_CHECK_EVERY / scale,
+        alert_threshold=DEFAULT_ALERT_THRESHOLD,
+        requests_per_minute=rpm * scale,
+        max_interval=QUIET_INTERVAL_CAP / scale,
+        velocity_window=VELOCITY_WINDOW / scale,
+        adaptive=adaptive,
+        on_trend=on_trend,
+        seed=11,
+    )
+    await scheduler.run(duration / scale)
+
+    latencies = [
+        detected[key] - feeds.crossing_time(start, DEFAULT_ALERT_THRESHOLD)
+        for key, start in feeds.spikes.items()
+        if key in detected
+    ]
+    stats = scheduler.stats()
+    return {
+        "upstream_calls": feeds.calls,
+        "rate_limited": stats["rate_limited"],
+        "spikes": len(feeds.spikes),
+        "detected": len(latencies),
+        "false_positives": len(detected) - len(latencies),
+        "latency_p50_s": round(statistics.median(latencies), 2) if latencies else None,
+        "latency_max_s": round(max(latencies), 2) if latencies else None,
+    }
+
+
+async def _run(duration: float, spikes: int, scale: float, rpm: float) -> dict:
+    results = {}
+    for name, adaptive in (("fixed_interval", False), ("adaptive", True)):
+        results[name] = await _simulate(adaptive, duration, spikes, scale, rpm)
+    return {
+        "benchmark": "trend_polling",
+        "simulated_seconds": duration,
+        "feeds": len(PLATFORMS) * len(NICHES),
+        "requests_per_minute": rpm,
+        "results": results,
+    }
+
+
+def run(duration: float = 900.0, spikes: int = 8, scale: float = 300.0, rpm: float = 90.0) -> dict:
+    """Poll the same simulated feeds with a fixed and an adaptive schedule."""
+    return asyncio.run(_run(duration, spikes, scale, rpm))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=900.0, help="simulated seconds")
+    parser.add_argument("--spikes", type=int, default=8)
+    parser.add_argument("--scale", type=float, default=300.0, help="simulated seconds per real second")
+    parser.add_argument("--rpm", type=float, default=90.0, help="global requests per minute")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.duration, args.spikes, args.scale, args.rpm), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Creator payouts: balance call per transfer vs the local wallet state.
+
+A simulated wallet answers balance reads and transaction sends after
+``latency_ms`` each, checks every nonce, and confirms a transfer when it
+is sent. The per-call client reads the remote balance in front of every
+transfer (ECO-004). It sends one transfer at a time, since two transfers
+in flight would read the same nonce. The EconomicWorker reserves funds and
+nonces locally and sends the whole batch concurrently.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from decimal import Decimal
+
+from chimera.agents.workers import EconomicWorker
+from chimera.integrations import TransactionRejected
+
+
+class NonceError(TransactionRejected):
+    """Raised by the simulated wallet for a nonce already used."""
+
+
+class SimulatedAgentKit:
+    """An in-memory wallet with the CoinbaseAgentKit calls the EconomicWorker uses."""
+
+    def __init__(self, balances: dict[str, float], latency_ms: float = 0.0, status: str = "confirmed") -> None:
+        self.balances = {asset: Decimal(str(amount)) for asset, amount in balances.items()}
+        self.latency = latency_ms / 1000
+        self.status = status
+        self.used_nonces: set[int] = set()
+        self.balance_reads = 0
+        self.sends = 0
+
+    @property
+    def nonce(self) -> int:
+        nonce = 0
+        while nonce in self.used_nonces:
+            nonce += 1
+        return nonce
+
+    async def get_wallet_balance(self) -> dict:
+        self.balance_reads += 1
+        await asyncio.sleep(self.latency)
+        return {"balances": {asset: str(amount) for asset, amount in self.balances.items()}, "nonce": self.nonce}
+
+    async def send_transaction(self, recipient: str, amount: float, asset: str, nonce: int | None = None) -> dict:
+        self.sends += 1
+        await asyncio.sleep(self.latency)
+        nonce = self.nonce if nonce is None else nonce
+        if nonce in self.used_nonces:
+            raise NonceError(f"nonce {nonce} already used")
+        amount = Decimal(str(amount))
+        if amount > self.balances.get(asset, Decimal(0)):
+            raise TransactionRejected(f"insufficient {asset}")
+        self.used_nonces.add(nonce)
+        self.balances[asset] -= amount
+        return {"transactionId": f"tx-{nonce}", "hash": f"0x{nonce:064x}", "status": self.status, "fee": 0}
+
+
+async def _per_call(kit: SimulatedAgentKit, payouts: list[tuple[str, float]]) -> None:
+    for recipient, amount in payouts:
+        balance = await kit.get_wallet_balance()
+        if Decimal(balance["balances"]["USDC"]) < Decimal(str(amount)):
+            raise ValueError("insufficient USDC")
+        await kit.send_transaction(recipient, amount, "USDC", nonce=balance["nonce"])
+
+
+async def _worker(kit: SimulatedAgentKit, payouts: list[tuple[str, float]]) -> None:
+    worker = EconomicWorker(kit)
+    await asyncio.gather(*(worker.transfer(recipient, amount, "USDC") for recipient, amount in payouts))
+
+
+async def _measure(mode: str, transfers: int, latency_ms: float) -> dict:
+    kit = SimulatedAgentKit({"USDC": transfers * 5}, latency_ms)
+    payouts = [(f"0x{index:040x}", 2.5) for index in range(transfers)]
+    start = time.perf_counter()
+    await (_per_call if mode == "per_call" else _worker)(kit, payouts)
+    elapsed = time.perf_counter() - start
+    return {
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "transfers_per_s": round(transfers / elapsed, 1),
+        "balance_reads": kit.balance_reads,
+        "nonces_used": len(kit.used_nonces),
+        "final_balance": float(kit.balances["USDC"]),
+    }
+
+
+def run(transfers: int = 200, latency_ms: float = 5.0) -> dict:
+    """Pay out ``transfers`` creators both ways against the same simulated wallet."""
+    results = {mode: asyncio.run(_measure(mode, transfers, latency_ms)) for mode in ("per_call", "wallet_state")}
+    return {"benchmark": "wallet_transfers", "transfers": transfers, "latency_ms": latency_ms, "results": results}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transfers", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.transfers, args.latency_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Worker dispatch simulation: central FIFO vs local queues vs work stealing.
+
+Tasks for the four worker types arrive with heavy-tailed service times and
+sticky placement (each task is pinned to an instance by key, as a cache-aware
+router would do). Service time is simulated with ``asyncio.sleep``.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import deque
+
+from chimera.agents.workers import ContentWorker, DeliveryWorker, EconomicWorker, TrendWorker
+from chimera.agents.workers.dispatch import PRIORITIES, WorkStealingDispatcher, capabilities_of
+
+POOLS = {TrendWorker: 3, ContentWorker: 4, EconomicWorker: 2, DeliveryWorker: 3}
+ACTIONS = {
+    "discover_trends": 0.25,
+    "generate_script": 0.35,
+    "upload_video": 0.25,
+    "estimate_gas": 0.15,
+}
+
+
+def workload(count: int, mean_ms: float, seed: int = 5) -> list[dict]:
+    rng = random.Random(seed)
+    actions, weights = zip(*ACTIONS.items())
+    return [
+        {
+            "task_id": str(index),
+            "action": rng.choices(actions, weights)[0],
+            "priority": rng.choices(PRIORITIES, (1, 2, 4, 3))[0],
+            "service": rng.lognormvariate(0, 1.0) * mean_ms / 1000 / 1.65,
+            "key": rng.randrange(16),
+        }
+        for index in range(count)
+    ]
+
+
+def _workers() -> list[object]:
+    return [cls() for cls, size in POOLS.items() for _ in range(size)]
+
+
+async def _serve(worker: object, task: dict) -> float:
+    await asyncio.sleep(task["service"])
+    return time.perf_counter() - task["submitted"]
+
+
+async def _central(tasks: list[dict]) -> list[float]:
+    """A single shared FIFO; a worker may only take the task at its head."""
+    queue: deque = deque()
+    changed = asyncio.Condition()
+    latencies: list[float] = []
+    remaining = len(tasks)
+
+    async def loop(worker: object) -> None:
+        nonlocal remaining
+        capabilities = capabilities_of(worker)
+        while remaining:
+            async with changed:
+                await changed.wait_for(
+                    lambda: not remaining or (queue and queue[0]["action"] in capabilities)
+                )
+                if not remaining:
+                    return
+                task = queue.popleft()
+                changed.notify_all()
+            latencies.append(await _serve(worker, task))
+            remaining -= 1
+            if not remaining:
+                async with changed:
+                    changed.notify_all()
+
+    loops = [asyncio.create_task(loop(worker)) for worker in _workers()]
+    async with changed:
+        for task in tasks:
+            task["submitted"] = time.perf_counter()
+            queue.append(task)
+        changed.notify_all()
+    await asyncio.gather(*loops)
+    return latencies
+
+
+async def _dispatched(tasks: list[dict], steal: bool) -> tuple[list[float], dict]:
+    dispatcher = WorkStealingDispatcher(_workers(), handler=_serve, steal=steal, seed=1)
+    dispatcher.start()
+    futures = []
+    for task in tasks:
+        task["submitted"] = time.perf_counter()
+        pinned = dispatcher.workers_for(task["action"])
+        # Sticky placement skews toward the first instance of each pool.
+        worker_id = pinned[min(task["key"] % 8, len(pinned) - 1)]
+        futures.append(dispatcher.submit(task, worker_id=worker_id))
+    latencies = await asyncio.gather(*futures)
+    metrics = dispatcher.metrics()
+    await dispatcher.stop()
+    return list(latencies), metrics
+
+
+def _summary(latencies: list[float], elapsed: float) -> dict:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "seconds": round(elapsed, 3),
+        "tasks_per_second": round(len(latencies) / elapsed, 1),
+        "latency_p50_ms": round(cuts[49] * 1000, 2),
+        "latency_p95_ms": round(cuts[94] * 1000, 2),
+    }
+
+
+async def _run(count: int, mean_ms: float) -> dict:
+    results = {}
+    start = time.perf_counter()
+    latencies = await _central(workload(count, mean_ms))
+    results["central_fifo"] = _summary(latencies, time.perf_counter() - start)
+    for name, steal in (("local_queues", False), ("work_stealing", True)):
+        start = time.perf_counter()
+        latencies, metrics = await _dispatched(workload(count, mean_ms), steal)
+        results[name] = _summary(latencies, time.perf_counter() - start)
+        results[name]["steals"] = metrics["steals"]
+        results[name]["utilisation"] = {
+            worker: stats["utilisation"] for worker, stats in metrics["workers"].items()
+        }
+    return {"benchmark": "worker_dispatch", "tasks": count, "mean_service_ms": mean_ms, "results": results}
+
+
+def run(tasks: int = 2000, mean_ms: float = 2.0) -> dict:
+    """Run the same workload through each dispatch strategy."""
+    return asyncio.run(_run(tasks, mean_ms))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--mean-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.tasks, args.mean_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
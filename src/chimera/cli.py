@@ -1,8 +1,27 @@
 """Command-line interface for Project Chimera."""
 
-from typing import Any
+import argparse
+import importlib
+import pkgutil
 
+import chimera.benchmarks
 
-def main() -> None:
+
+def benchmark_names() -> list[str]:
+    """Modules under ``chimera.benchmarks``, each runnable with ``chimera bench <name>``."""
+    return sorted(module.name for module in pkgutil.iter_modules(chimera.benchmarks.__path__))
+
+
+def main(argv: list[str] | None = None) -> int:
     """Main entry point for the CLI."""
-    pass
+    parser = argparse.ArgumentParser(prog="chimera", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("bench", help="run a benchmark; arguments after NAME go to it")
+    bench.add_argument("name", choices=benchmark_names())
+    bench.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        module = importlib.import_module(f"chimera.benchmarks.{args.name}")
+        return module.main(args.args) or 0
+    return 0
@@ -0,0 +1,144 @@
+"""Per-recipient bounded inboxes with credit-based flow control.
+
+Every recipient owns a fixed number of credits. Routing a message takes one
+credit and returns it when the handler finishes, so at most ``capacity``
+messages per recipient are ever queued or in flight. A sender that finds no
+credit waits up to its timeout and is then told when to retry instead of
+growing the queue.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+MIN_RETRY_AFTER = 0.05
+
+
+class InboxFull(Exception):
+    """Raised when a recipient has no credit left within the sender's timeout."""
+
+    def __init__(self, recipient: str | None, retry_after: float) -> None:
+        self.recipient = recipient
+        self.retry_after = retry_after
+        super().__init__(f"inbox for {recipient!r} is full; retry after {retry_after:.3f}s")
+
+
+class _Gate:
+    """Counting gate with FIFO waiters; cheaper than ``asyncio.Semaphore`` when free."""
+
+    def __init__(self, size: int) -> None:
+        self.free = size
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float | None = None) -> bool:
+        """Take one unit, waiting up to ``timeout`` seconds; False if none came free."""
+        if self.free > 0 and not self._waiters:
+            self.free -= 1
+            return True
+        if timeout is not None and timeout <= 0:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait((waiter,), timeout=timeout)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # handed a unit we can no longer use
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                self._waiters.remove(waiter)
+        return not waiter.cancelled()
+
+    def release(self) -> None:
+        """Hand one unit to the oldest waiter, or return it to the pool."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.free += 1
+
+
+class Inbox:
+    """Bounded inbox for one recipient.
+
+    ``capacity`` caps queued plus running messages; ``concurrency`` caps how
+    many of them run the handler at once.
+    """
+
+    def __init__(self, recipient: str | None, capacity: int, concurrency: int) -> None:
+        if capacity < 1 or concurrency < 1:
+            raise ValueError("capacity and concurrency must be positive")
+        self.recipient = recipient
+        self.capacity = capacity
+        self.concurrency = min(concurrency, capacity)
+        self._credits = _Gate(capacity)
+        self._slots = _Gate(self.concurrency)
+        self.depth = 0
+        self.in_flight = 0
+        self.max_depth = 0
+        self.accepted = 0
+        self.dropped = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._service_time = 0.0
+
+    @property
+    def idle(self) -> bool:
+        """True when no message is queued or running."""
+        return not self.depth and not self.in_flight
+
+    def retry_after(self) -> float:
+        """Estimated seconds until a credit frees up, from the recent service time."""
+        backlog = (self.depth + self.in_flight) / self.concurrency
+        return max(MIN_RETRY_AFTER, round(self._service_time * backlog, 3))
+
+    async def run(
+        self, handler: Callable[[dict], Awaitable[dict | None]], message: dict, timeout: float
+    ) -> dict | None:
+        """Run ``handler(message)`` once a credit and an execution slot are free."""
+        arrived = time.monotonic()
+        if not await self._credits.acquire(timeout):
+            self.dropped += 1
+            raise InboxFull(self.recipient, self.retry_after())
+        self.accepted += 1
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        try:
+            try:
+                await self._slots.acquire()
+            finally:
+                self.depth -= 1
+            started = time.monotonic()
+            waited = started - arrived
+            self._wait_total += waited
+            if waited > self._wait_max:
+                self._wait_max = waited
+            self.in_flight += 1
+            try:
+                return await handler(message)
+            finally:
+                self.in_flight -= 1
+                self._slots.release()
+                elapsed = time.monotonic() - started
+                self._service_time += 0.2 * (elapsed - self._service_time)
+        finally:
+            self._credits.release()
+
+    def snapshot(self) -> dict:
+        """Current depth, drop and wait-time figures for export."""
+        return {
+            "capacity": self.capacity,
+            "concurrency": self.concurrency,
+            "depth": self.depth,
+            "in_flight": self.in_flight,
+            "max_depth": self.max_depth,
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "wait_ms_avg": round(self._wait_total / self.accepted * 1000, 3) if self.accepted else 0.0,
+            "wait_ms_max": round(self._wait_max * 1000, 3),
+            "service_ms_avg": round(self._service_time * 1000, 3),
+        }
@@ -1,35 +1,667 @@
-"""MCP (Model Context Protocol) implementation for agent communication."""
+"""MCP (Model Context Protocol) implementation for agent communication.
+
+Messages travel as JSON-RPC 2.0 requests whose ``params`` carry the MCP
+inter-agent message (see specs/autonomous_influencer_factory.md). Each request,
+response or batch array is sent as one frame (see :mod:`chimera.core.wire`).
+A client opens each connection with an ``mcp.hello`` listing the codecs it
+supports; peers that skip the handshake are spoken to in JSON.
+"""
+
+import asyncio
+import itertools
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
+from urllib.parse import urlsplit
+
+from .flow import Inbox, InboxFull
+from .wire import (
+    DEFAULT_CODEC,
+    Codec,
+    FrameError,
+    available_codecs,
+    decode_frame,
+    negotiate,
+    read_frame,
+    write_frame,
+)
+
+Handler = Callable[[dict], Awaitable[dict | None]]
+
+JSONRPC_VERSION = "2.0"
+ROUTE_METHOD = "mcp.route"
+SUBSCRIBE_METHOD = "mcp.subscribe"
+DELIVER_METHOD = "mcp.deliver"
+HELLO_METHOD = "mcp.hello"
+
+# JSON-RPC 2.0 error codes, plus application codes for unroutable messages and
+# saturated recipients.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+NO_ROUTE = -32001
+BUSY = -32002
+
+# Bounds on per-recipient state, which wildcard handlers let any recipient
+# name create.
+MAX_INBOXES = 4096
+MAX_DISPATCH_ENTRIES = 4096
+
+
+class MCPError(Exception):
+    """Raised when a message cannot be routed or handled."""
+
+    def __init__(self, code: int, message: str, data: dict | None = None) -> None:
+        self.code = code
+        self.message = message
+        self.data = data
+        super().__init__(f"[{code}] {message}")
+
+    def to_dict(self) -> dict:
+        error = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+class MCPBusyError(MCPError):
+    """Raised when the recipient's inbox is full; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(BUSY, message, {"retry_after": retry_after})
+        self.retry_after = retry_after
+
+
+def error_from_dict(error: dict) -> MCPError:
+    """Rebuild the exception for a JSON-RPC error object."""
+    data = error.get("data")
+    if error["code"] == BUSY and isinstance(data, dict):
+        return MCPBusyError(error["message"], data.get("retry_after", 0.0))
+    return MCPError(error["code"], error["message"], data)
+
+
+def make_request(message: dict, request_id: int | str | None = None) -> dict:
+    """Wrap an MCP message in a JSON-RPC route request."""
+    request = {"jsonrpc": JSONRPC_VERSION, "method": ROUTE_METHOD, "params": message}
+    if request_id is not None:
+        request["id"] = request_id
+    return request
+
+
+class _Connection:
+    """One persistent client connection with responses matched by request id."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, codec: Codec
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.codec = codec
+        self.pending: dict[int, asyncio.Future] = {}
+        self.deliveries: asyncio.Queue[dict] = asyncio.Queue()
+        self.reader_task = asyncio.ensure_future(self._read_loop())
+
+    @property
+    def closed(self) -> bool:
+        return self.reader_task.done()
+
+    def send(self, body: dict | list) -> None:
+        write_frame(self.writer, self.codec, body)
+
+    async def _read_loop(self) -> None:
+        error: BaseException = ConnectionError("MCP connection closed")
+        try:
+            while (frame := await read_frame(self.reader)) is not None:
+                body = decode_frame(self.codec, frame)
+                for item in body if isinstance(body, list) else (body,):
+                    self._dispatch(item)
+        except (ConnectionError, MCPError, ValueError) as exc:
+            error = exc
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.pending.clear()
+            self.writer.close()
+
+    def _dispatch(self, item: dict) -> None:
+        if item.get("method") == DELIVER_METHOD:
+            self.deliveries.put_nowait(item["params"])
+            return
+        future = self.pending.pop(item.get("id"), None)
+        if future is None or future.done():
+            return  # the caller timed out or was cancelled
+        if "error" in item:
+            error = item["error"]
+            future.set_exception(error_from_dict(error))
+        else:
+            future.set_result(item.get("result"))
+
+    async def close(self) -> None:
+        self.writer.close()
+        await asyncio.gather(self.reader_task, return_exceptions=True)
 
 
 class MCPClient:
-    """Client for sending messages to other agents via MCP."""
+    """Client for sending messages to other agents via MCP.
+
+    Keeps up to ``pool_size`` persistent connections and pipelines any number
+    of outstanding requests on each, matching responses by JSON-RPC id.
+    ``server_url`` is ``tcp://host:port`` or ``unix:///path/to/socket``.
+    ``codecs`` restricts the wire codecs offered to the server.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        pool_size: int = 4,
+        timeout: float | None = 30.0,
+        agent_id: str | None = None,
+        codecs: list[str] | None = None,
+    ) -> None:
+        parts = urlsplit(server_url)
+        if parts.scheme == "tcp" and parts.hostname and parts.port:
+            self._address: tuple = ("tcp", parts.hostname, parts.port)
+        elif parts.scheme == "unix" and parts.path:
+            self._address = ("unix", parts.path)
+        else:
+            raise ValueError(f"unsupported MCP server URL: {server_url!r}")
+        self.server_url = server_url
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.agent_id = agent_id
+        self.codecs = available_codecs(codecs)
+        self._pool: list[_Connection] = []
+        self._connecting: asyncio.Lock | None = None
+        self._ids = itertools.count(1)
 
-    def __init__(self, server_url: str) -> None:
-        pass
+    async def _open(self) -> _Connection:
+        if self._address[0] == "unix":
+            reader, writer = await asyncio.open_unix_connection(self._address[1])
+        else:
+            reader, writer = await asyncio.open_connection(self._address[1], self._address[2])
+        try:
+            codec = await asyncio.wait_for(self._handshake(reader, writer), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        return _Connection(reader, writer, codec)
 
-    async def send_message(self, message: dict) -> dict:
+    async def _handshake(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> Codec:
+        """Offer our codecs in JSON and switch to the one the server picks."""
+        hello = {
+            "jsonrpc": JSONRPC_VERSION,
+            "id": 0,
+            "method": HELLO_METHOD,
+            "params": {"codecs": self.codecs},
+        }
+        write_frame(writer, DEFAULT_CODEC, hello)
+        await writer.drain()
+        frame = await read_frame(reader)
+        if frame is None:
+            raise ConnectionError("MCP server closed the connection during handshake")
+        reply = decode_frame(DEFAULT_CODEC, frame)
+        if "error" in reply:
+            error = reply["error"]
+            raise error_from_dict(error)
+        return negotiate([reply["result"]["codec"]], self.codecs)
+
+    async def _acquire(self) -> _Connection:
+        """Return the least-loaded connection, opening another while below the pool size."""
+        self._pool[:] = [conn for conn in self._pool if not conn.closed]
+        idle = min(self._pool, key=lambda conn: len(conn.pending), default=None)
+        if idle is not None and (not idle.pending or len(self._pool) >= self.pool_size):
+            return idle
+        if self._connecting is None:
+            self._connecting = asyncio.Lock()
+        async with self._connecting:
+            if len(self._pool) < self.pool_size:
+                conn = await self._open()
+                self._pool.append(conn)
+                return conn
+        return min(self._pool, key=lambda conn: len(conn.pending))
+
+    async def _await_reply(
+        self, conn: _Connection, request_id: int, future: asyncio.Future, timeout: float | None
+    ) -> dict:
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            conn.pending.pop(request_id, None)
+
+    async def send_message(self, message: dict, timeout: float | None = None) -> dict:
         """Send a message to an MCP server."""
-        pass
+        conn = await self._acquire()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        conn.pending[request_id] = future
+        conn.send(make_request(message, request_id))
+        await conn.writer.drain()
+        return await self._await_reply(
+            conn, request_id, future, self.timeout if timeout is None else timeout
+        )
+
+    async def send_many(
+        self, messages: list[dict], timeout: float | None = None
+    ) -> list[dict | BaseException]:
+        """Send messages as one JSON-RPC batch.
 
-    async def receive_messages(self) -> list[dict]:
-        """Receive messages from the MCP server."""
-        pass
+        Results come back in input order; failed entries hold the exception
+        instead of a result, as with ``asyncio.gather(return_exceptions=True)``.
+        """
+        if not messages:
+            return []
+        conn = await self._acquire()
+        loop = asyncio.get_running_loop()
+        request_ids = [next(self._ids) for _ in messages]
+        futures = [loop.create_future() for _ in messages]
+        conn.pending.update(zip(request_ids, futures))
+        conn.send([make_request(m, rid) for m, rid in zip(messages, request_ids)])
+        await conn.writer.drain()
+        limit = self.timeout if timeout is None else timeout
+        return await asyncio.gather(
+            *(
+                self._await_reply(conn, rid, future, limit)
+                for rid, future in zip(request_ids, futures)
+            ),
+            return_exceptions=True,
+        )
+
+    async def receive_messages(self) -> AsyncIterator[dict]:
+        """Receive messages from the MCP server.
+
+        Subscribes as ``agent_id`` on a dedicated connection and yields each
+        message routed to it until the iterator is closed.
+        """
+        if not self.agent_id:
+            raise ValueError("receive_messages requires an agent_id")
+        conn = await self._open()
+        try:
+            future = asyncio.get_running_loop().create_future()
+            conn.pending[0] = future
+            conn.send(
+                {
+                    "jsonrpc": JSONRPC_VERSION,
+                    "id": 0,
+                    "method": SUBSCRIBE_METHOD,
+                    "params": {"agent_id": self.agent_id},
+                }
+            )
+            await conn.writer.drain()
+            await self._await_reply(conn, 0, future, self.timeout)
+            while True:
+                delivery = asyncio.ensure_future(conn.deliveries.get())
+                await asyncio.wait((delivery, conn.reader_task), return_when=asyncio.FIRST_COMPLETED)
+                if not delivery.done():
+                    delivery.cancel()
+                    return
+                yield delivery.result()
+        finally:
+            await conn.close()
+
+    async def close(self) -> None:
+        """Close every pooled connection; outstanding requests fail."""
+        pool, self._pool = self._pool, []
+        await asyncio.gather(*(conn.close() for conn in pool))
+
+
+class _Peer:
+    """Server-side state for one client connection."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.codec = DEFAULT_CODEC
+        # agent id -> the handler delivering its messages down this connection
+        self.subscriptions: dict[str, Handler] = {}
 
 
 class MCPServer:
-    """Server for receiving and routing MCP messages."""
+    """Server for receiving and routing MCP messages.
+
+    Handlers are registered per ``(recipient, message_type)``; either part may
+    be ``None`` to act as a wildcard. Lookups go through a dispatch table that
+    memoises the resolved handler for the most recently used concrete pairs,
+    so the hot path is a single dict lookup. Messages from different senders are handled
+    concurrently; messages from the same sender are handled in arrival order.
+    ``codecs`` restricts the wire codecs the server will agree to.
+
+    Each recipient has a bounded inbox (see :mod:`chimera.core.flow`): at most
+    ``inbox_capacity`` messages queued or running, ``inbox_concurrency`` of
+    them in the handler at once. Senders wait up to ``credit_timeout`` seconds
+    for a credit before getting a ``BUSY`` error with a ``retry_after`` hint.
+    Beyond ``max_inboxes`` recipients, the least recently used idle inboxes
+    are dropped, along with their metrics. Each connection stops reading
+    after ``max_pending_frames`` unanswered frames, pushing back on the
+    sender through the socket.
+    """
 
-    def __init__(self, port: int) -> None:
-        pass
+    def __init__(
+        self,
+        port: int,
+        host: str = "127.0.0.1",
+        unix_path: str | None = None,
+        codecs: list[str] | None = None,
+        inbox_capacity: int = 1024,
+        inbox_concurrency: int = 64,
+        credit_timeout: float = 1.0,
+        max_pending_frames: int = 256,
+        max_inboxes: int = MAX_INBOXES,
+    ) -> None:
+        self.port = port
+        self.host = host
+        self.unix_path = unix_path
+        self.codecs = available_codecs(codecs)
+        self.inbox_capacity = inbox_capacity
+        self.inbox_concurrency = inbox_concurrency
+        self.credit_timeout = credit_timeout
+        self.max_pending_frames = max_pending_frames
+        self.max_inboxes = max_inboxes
+        self.stats = {"messages": 0, "errors": 0, "busy": 0}
+        self._inboxes: OrderedDict[str | None, Inbox] = OrderedDict()
+        self._handlers: dict[tuple[str | None, str | None], Handler] = {}
+        self._dispatch: OrderedDict[tuple[str | None, str | None], Handler | None] = OrderedDict()
+        self._sender_tails: dict[str, asyncio.Task] = {}
+        self._servers: list[asyncio.AbstractServer] = []
+        self._connections: dict[asyncio.Task, _Peer] = {}
+
+    def register_handler(
+        self,
+        handler: Handler,
+        message_type: str | None = None,
+        recipient: str | None = None,
+    ) -> None:
+        """Register ``handler`` for a recipient and/or message type."""
+        self._handlers[(recipient, message_type)] = handler
+        self._dispatch.clear()
+
+    def unregister_handler(
+        self,
+        message_type: str | None = None,
+        recipient: str | None = None,
+        handler: Handler | None = None,
+    ) -> None:
+        """Remove the handler registered for a recipient and/or message type.
+
+        With ``handler``, remove it only if it is still the one registered.
+        """
+        key = (recipient, message_type)
+        if handler is not None and self._handlers.get(key) is not handler:
+            return
+        self._handlers.pop(key, None)
+        self._dispatch.clear()
+
+    def _resolve(self, recipient: str | None, message_type: str | None) -> Handler | None:
+        key = (recipient, message_type)
+        dispatch = self._dispatch
+        try:
+            handler = dispatch[key]
+        except KeyError:
+            pass
+        else:
+            dispatch.move_to_end(key)
+            return handler
+        handlers = self._handlers
+        handler = (
+            handlers.get(key)
+            or handlers.get((recipient, None))
+            or handlers.get((None, message_type))
+            or handlers.get((None, None))
+        )
+        dispatch[key] = handler
+        if len(dispatch) > MAX_DISPATCH_ENTRIES:
+            dispatch.popitem(last=False)
+        return handler
+
+    @property
+    def addresses(self) -> list:
+        """Socket addresses the server is listening on."""
+        return [
+            sock.getsockname() for server in self._servers for sock in server.sockets
+        ]
 
     async def start(self) -> None:
         """Start the MCP server."""
-        pass
+        if self._servers:
+            return
+        self._servers.append(
+            await asyncio.start_server(self._serve_connection, self.host, self.port)
+        )
+        if self.unix_path:
+            self._servers.append(
+                await asyncio.start_unix_server(self._serve_connection, self.unix_path)
+            )
 
     async def stop(self) -> None:
         """Stop the MCP server."""
-        pass
+        servers, self._servers = self._servers, []
+        for server in servers:
+            server.close()
+        # Closing the transports ends each connection loop at its next read.
+        for peer in self._connections.values():
+            peer.writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in servers:
+            await server.wait_closed()
 
     async def route_message(self, message: dict) -> dict:
         """Route a message to the appropriate handler."""
-        pass
+        recipient = message.get("recipient")
+        message_type = message.get("message_type")
+        handler = self._resolve(recipient, message_type)
+        if handler is None:
+            raise MCPError(NO_ROUTE, f"no handler for {recipient!r}/{message_type!r}")
+        inbox = self._inbox(recipient)
+        try:
+            result = await inbox.run(handler, message, self.credit_timeout)
+        except InboxFull as exc:
+            self.stats["busy"] += 1
+            raise MCPBusyError(str(exc), exc.retry_after) from None
+        self.stats["messages"] += 1
+        return result or {}
+
+    def _inbox(self, recipient: str | None) -> Inbox:
+        inboxes = self._inboxes
+        inbox = inboxes.get(recipient)
+        if inbox is not None:
+            inboxes.move_to_end(recipient)
+            return inbox
+        inbox = inboxes[recipient] = Inbox(recipient, self.inbox_capacity, self.inbox_concurrency)
+        excess = len(inboxes) - self.max_inboxes
+        if excess > 0:
+            # Busy inboxes stay: a fresh one would not count their messages
+            # against the recipient's capacity.
+            stale = []
+            for name, candidate in inboxes.items():
+                if len(stale) == excess:
+                    break
+                if candidate.idle:
+                    stale.append(name)
+            for name in stale:
+                del inboxes[name]
+        return inbox
+
+    def metrics(self) -> dict:
+        """Routing counters plus per-recipient inbox depth, drops and wait times."""
+        return {
+            **self.stats,
+            "inboxes": {
+                recipient: inbox.snapshot() for recipient, inbox in self._inboxes.items()
+            },
+        }
+
+    async def submit(self, message: dict) -> dict:
+        """Route ``message`` after any earlier message from the same sender."""
+        return await self._in_sender_order(message.get("sender"), self.route_message, message)
+
+    def _in_sender_order(
+        self, sender: str | None, func: Callable[..., Awaitable], *args: object
+    ) -> asyncio.Task:
+        """Schedule ``func(*args)`` behind the sender's previously scheduled work."""
+        previous = self._sender_tails.get(sender)
+        task = asyncio.ensure_future(self._after(previous, func, *args))
+        self._sender_tails[sender] = task
+        task.add_done_callback(partial(self._release_tail, sender))
+        return task
+
+    @staticmethod
+    async def _after(
+        previous: asyncio.Task | None, func: Callable[..., Awaitable], *args: object
+    ) -> object:
+        if previous is not None and not previous.done():
+            await asyncio.wait((previous,))
+        return await func(*args)
+
+    def _release_tail(self, sender: str | None, task: asyncio.Task) -> None:
+        if self._sender_tails.get(sender) is task:
+            del self._sender_tails[sender]
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection = asyncio.current_task()
+        peer = _Peer(writer)
+        self._connections[connection] = peer
+        pending: set[asyncio.Task] = set()
+        try:
+            frame = await read_frame(reader)
+            if frame is not None and self._handshake(frame, peer):
+                frame = await read_frame(reader)
+            while frame is not None:
+                task = asyncio.ensure_future(self._answer_frame(frame, peer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                if len(pending) >= self.max_pending_frames:
+                    await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                frame = await read_frame(reader)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (MCPError, FrameError, ConnectionError):
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+            # A newer connection may have subscribed the same agent since.
+            for agent_id, deliver in peer.subscriptions.items():
+                self.unregister_handler(recipient=agent_id, handler=deliver)
+            del self._connections[connection]
+
+    def _handshake(self, frame: bytes, peer: _Peer) -> bool:
+        """Answer an ``mcp.hello`` opening frame; return False for any other frame."""
+        try:
+            hello = decode_frame(DEFAULT_CODEC, frame)
+        except ValueError:
+            return False
+        if not isinstance(hello, dict) or hello.get("method") != HELLO_METHOD:
+            return False
+        params = hello.get("params")
+        offered = params.get("codecs") if isinstance(params, dict) else None
+        codec = negotiate(offered or (), self.codecs)
+        reply = {"jsonrpc": JSONRPC_VERSION, "id": hello.get("id"), "result": {"codec": codec.name}}
+        write_frame(peer.writer, DEFAULT_CODEC, reply)
+        peer.codec = codec
+        return True
+
+    async def _answer_frame(self, frame: bytes, peer: _Peer) -> None:
+        try:
+            body = decode_frame(peer.codec, frame)
+        except ValueError:
+            response = _error_response(None, MCPError(PARSE_ERROR, "undecodable frame"))
+        else:
+            if isinstance(body, dict) and body.get("method") == SUBSCRIBE_METHOD:
+                response = self._subscribe(body, peer)
+            elif not isinstance(body, list):
+                response = (await self._answer_batch([body]))[0]
+            elif body:
+                response = [item for item in await self._answer_batch(body) if item is not None]
+                response = response or None
+            else:
+                response = _error_response(None, MCPError(INVALID_REQUEST, "empty batch"))
+        writer = peer.writer
+        if response is not None and not writer.is_closing():
+            write_frame(writer, peer.codec, response)
+            await writer.drain()
+
+    def _subscribe(self, request: dict, peer: _Peer) -> dict:
+        """Push every message addressed to ``params.agent_id`` down this connection."""
+        params = request.get("params")
+        agent_id = params.get("agent_id") if isinstance(params, dict) else None
+        if not isinstance(agent_id, str):
+            return _error_response(
+                request.get("id"), MCPError(INVALID_PARAMS, "agent_id is required")
+            )
+        writer = peer.writer
+
+        async def deliver(message: dict) -> dict:
+            if writer.is_closing():
+                raise MCPError(NO_ROUTE, f"subscriber {agent_id!r} disconnected")
+            notification = {"jsonrpc": JSONRPC_VERSION, "method": DELIVER_METHOD, "params": message}
+            write_frame(writer, peer.codec, notification)
+            await writer.drain()
+            return {"status": "delivered"}
+
+        self.register_handler(deliver, recipient=agent_id)
+        peer.subscriptions[agent_id] = deliver
+        return {"jsonrpc": JSONRPC_VERSION, "id": request.get("id"), "result": {"subscribed": agent_id}}
+
+    async def _answer_batch(self, requests: list) -> list[dict | None]:
+        """Answer JSON-RPC requests, one ordered task per distinct sender."""
+        responses: list[dict | None] = [None] * len(requests)
+        by_sender: dict[str | None, list[tuple[int, dict]]] = {}
+        for index, request in enumerate(requests):
+            try:
+                message = _route_params(request)
+            except MCPError as exc:
+                self.stats["errors"] += 1
+                request_id = request.get("id") if isinstance(request, dict) else None
+                responses[index] = _error_response(request_id, exc)
+                continue
+            by_sender.setdefault(message.get("sender"), []).append((index, request))
+        await asyncio.gather(
+            *(
+                self._in_sender_order(sender, self._answer_in_order, items, responses)
+                for sender, items in by_sender.items()
+            )
+        )
+        return responses
+
+    async def _answer_in_order(
+        self, items: list[tuple[int, dict]], responses: list[dict | None]
+    ) -> None:
+        for index, request in items:
+            request_id = request.get("id")
+            try:
+                result = await self.route_message(request["params"])
+            except MCPError as exc:
+                self.stats["errors"] += 1
+                responses[index] = _error_response(request_id, exc)
+            except Exception as exc:
+                self.stats["errors"] += 1
+                responses[index] = _error_response(request_id, MCPError(INTERNAL_ERROR, str(exc)))
+            else:
+                if "id" in request:
+                    responses[index] = {
+                        "jsonrpc": JSONRPC_VERSION,
+                        "id": request_id,
+                        "result": result,
+                    }
+
+
+def _route_params(request: object) -> dict:
+    """Validate a JSON-RPC route request and return its MCP message."""
+    if not isinstance(request, dict) or request.get("jsonrpc") != JSONRPC_VERSION:
+        raise MCPError(INVALID_REQUEST, "not a JSON-RPC 2.0 request")
+    if request.get("method") != ROUTE_METHOD:
+        raise MCPError(METHOD_NOT_FOUND, f"unknown method {request.get('method')!r}")
+    message = request.get("params")
+    if not isinstance(message, dict):
+        raise MCPError(INVALID_PARAMS, "params must be an MCP message object")
+    return message
+
+
+def _error_response(request_id: int | str | None, error: MCPError) -> dict:
+    return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "error": error.to_dict()}
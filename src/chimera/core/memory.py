@@ -1,28 +1,192 @@
 """Memory management for vector database and semantic search."""
 
+import asyncio
+import heapq
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_SHARD_SIZE = 65_536
+
+
+class _Shard:
+    """Fixed-capacity block of unit-normalised vectors for one namespace."""
+
+    def __init__(self, dimension: int, capacity: int) -> None:
+        self.vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.ids: list[str | None] = [None] * capacity
+        self.metadata: list[dict | None] = [None] * capacity
+        self.count = 0
+
+    @property
+    def full(self) -> bool:
+        return self.count == len(self.ids)
+
+    def append(self, memory_id: str, vector: np.ndarray, metadata: dict) -> int:
+        row = self.count
+        self.vectors[row] = vector
+        self.ids[row] = memory_id
+        self.metadata[row] = metadata
+        self.alive[row] = True
+        # Publish the row last so concurrent searches never see a half-written entry.
+        self.count = row + 1
+        return row
+
+    def top_k(self, query: np.ndarray, k: int) -> list[tuple[float, str, dict]]:
+        """Return up to ``k`` (score, id, metadata) tuples, best first."""
+        count = self.count
+        if count == 0:
+            return []
+        scores = self.vectors[:count] @ query
+        scores[~self.alive[:count]] = -np.inf
+        if k < count:
+            rows = np.argpartition(scores, -k)[-k:]
+        else:
+            rows = np.arange(count)
+        rows = rows[np.argsort(scores[rows])[::-1]]
+        return [
+            (float(scores[row]), self.ids[row], self.metadata[row])
+            for row in rows
+            if self.alive[row]
+        ]
+
 
 class MemoryManager:
-    """Manages vector embeddings and semantic memory storage."""
+    """Manages vector embeddings and semantic memory storage.
 
-    def __init__(self, provider: str = "pinecone") -> None:
-        pass
+    Each namespace is split into fixed-size shards. Searches fan out across
+    shards on a thread pool (NumPy releases the GIL inside the matrix product)
+    and the per-shard top-k lists are merged with a heap.
+    """
+
+    def __init__(
+        self,
+        provider: str = "pinecone",
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        max_workers: int | None = None,
+    ) -> None:
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        self.provider = provider
+        self.shard_size = shard_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.dimension: int | None = None
+        self._namespaces: dict[str, list[_Shard]] = {}
+        self._locations: dict[str, tuple[str, _Shard, int]] = {}
+        self._write_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="memory-search"
+        )
+
+    def _normalise(self, vector: list[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        if array.ndim != 1:
+            raise ValueError("vector must be one-dimensional")
+        if self.dimension is None:
+            self.dimension = array.shape[0]
+        elif array.shape[0] != self.dimension:
+            raise ValueError(
+                f"vector has dimension {array.shape[0]}, expected {self.dimension}"
+            )
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm else array
+
+    def _add(self, vector: list[float], metadata: dict, namespace: str) -> str:
+        normalised = self._normalise(vector)
+        memory_id = str(uuid.uuid4())
+        with self._write_lock:
+            shards = self._namespaces.setdefault(namespace, [])
+            if not shards or shards[-1].full:
+                shards.append(_Shard(normalised.shape[0], self.shard_size))
+            shard = shards[-1]
+            row = shard.append(memory_id, normalised, metadata)
+            self._locations[memory_id] = (namespace, shard, row)
+        return memory_id
 
     async def store_embedding(
         self, vector: list[float], metadata: dict, namespace: str
     ) -> str:
         """Store an embedding with metadata."""
-        pass
+        return self._add(vector, metadata, namespace)
+
+    async def store_embeddings(
+        self, vectors: list[list[float]], metadatas: list[dict], namespace: str
+    ) -> list[str]:
+        """Store a batch of embeddings in one namespace."""
+        if len(vectors) != len(metadatas):
+            raise ValueError("vectors and metadatas must have the same length")
+        return [
+            self._add(vector, metadata, namespace)
+            for vector, metadata in zip(vectors, metadatas)
+        ]
 
     async def search_similar(
         self, query_vector: list[float], namespace: str, limit: int
     ) -> list[dict]:
         """Search for similar embeddings."""
-        pass
+        return await self.search_namespaces(query_vector, [namespace], limit)
+
+    async def search_namespaces(
+        self, query_vector: list[float], namespaces: list[str], limit: int
+    ) -> list[dict]:
+        """Search several namespaces at once, e.g. content and agent memories."""
+        if limit <= 0 or self.dimension is None:
+            return []
+        query = self._normalise(query_vector)
+        targets = [
+            (namespace, shard)
+            for namespace in namespaces
+            for shard in list(self._namespaces.get(namespace, ()))
+        ]
+        if not targets:
+            return []
+
+        loop = asyncio.get_running_loop()
+        partials = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, shard.top_k, query, limit)
+                for _, shard in targets
+            )
+        )
+        candidates = (
+            (score, memory_id, metadata, namespace)
+            for (namespace, _), hits in zip(targets, partials)
+            for score, memory_id, metadata in hits
+        )
+        best = heapq.nlargest(limit, candidates, key=lambda hit: hit[0])
+        return [
+            {"id": memory_id, "score": score, "metadata": metadata, "namespace": namespace}
+            for score, memory_id, metadata, namespace in best
+        ]
 
     async def get_memory(self, memory_id: str) -> dict:
         """Retrieve a specific memory by ID."""
-        pass
+        location = self._locations.get(memory_id)
+        if location is None:
+            raise KeyError(memory_id)
+        namespace, shard, row = location
+        return {
+            "id": memory_id,
+            "namespace": namespace,
+            "vector": shard.vectors[row].tolist(),
+            "metadata": shard.metadata[row],
+        }
 
     async def delete_memory(self, memory_id: str) -> bool:
         """Delete a memory by ID."""
-        pass
+        with self._write_lock:
+            location = self._locations.pop(memory_id, None)
+            if location is None:
+                return False
+            _, shard, row = location
+            shard.alive[row] = False
+            shard.metadata[row] = None
+        return True
+
+    def close(self) -> None:
+        """Release the search thread pool."""
+        self._executor.shutdown(wait=False)
@@ -1,20 +1,585 @@
-"""Guardian rule engine for symbolic safety validation."""
+"""Guardian rule engine for symbolic safety validation.
+
+``load_rules`` compiles the whole rule set once into a single Aho-Corasick
+automaton over keywords and the literal atoms every regex match must contain.
+``evaluate`` scans an artifact's text once with it and runs only the regexes
+whose atoms occurred, so the cost grows with the length of the text and the
+number of rules that fire rather than the number of rules loaded. Regexes
+with no such atom are run on every text, each on its own.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+try:
+    from re import _constants, _parser
+except ImportError:  # pragma: no cover - private modules; every regex then runs in full
+    _constants = _parser = None
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "rules", "judge_rules.json")
+
+CATEGORIES = ("brand_safety", "security", "compliance")
+SCORE_KEYS = {"brand_safety": "brand_score", "security": "security_score", "compliance": "compliance_score"}
+
+# Score deducted from a rule's category per violation. A critical hit zeroes
+# the category, which caps the equally weighted overall score below 0.70.
+SEVERITY_PENALTY = {"critical": 1.0, "high": 0.35, "medium": 0.15, "low": 0.05}
+
+APPROVE_THRESHOLD = 0.90
+FLAG_THRESHOLD = 0.70
+MAX_SPANS_PER_RULE = 10
+MIN_ATOM_LENGTH = 2
+DEFAULT_CACHE_SIZE = 4096
+
+
+class RuleError(ValueError):
+    """Raised when the rules file is missing or a rule is malformed."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One symbolic rule as declared in the rules file."""
+
+    rule_id: str
+    category: str
+    severity: str
+    action: str
+    description: str = ""
+    keywords: tuple[str, ...] = ()
+    regexes: tuple[str, ...] = ()
+    artifact_types: frozenset[str] = field(default_factory=frozenset)
+    word_boundary: bool = True
+
+    def applies_to(self, artifact_type: str) -> bool:
+        return not self.artifact_types or artifact_type in self.artifact_types
+
+
+class _Automaton:
+    """Aho-Corasick automaton over lower-cased keywords."""
+
+    def __init__(self, keywords: list[tuple[str, int]]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[tuple[int, int]]] = [[]]
+        for keyword, rule_index in keywords:
+            state = 0
+            for char in keyword:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((rule_index, len(keyword)))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                if state:
+                    back = fail[state]
+                    while back and char not in goto[back]:
+                        back = fail[back]
+                    fail[nxt] = goto[back].get(char, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def scan(self, text: str):
+        """Yield ``(start, end, rule_index)`` for every keyword occurrence."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                for rule_index, length in outputs[state]:
+                    yield end - length, end, rule_index
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    return 0 <= index < len(text) and (text[index].isalnum() or text[index] == "_")
+
+
+def _collect_text(content: object, parts: list[str]) -> list[str]:
+    """Gather every string value in ``content`` (keys excluded), depth first."""
+    if isinstance(content, str):
+        parts.append(content)
+    elif isinstance(content, dict):
+        for value in content.values():
+            _collect_text(value, parts)
+    elif isinstance(content, (list, tuple)):
+        for value in content:
+            _collect_text(value, parts)
+    return parts
+
+
+def _parse_rule(raw: dict) -> Rule:
+    rule_id = raw.get("id") or raw.get("name")
+    if not rule_id:
+        raise RuleError(f"rule without id or name: {raw!r}")
+    severity = raw.get("severity", "medium")
+    if severity not in SEVERITY_PENALTY:
+        raise RuleError(f"{rule_id}: unknown severity {severity!r}")
+    category = raw.get("category", "security")
+    if category not in CATEGORIES:
+        raise RuleError(f"{rule_id}: unknown category {category!r}")
+    keywords = list(raw.get("keywords", ()))
+    regexes = [raw["pattern"]] if "pattern" in raw else []
+    for pattern in raw.get("patterns", ()):
+        if isinstance(pattern, str):
+            regexes.append(pattern)
+            continue
+        regexes.extend([pattern["regex"]] if "regex" in pattern else [])
+        keywords.extend(pattern.get("keywords", ()))
+        keywords.extend(pattern.get("negative_keywords", ()))
+    if not keywords and not regexes:
+        raise RuleError(f"{rule_id}: rule has no keywords or patterns")
+    for regex in regexes:
+        try:
+            re.compile(regex)
+        except re.error as exc:
+            raise RuleError(f"{rule_id}: invalid pattern {regex!r}: {exc}") from exc
+    default_action = "reject" if severity == "critical" else "flag"
+    return Rule(
+        rule_id=str(rule_id),
+        category=category,
+        severity=severity,
+        action=raw.get("action", default_action),
+        description=raw.get("description", ""),
+        keywords=tuple(keyword.lower() for keyword in keywords if keyword),
+        regexes=tuple(regexes),
+        artifact_types=frozenset(raw.get("artifact_types", ())),
+        word_boundary=raw.get("word_boundary", True),
+    )
+
+
+def _read_rules_file(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as handle:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuleError(f"{path}: PyYAML is required for YAML rule files")
+            data = yaml.safe_load(handle)
+        else:
+            data = json.load(handle)
+    if isinstance(data, dict):
+        data = data.get("rules", [])
+    if not isinstance(data, list):
+        raise RuleError(f"{path}: expected a list of rules")
+    return data
+
+
+def _sequence_atoms(items: list) -> list[str] | None:
+    """Literals of which at least one must occur in any match of ``items``.
+
+    Walks the parsed regex: runs of literals are required, a group is required
+    when its content is, and a branch is required when every alternative has
+    atoms. The most selective candidate (longest shortest atom) wins.
+    """
+    best: list[str] | None = None
+    run: list[str] = []
+
+    def consider(candidate: list[str] | None) -> None:
+        nonlocal best
+        if not candidate or min(map(len, candidate)) < MIN_ATOM_LENGTH:
+            return
+        if best is None or min(map(len, candidate)) > min(map(len, best)):
+            best = candidate
+
+    for op, arg in items:
+        if op is _constants.LITERAL:
+            run.append(chr(arg))
+            continue
+        consider(["".join(run)] if run else None)
+        run = []
+        if op is _constants.SUBPATTERN:
+            consider(_sequence_atoms(list(arg[-1])))
+        elif op is _constants.BRANCH:
+            alternatives = [_sequence_atoms(list(branch)) for branch in arg[1]]
+            if all(alternatives):
+                consider([atom for atoms in alternatives for atom in atoms])
+    consider(["".join(run)] if run else None)
+    return best
+
+
+def _required_atoms(regex: str) -> list[str] | None:
+    """Lower-cased required literals for ``regex``, or None if it has none."""
+    if _parser is None:
+        return None
+    try:
+        atoms = _sequence_atoms(list(_parser.parse(regex)))
+    except (re.error, AttributeError, IndexError, TypeError, ValueError):
+        return None
+    return [atom.lower() for atom in atoms] if atoms else None
+
+
+class CompiledRules:
+    """Immutable compiled form of a rule set.
+
+    Keywords and the required literal atoms of regex rules share one
+    automaton. A regex only runs when one of its atoms occurred; regexes with
+    no usable atom run on every text.
+    """
+
+    def __init__(self, rules: list[Rule], version: int = 0, signature: tuple = ()) -> None:
+        self.rules = rules
+        self.version = version
+        self.signature = signature
+        # Automaton outputs index into ``targets``: (rule index, pattern or None).
+        self.targets: list[tuple[int, re.Pattern | None]] = []
+        literals: list[tuple[str, int]] = []
+        residual: list[tuple[int, re.Pattern]] = []
+        for index, rule in enumerate(rules):
+            if rule.keywords:
+                literals.extend((keyword, len(self.targets)) for keyword in rule.keywords)
+                self.targets.append((index, None))
+            for regex in rule.regexes:
+                try:
+                    pattern = re.compile(regex, re.IGNORECASE)
+                except re.error as exc:
+                    raise RuleError(f"{rule.rule_id}: invalid pattern {regex!r}: {exc}") from exc
+                atoms = _required_atoms(regex)
+                if atoms:
+                    literals.extend((atom, len(self.targets)) for atom in atoms)
+                    self.targets.append((index, pattern))
+                else:
+                    # Run on its own: merging patterns into one alternation
+                    # breaks backreferences, inline global flags and group names.
+                    residual.append((index, pattern))
+        self.automaton = _Automaton(literals)
+        # Literal matches of a joined text are then those of its lines.
+        self.line_local = not any("\n" in literal for literal, _ in literals)
+        self.residual = residual
+        self._subsets: dict[frozenset[str], CompiledRules] = {}
+
+    def subset(self, categories: frozenset[str]) -> "CompiledRules":
+        """The rules of ``categories`` compiled on their own, built once per version."""
+        compiled = self._subsets.get(categories)
+        if compiled is None:
+            rules = [rule for rule in self.rules if rule.category in categories]
+            compiled = CompiledRules(rules, self.version, self.signature)
+            self._subsets[categories] = compiled
+        return compiled
+
+    def scan(self, text: str) -> dict[int, list[tuple[int, int]]]:
+        """Return matched spans per rule index for one pass over ``text``."""
+        hits, triggered = self.scan_literals(text.lower())
+        return self.scan_patterns(text, hits, triggered)
+
+    def scan_literals(self, lowered: str) -> tuple[dict[int, list[tuple[int, int]]], set[int]]:
+        """Keyword spans per rule index, and the slots of regexes whose atoms occurred."""
+        hits: dict[int, list[tuple[int, int]]] = {}
+        rules, targets = self.rules, self.targets
+        triggered: set[int] = set()
+        for start, end, slot in self.automaton.scan(lowered):
+            index, pattern = targets[slot]
+            if pattern is not None:
+                triggered.add(slot)
+            elif not rules[index].word_boundary or not (
+                _is_word_char(lowered, start - 1) or _is_word_char(lowered, end)
+            ):
+                hits.setdefault(index, []).append((start, end))
+        return hits, triggered
+
+    def scan_patterns(
+        self, text: str, hits: dict[int, list[tuple[int, int]]], triggered: set[int]
+    ) -> dict[int, list[tuple[int, int]]]:
+        """Add the spans of the ``triggered`` and residual regexes over ``text`` to ``hits``."""
+        targets = self.targets
+        for slot in sorted(triggered):
+            index, pattern = targets[slot]
+            for found in pattern.finditer(text):
+                hits.setdefault(index, []).append(found.span())
+
+        for index, pattern in self.residual:
+            for found in pattern.finditer(text):
+                hits.setdefault(index, []).append(found.span())
+        return hits
+
+
+def _rule_files(rules_path: str) -> list[str]:
+    if os.path.isdir(rules_path):
+        return sorted(
+            os.path.join(rules_path, name)
+            for name in os.listdir(rules_path)
+            if name.endswith((".json", ".yaml", ".yml"))
+        )
+    if os.path.exists(rules_path):
+        return [rules_path]
+    raise RuleError(f"rules path not found: {rules_path}")
+
+
+def _signature(paths: list[str]) -> tuple:
+    """Cheap change detector for a set of rule files."""
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
 
 
 class GuardianRuleEngine:
-    """Evaluates artifacts against hardcoded symbolic rules."""
+    """Evaluates artifacts against hardcoded symbolic rules.
+
+    Results are cached by ``(rules version, artifact type, text digest)`` in an
+    LRU of ``cache_size`` entries. Reloading bumps the version, so entries from
+    older rule sets stop matching and age out. With ``watch_interval`` set, a
+    background thread polls ``rules_path`` and recompiles on change; the new
+    rule set replaces the old one in a single assignment, so evaluations never
+    wait on a reload.
+    """
 
-    def __init__(self, rules_path: str) -> None:
-        pass
+    def __init__(
+        self,
+        rules_path: str = DEFAULT_RULES_PATH,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        watch_interval: float | None = None,
+    ) -> None:
+        self.rules_path = rules_path
+        self.cache_size = cache_size
+        self.compiled = CompiledRules([])
+        self.last_reload_error: Exception | None = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: OrderedDict[tuple, dict] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._failed_signature: tuple | None = None
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+        self.load_rules()
+        if watch_interval:
+            self.watch(watch_interval)
+
+    @property
+    def rules(self) -> list[Rule]:
+        return self.compiled.rules
+
+    @property
+    def version(self) -> int:
+        return self.compiled.version
 
     def load_rules(self) -> None:
         """Load rules from the rules file."""
-        pass
+        with self._reload_lock:
+            paths = _rule_files(self.rules_path)
+            signature = _signature(paths)
+            rules = [_parse_rule(raw) for path in paths for raw in _read_rules_file(path)]
+            self.compiled = CompiledRules(rules, self.compiled.version + 1, signature)
 
-    def evaluate(self, artifact_type: str, content: dict) -> dict:
-        """Evaluate content against applicable rules."""
-        pass
+    def reload_if_changed(self) -> bool:
+        """Recompile if the rule files changed; keep the current rules on error."""
+        try:
+            signature = _signature(_rule_files(self.rules_path))
+        except (OSError, RuleError) as exc:
+            self.last_reload_error = exc
+            return False
+        if signature in (self.compiled.signature, self._failed_signature):
+            return False
+        try:
+            self.load_rules()
+        except Exception as exc:  # YAML errors, rules of the wrong shape: none may stop the watcher
+            self._failed_signature = signature
+            self.last_reload_error = exc
+            logger.warning("keeping rules version %d; reload failed: %s", self.version, exc)
+            return False
+        self._failed_signature = None
+        self.last_reload_error = None
+        return True
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Start polling ``rules_path`` every ``interval`` seconds in a daemon thread."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(interval,), name="guardian-rules-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def _watch_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.reload_if_changed()
+            except Exception as exc:
+                self.last_reload_error = exc
+                logger.exception("rules watcher check failed; still watching")
+
+    def close(self) -> None:
+        """Stop the rules watcher, if running."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def cache_info(self) -> dict:
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "capacity": self.cache_size,
+            "rules_version": self.version,
+        }
+
+    def evaluate(
+        self, artifact_type: str, content: dict, categories: frozenset[str] | None = None
+    ) -> dict:
+        """Evaluate content against applicable rules, optionally only those of ``categories``."""
+        compiled = self.compiled
+        if categories is not None:
+            categories = frozenset(categories)
+            compiled = compiled.subset(categories)
+        text = "\n".join(_collect_text(content, []))
+        if self.cache_size <= 0:
+            return self._evaluate_text(compiled, artifact_type, text)
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        key = (compiled.version, artifact_type, categories, digest)
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return copy.deepcopy(result)
+            self.cache_misses += 1
+        result = self._evaluate_text(compiled, artifact_type, text)
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        # Callers own what they get back; the cached entry must not change under them.
+        return copy.deepcopy(result)
+
+    def _evaluate_text(self, compiled: CompiledRules, artifact_type: str, text: str) -> dict:
+        return self._decide(compiled, artifact_type, compiled.scan(text))
+
+    def _decide(
+        self, compiled: CompiledRules, artifact_type: str, hits: dict[int, list[tuple[int, int]]]
+    ) -> dict:
+        penalties = dict.fromkeys(CATEGORIES, 0.0)
+        violations = []
+        for index in sorted(hits):
+            rule = compiled.rules[index]
+            if not rule.applies_to(artifact_type):
+                continue
+            spans = hits[index]
+            penalties[rule.category] += SEVERITY_PENALTY[rule.severity]
+            violations.append(
+                {
+                    "rule_id": rule.rule_id,
+                    "category": rule.category,
+                    "severity": rule.severity,
+                    "action": rule.action,
+                    "description": rule.description,
+                    "hits": len(spans),
+                    "spans": spans[:MAX_SPANS_PER_RULE],
+                }
+            )
+
+        scores = {
+            SCORE_KEYS[category]: round(max(0.0, 1.0 - penalty), 4)
+            for category, penalty in penalties.items()
+        }
+        scores["overall_score"] = round(sum(scores.values()) / len(CATEGORIES), 4)
+        clearance = self.get_clearance_decision(scores)
+        actions = {violation["action"] for violation in violations}
+        if "reject" in actions:
+            clearance = "rejected"
+        elif clearance == "approved" and actions & {"flag", "escalate"}:
+            clearance = "flagged"
+        return {
+            "artifact_type": artifact_type,
+            "scores": scores,
+            "clearance": clearance,
+            "violations": violations,
+            "rules_version": compiled.version,
+        }
+
+    def batch(self) -> "BatchScanner":
+        """A scanner for many artifacts against the current rule set."""
+        return BatchScanner(self)
 
     def get_clearance_decision(self, scores: dict) -> str:
         """Determine clearance based on evaluation scores."""
-        pass
+        overall = scores["overall_score"]
+        if overall >= APPROVE_THRESHOLD:
+            return "approved"
+        if overall >= FLAG_THRESHOLD:
+            return "flagged"
+        return "rejected"
+
+
+class BatchScanner:
+    """Evaluates many artifacts against one snapshot of the compiled rules.
+
+    Results equal ``evaluate``'s: regexes run on each artifact's joined text,
+    once per distinct text in the batch. The keyword and atom pass runs once
+    per distinct field, so variants that share a hook or a call to action pay
+    for it once; no literal spans the newline joining two fields.
+    """
+
+    def __init__(self, engine: GuardianRuleEngine) -> None:
+        self.engine = engine
+        self.compiled = engine.compiled
+        self.segments_seen = 0
+        self._segments: dict[str, tuple[dict[int, list[tuple[int, int]]], set[int]]] = {}
+        self._texts: dict[str, dict[int, list[tuple[int, int]]]] = {}
+
+    @property
+    def segments_scanned(self) -> int:
+        return len(self._segments)
+
+    @property
+    def texts_scanned(self) -> int:
+        return len(self._texts)
+
+    def evaluate(self, artifact_type: str, content: dict) -> dict:
+        """Same result as ``GuardianRuleEngine.evaluate``."""
+        compiled = self.compiled
+        segments = _collect_text(content, [])
+        text = "\n".join(segments)
+        self.segments_seen += len(segments)
+        hits = self._texts.get(text)
+        if hits is None:
+            hits = self._texts[text] = self._scan(compiled, text, segments)
+        # _decide copies span lists, so the memoized hits stay intact.
+        return self.engine._decide(compiled, artifact_type, hits)
+
+    def _scan(
+        self, compiled: CompiledRules, text: str, segments: list[str]
+    ) -> dict[int, list[tuple[int, int]]]:
+        if not compiled.line_local:
+            return compiled.scan(text)
+        hits: dict[int, list[tuple[int, int]]] = {}
+        triggered: set[int] = set()
+        offset = 0
+        for segment in segments:
+            lowered = segment.lower()
+            found = self._segments.get(segment)
+            if found is None:
+                found = self._segments[segment] = compiled.scan_literals(lowered)
+            segment_hits, segment_triggered = found
+            for index, spans in segment_hits.items():
+                hits.setdefault(index, []).extend(
+                    (start + offset, end + offset) for start, end in spans
+                )
+            triggered |= segment_triggered
+            offset += len(lowered) + 1
+        return compiled.scan_patterns(text, hits, triggered)
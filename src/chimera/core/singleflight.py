@@ -0,0 +1,67 @@
+"""Single-flight calls: concurrent callers for one key share one call.
+
+The first caller for a key runs the call itself; callers that arrive while
+it runs wait for its outcome instead of starting another. If the caller
+running the call is cancelled, only that caller is: the call is abandoned,
+its waiters wake up, and the first of them runs it again. A failure is
+shared with every waiter, like a result.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Abandoned(Exception):
+    """Set on a shared future whose caller was cancelled; waiters should retry."""
+
+
+def settle(future: asyncio.Future, error: BaseException) -> None:
+    """Fail ``future`` with ``error``, or mark it abandoned if ``error`` is a cancellation."""
+    if future.done():
+        return
+    future.set_exception(error if isinstance(error, Exception) else Abandoned())
+    future.exception()  # waiters see it; don't warn if there are none
+
+
+class SingleFlight(Generic[T]):
+    """One in-flight call per key, shared by everyone who asks for that key meanwhile."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run ``call`` for ``key`` unless it is already running; returns ``(result, shared)``.
+
+        ``shared`` is True when the result came from another caller's call.
+        """
+        while True:
+            pending = self._calls.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending), True
+            except Abandoned:
+                continue  # whoever ran it was cancelled; take over
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await call()
+        except BaseException as exc:
+            settle(future, exc)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        return result, False
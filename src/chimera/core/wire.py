@@ -0,0 +1,210 @@
+"""Wire codecs and framing for MCP messages.
+
+A frame is a ``!I`` total length followed by a ``!H`` attachment count, one
+``!I`` length per attachment, the codec-encoded body and then the raw
+attachment bytes. Binary artifact data (``payload.artifacts[*].data``) travels
+as attachments: it is written straight from the caller's buffer and handed to
+the receiver as memoryview slices of the frame, so large payloads are never
+re-encoded or copied into the body.
+
+JSON is always available. orjson and msgpack are used when installed on both
+sides of a connection.
+"""
+
+import asyncio
+import json
+import struct
+from collections.abc import Iterable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+ATTACHMENT_KEY = "$attachment"
+
+_LENGTH = struct.Struct("!I")
+_COUNT = struct.Struct("!H")
+
+Buffer = bytes | bytearray | memoryview
+_EMPTY: dict = {}
+
+
+class FrameError(ValueError):
+    """Raised when a frame is malformed or exceeds the size limit."""
+
+
+class Codec:
+    """Encodes JSON-RPC envelopes to bytes and back."""
+
+    name = ""
+
+    def encode(self, obj: object) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: Buffer) -> object:
+        raise NotImplementedError
+
+
+class JSONCodec(Codec):
+    """Standard-library JSON; the baseline every peer understands."""
+
+    name = "json"
+
+    def encode(self, obj: object) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def decode(self, data: Buffer) -> object:
+        return json.loads(bytes(data))
+
+
+class OrjsonCodec(Codec):
+    """JSON via orjson; same wire format as ``json``, several times faster."""
+
+    name = "orjson"
+
+    def encode(self, obj: object) -> bytes:
+        return orjson.dumps(obj)
+
+    def decode(self, data: Buffer) -> object:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """Binary MessagePack encoding."""
+
+    name = "msgpack"
+
+    def encode(self, obj: object) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def decode(self, data: Buffer) -> object:
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS: dict[str, Codec] = {"json": JSONCodec()}
+if orjson is not None:
+    CODECS["orjson"] = OrjsonCodec()
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec()
+
+# Most preferred first.
+PREFERENCE = ["msgpack", "orjson", "json"]
+DEFAULT_CODEC = CODECS["json"]
+
+
+def available_codecs(allowed: Iterable[str] | None = None) -> list[str]:
+    """Installed codec names in preference order, optionally restricted to ``allowed``."""
+    names = [name for name in PREFERENCE if name in CODECS]
+    if allowed is not None:
+        allowed = set(allowed)
+        names = [name for name in names if name in allowed]
+    return names
+
+
+def negotiate(offered: Iterable[str], supported: Iterable[str]) -> Codec:
+    """Pick the first codec in the peer's ``offered`` list that we also support."""
+    supported = set(supported)
+    for name in offered:
+        if name in supported and name in CODECS:
+            return CODECS[name]
+    return DEFAULT_CODEC
+
+
+def _detach(item: object, attachments: list[Buffer]) -> object:
+    """Return ``item`` with binary artifact data replaced by attachment references."""
+    try:
+        params = item.get("params", _EMPTY)
+        payload = params.get("payload", _EMPTY)
+        artifacts = payload.get("artifacts")
+    except AttributeError:
+        return item
+    if not artifacts or not any(
+        isinstance(artifact, dict) and isinstance(artifact.get("data"), Buffer)
+        for artifact in artifacts
+    ):
+        return item
+    detached = []
+    for artifact in artifacts:
+        if isinstance(artifact, dict) and isinstance(artifact.get("data"), Buffer):
+            attachments.append(artifact["data"])
+            artifact = dict(artifact, data={ATTACHMENT_KEY: len(attachments) - 1})
+        detached.append(artifact)
+    return dict(item, params=dict(params, payload=dict(payload, artifacts=detached)))
+
+
+def _reattach(item: object, attachments: list[memoryview]) -> None:
+    if not isinstance(item, dict):
+        return
+    params = item.get("params")
+    payload = params.get("payload") if isinstance(params, dict) else None
+    artifacts = payload.get("artifacts") if isinstance(payload, dict) else None
+    for artifact in artifacts or ():
+        data = artifact.get("data") if isinstance(artifact, dict) else None
+        if isinstance(data, dict) and ATTACHMENT_KEY in data:
+            artifact["data"] = attachments[data[ATTACHMENT_KEY]]
+
+
+def encode_frame(codec: Codec, body: object) -> list[Buffer]:
+    """Encode ``body`` into the buffers of one frame, header first."""
+    attachments: list[Buffer] = []
+    if isinstance(body, list):
+        body = [_detach(item, attachments) for item in body]
+    else:
+        body = _detach(body, attachments)
+    encoded = codec.encode(body)
+    sizes = [memoryview(buffer).nbytes for buffer in attachments]
+    table = _COUNT.pack(len(sizes)) + b"".join(_LENGTH.pack(size) for size in sizes)
+    total = len(table) + len(encoded) + sum(sizes)
+    if total > MAX_FRAME_SIZE:
+        raise FrameError(f"frame of {total} bytes exceeds limit")
+    return [_LENGTH.pack(total) + table, encoded, *attachments]
+
+
+def decode_frame(codec: Codec, frame: bytes) -> object:
+    """Decode a frame read by :func:`read_frame`; attachments become memoryviews."""
+    view = memoryview(frame)
+    try:
+        (count,) = _COUNT.unpack_from(view, 0)
+        offset = _COUNT.size
+        sizes = [_LENGTH.unpack_from(view, offset + i * _LENGTH.size)[0] for i in range(count)]
+    except struct.error as exc:
+        raise FrameError("truncated frame header") from exc
+    offset += count * _LENGTH.size
+    body_end = len(view) - sum(sizes)
+    if body_end < offset:
+        raise FrameError("attachment table exceeds frame")
+    body = codec.decode(view[offset:body_end])
+    if count:
+        attachments = []
+        offset = body_end
+        for size in sizes:
+            attachments.append(view[offset : offset + size])
+            offset += size
+        for item in body if isinstance(body, list) else (body,):
+            _reattach(item, attachments)
+    return body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes | None:
+    """Read one raw frame, or return None at end of stream."""
+    try:
+        header = await reader.readexactly(_LENGTH.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise FrameError(f"frame of {length} bytes exceeds limit")
+    return await reader.readexactly(length)
+
+
+def write_frame(writer: asyncio.StreamWriter, codec: Codec, body: object) -> None:
+    """Queue ``body`` as one frame without joining attachments into the body."""
+    for buffer in encode_frame(codec, body):
+        writer.write(buffer)
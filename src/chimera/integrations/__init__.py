@@ -1,7 +1,7 @@
 """External integrations for Project Chimera."""
 
-from .coinbase import CoinbaseAgentKit
+from .coinbase import CoinbaseAgentKit, TransactionRejected
 from .youtube import YouTubeAdapter
 from .tiktok import TikTokAdapter
 
-__all__ = ["CoinbaseAgentKit", "YouTubeAdapter", "TikTokAdapter"]
+__all__ = ["CoinbaseAgentKit", "TransactionRejected", "YouTubeAdapter", "TikTokAdapter"]
@@ -1,26 +1,127 @@
 """Coinbase AgentKit integration for economic agency."""
 
+from collections.abc import AsyncIterator
+
+import httpx
+
+from .history import TransactionStore
+from .transport import ClientPool, TokenCache, shared_pool, shared_tokens
+
+API_URL = "https://api.cdp.coinbase.com"
+DEFAULT_HISTORY_PAGE_SIZE = 100
+
+
+class TransactionRejected(Exception):
+    """Raised by ``send_transaction`` when a transaction was refused before broadcast.
+
+    Nothing reached the chain, so its nonce is still free. Any other error
+    from ``send_transaction`` leaves it unknown whether it was broadcast.
+    """
+
 
 class CoinbaseAgentKit:
-    """Integration with Coinbase AgentKit for wallet operations."""
+    """Integration with Coinbase AgentKit for wallet operations.
 
-    def __init__(self, api_key: str, api_secret: str) -> None:
+    Transaction history is synced into a local :class:`TransactionStore`
+    (SQLite in WAL mode at ``history_path``, in memory by default), so
+    reconciliation and daily-limit checks query it locally. Requests share
+    the host's pooled client from ``pool``, and the short-lived API token is
+    kept in ``tokens`` and reissued before it expires.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        history_path: str = ":memory:",
+        api_url: str = API_URL,
+        pool: ClientPool | None = None,
+        tokens: TokenCache | None = None,
+    ) -> None:
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.api_url = api_url
+        self.history = TransactionStore(history_path)
+        self.pool = pool if pool is not None else shared_pool()
+        self.tokens = tokens if tokens is not None else shared_tokens()
+        self._token_key = f"coinbase:{api_key}"
+        self.tokens.register(self._token_key, self._issue_token)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.pool.client(self.api_url)
+
+    async def _issue_token(self, previous: dict | None) -> dict:
+        """Issue a short-lived API token signed with the API secret.
+
+        Returns ``{"access_token", "expires_in"}``.
+        """
         pass
 
+    async def access_token(self) -> str:
+        return await self.tokens.get(self._token_key)
+
     async def initialize(self) -> bool:
         """Initialize the AgentKit connection."""
         pass
 
     async def get_wallet_balance(self) -> dict:
-        """Get current wallet balance."""
+        """Get current wallet balances and next nonce.
+
+        Returns ``{"balances": {asset: amount}, "nonce": int}``.
+        """
         pass
 
     async def send_transaction(
-        self, recipient: str, amount: float, asset: str
+        self, recipient: str, amount: float, asset: str, nonce: int | None = None
     ) -> dict:
-        """Send a transaction."""
+        """Send a transaction, with ``nonce`` if the caller manages nonces.
+
+        Returns ``{"transactionId", "hash", "status", "fee"}``. Raises
+        :class:`TransactionRejected` if it was refused before broadcast (a
+        used nonce, insufficient funds, an invalid recipient).
+        """
         pass
 
-    async def get_transaction_history(self, limit: int) -> list[dict]:
-        """Get transaction history."""
+    async def get_fee_market(self, network: str) -> dict:
+        """Get the network's current fees.
+
+        Returns ``{"baseFee", "priorityFee", "block"}``, fees per gas unit
+        in the network's native asset.
+        """
+        pass
+
+    async def get_transaction_history_page(
+        self, cursor: str | None = None, limit: int = DEFAULT_HISTORY_PAGE_SIZE
+    ) -> dict:
+        """Get one page of history, newest first.
+
+        Returns ``{"transactions": [...], "next": cursor or None}``.
+        """
         pass
+
+    async def iter_transaction_pages(
+        self, cursor: str | None = None, page_size: int = DEFAULT_HISTORY_PAGE_SIZE
+    ) -> AsyncIterator[dict]:
+        """Pages of history from ``cursor`` on, fetched as they are consumed."""
+        while True:
+            page = await self.get_transaction_history_page(cursor, page_size)
+            yield page
+            cursor = page.get("next")
+            if not cursor:
+                return
+
+    async def iter_transaction_history(self, page_size: int = DEFAULT_HISTORY_PAGE_SIZE) -> AsyncIterator[dict]:
+        """Every transaction, newest first, fetched a page at a time."""
+        async for page in self.iter_transaction_pages(None, page_size):
+            for transaction in page.get("transactions", []):
+                yield transaction
+
+    async def sync_transaction_history(self) -> int:
+        """Bring the local store up to date; returns how many transactions were new."""
+        return await self.history.sync(self.iter_transaction_pages)
+
+    async def get_transaction_history(self, limit: int) -> list[dict]:
+        """Get transaction history, newest first, from the synced local store."""
+        await self.sync_transaction_history()
+        return self.history.recent(limit)
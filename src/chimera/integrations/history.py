@@ -0,0 +1,222 @@
+"""Local, append-only store of wallet transaction history.
+
+The remote history is paginated newest first. The first sync walks every
+page; the cursor of the next page is saved as it goes, so an interrupted
+backfill picks up where it stopped. Later syncs read from the newest page
+down to the newest transaction of the last completed sync, and on past the
+oldest transaction still pending so it picks up its final status. Only a
+sync that gets that far moves the mark, so one that is interrupted leaves
+no gap: the next sync walks the same pages again. Rows are never deleted;
+only a transaction's status is updated as it settles.
+
+The store is a SQLite file in WAL mode, so reconciliation and limit checks
+can read while a sync writes. It is indexed by timestamp, recipient and
+asset, so per-day totals and lookups by hash are local queries.
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+# pages(cursor) -> async iterator of {"transactions": [...], "next": cursor or None}
+PageSource = Callable[[str | None], AsyncIterator[dict]]
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS transactions ("
+    " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " hash TEXT NOT NULL UNIQUE,"
+    " timestamp REAL NOT NULL,"
+    " recipient TEXT,"
+    " asset TEXT,"
+    " amount TEXT NOT NULL,"
+    " type TEXT,"
+    " status TEXT,"
+    " raw TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_recipient ON transactions(recipient, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_asset ON transactions(asset, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_pending ON transactions(timestamp) WHERE status = 'pending'",
+    "CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def _key(transaction: dict) -> str:
+    return str(transaction.get("hash") or transaction["transactionId"])
+
+
+class TransactionStore:
+    """Transaction history synced from a paginated source into SQLite."""
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def _state(self, key: str) -> str | None:
+        row = self._db.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _set_state(self, key: str, value: str | None) -> None:
+        self._db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (key, value))
+
+    def _known(self, keys: list[str]) -> set[str]:
+        if not keys:
+            return set()
+        placeholders = ",".join("?" * len(keys))
+        rows = self._db.execute(f"SELECT hash FROM transactions WHERE hash IN ({placeholders})", keys)
+        return {row[0] for row in rows}
+
+    def append(self, transactions: list[dict]) -> int:
+        """Store transactions not seen before, update statuses of known ones; return how many were new."""
+        rows = [
+            (
+                _key(transaction),
+                _timestamp(transaction["timestamp"]),
+                transaction.get("recipient"),
+                transaction.get("asset"),
+                str(transaction.get("amount", 0)),
+                transaction.get("type"),
+                transaction.get("status"),
+                json.dumps(transaction, default=str),
+            )
+            for transaction in transactions
+        ]
+        with self._lock:
+            known = self._known([row[0] for row in rows])
+            self._db.executemany(
+                "INSERT INTO transactions (hash, timestamp, recipient, asset, amount, type, status, raw)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(hash) DO UPDATE SET status = excluded.status, raw = excluded.raw"
+                " WHERE status IS NOT excluded.status",
+                rows,
+            )
+            self._db.commit()
+        return len({row[0] for row in rows} - known)
+
+    async def sync(self, pages: PageSource) -> int:
+        """Fetch what is new since the last sync, then any unfinished backfill; return rows added."""
+        added = 0
+        with self._lock:
+            head = self._state("head")
+            oldest_pending = self._db.execute(
+                "SELECT MIN(timestamp) FROM transactions WHERE status = 'pending'"
+            ).fetchone()[0]
+        first = head is None
+        newest = None
+        reached = False
+
+        # Newest first. A first sync is the backfill and walks to the end;
+        # later ones stop once they reach the last head and every pending transaction.
+        async with aclosing(pages(None)) as stream:
+            async for page in stream:
+                transactions = page.get("transactions", [])
+                keys = [_key(transaction) for transaction in transactions]
+                added += self.append(transactions)
+                if newest is None and keys:
+                    newest = keys[0]
+                    if first:
+                        self._save_head(newest)
+                if first:
+                    self._save_backfill(page.get("next"))
+                    if not page.get("next"):
+                        break
+                    continue
+                reached = reached or head in keys
+                settled = oldest_pending is None or any(
+                    _timestamp(transaction["timestamp"]) < oldest_pending for transaction in transactions
+                )
+                if not page.get("next") or (reached and settled):
+                    break
+        if not first and newest is not None:
+            self._save_head(newest)
+
+        # Resume an interrupted backfill from the page after the last one stored.
+        with self._lock:
+            backfilled = self._state("backfilled") == "1"
+            cursor = self._state("backfill_cursor")
+        if not backfilled and cursor is not None:
+            async with aclosing(pages(cursor)) as stream:
+                async for page in stream:
+                    added += self.append(page.get("transactions", []))
+                    self._save_backfill(page.get("next"))
+        return added
+
+    def _save_head(self, transaction_hash: str) -> None:
+        with self._lock:
+            self._set_state("head", transaction_hash)
+            self._db.commit()
+
+    def _save_backfill(self, next_cursor: str | None) -> None:
+        with self._lock:
+            if next_cursor:
+                self._set_state("backfill_cursor", next_cursor)
+            else:
+                self._set_state("backfill_cursor", None)
+                self._set_state("backfilled", "1")
+            self._db.commit()
+
+    def get(self, transaction_hash: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute("SELECT raw FROM transactions WHERE hash = ?", (transaction_hash,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def recent(self, limit: int, recipient: str | None = None, asset: str | None = None) -> list[dict]:
+        """The newest ``limit`` transactions, optionally for one recipient or asset."""
+        clauses, params = [], []
+        if recipient is not None:
+            clauses.append("recipient = ?")
+            params.append(recipient)
+        if asset is not None:
+            clauses.append("asset = ?")
+            params.append(asset)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT raw FROM transactions {where} ORDER BY timestamp DESC, seq DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def daily_total(
+        self, asset: str, day: date, transaction_type: str | None = None, recipient: str | None = None
+    ) -> Decimal:
+        """The exact sum of ``asset`` moved on a UTC ``day``, excluding failed transactions."""
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc).timestamp()
+        end = start + timedelta(days=1).total_seconds()
+        query = (
+            "SELECT amount FROM transactions WHERE asset = ? AND timestamp >= ? AND timestamp < ?"
+            " AND status IS NOT 'failed'"
+        )
+        params: list = [asset, start, end]
+        if transaction_type is not None:
+            query += " AND type = ?"
+            params.append(transaction_type)
+        if recipient is not None:
+            query += " AND recipient = ?"
+            params.append(recipient)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return sum((Decimal(row[0]) for row in rows), Decimal(0))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,21 +1,80 @@
 """TikTok API adapter for content publishing."""
 
+from .transport import ClientPool, OAuthSession, TokenCache
+from .uploads import ChunkedUploader
+
+TOKEN_URL = "https://open.tiktokapis.com/v2/oauth/token/"
+
 
 class TikTokAdapter:
-    """Adapter for TikTok for Developers API."""
+    """Adapter for TikTok for Developers API.
 
-    def __init__(self, client_key: str, client_secret: str) -> None:
-        pass
+    Videos go to ``upload_url``, an upload gateway speaking the generic
+    chunked protocol of :mod:`chimera.integrations.uploads`, not the
+    Content Posting API's own upload flow. ``account`` is the authorising
+    user's ``open_id``; if it is not given, it is taken from the token
+    response. Adapters naming the same account share its token.
+    """
 
-    async def authenticate(self, auth_code: str) -> str:
-        """Authenticate with OAuth2."""
-        pass
+    def __init__(
+        self,
+        client_key: str,
+        client_secret: str,
+        upload_url: str | None = None,
+        uploader: ChunkedUploader | None = None,
+        pool: ClientPool | None = None,
+        tokens: TokenCache | None = None,
+        token_url: str = TOKEN_URL,
+        account: str | None = None,
+    ) -> None:
+        self.client_key = client_key
+        self.client_secret = client_secret
+        self.oauth = OAuthSession(
+            f"tiktok:{client_key}",
+            token_url,
+            {"client_key": client_key, "client_secret": client_secret},
+            pool,
+            tokens,
+            account,
+            account_field="open_id",
+        )
+        if uploader is None:
+            if upload_url is None:
+                raise ValueError("upload_url is required unless an uploader is given")
+            uploader = ChunkedUploader(
+                upload_url,
+                pool=self.oauth.pool,
+                access_token=self.oauth.access_token,
+                invalidate_token=self.oauth.invalidate,
+            )
+        self.uploader = uploader
+
+    async def authenticate(self, auth_code: str, redirect_uri: str | None = None) -> str:
+        """Authenticate with OAuth2; the access token is then refreshed in the background."""
+        return await self.oauth.authenticate(auth_code, redirect_uri)
 
     async def upload_video(
-        self, video_path: str, title: str, description: str
+        self,
+        video_path: str,
+        title: str,
+        description: str,
+        expected_sha256: str | None = None,
     ) -> str:
-        """Upload a video to TikTok."""
-        pass
+        """Upload a video to TikTok in resumable chunks.
+
+        Retrying after a failure resumes from the last acknowledged chunk;
+        ``expected_sha256`` is the approved version's hash (DELIVERY-004).
+        """
+        metadata = {"title": title, "description": description}
+        return (await self.upload(video_path, metadata, expected_sha256))["video_id"]
+
+    async def upload(self, video_path: str, metadata: dict, expected_sha256: str | None = None) -> dict:
+        """Upload a video and return the uploader's whole result.
+
+        Besides the ``video_id`` it has the hash, chunk counts and the
+        response ``headers``, whose rate-limit state the publisher learns from.
+        """
+        return await self.uploader.upload(video_path, metadata, expected_sha256)
 
     async def get_analytics(self, video_id: str) -> dict:
         """Get video analytics."""
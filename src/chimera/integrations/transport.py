@@ -0,0 +1,316 @@
+"""Shared HTTP transport for the platform integrations.
+
+Adapters do not open their own connections. :class:`ClientPool` keeps one
+``httpx.AsyncClient`` per origin (scheme, host and port) with keep-alive
+limits, so every adapter and uploader talking to a host shares its
+connections. HTTP/2 is used when ``h2`` is installed and plain HTTP/1.1
+keep-alive otherwise.
+
+OAuth tokens are kept in a :class:`TokenCache`. A token is refreshed in
+the background ``refresh_margin`` seconds before it expires, so the
+publish path never waits on a refresh. Concurrent callers share a single
+refresh per credential.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
+import httpx
+
+from chimera.core.singleflight import SingleFlight
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0)
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_REFRESH_MARGIN = 60.0
+
+# refresh(previous token or None) -> {"access_token", "expires_in", ...}
+TokenRefresher = Callable[[dict | None], Awaitable[dict]]
+
+
+def _origin(url: str | httpx.URL) -> tuple[str, str, int | None]:
+    url = httpx.URL(url)
+    return url.scheme, url.host, url.port
+
+
+async def _closed_at_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def _close_with_loop(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """Close ``client`` when the running loop shuts down its async generators.
+
+    ``asyncio.run`` does that before closing the loop; after that the
+    client's connections could no longer be closed at all.
+    """
+    closer = _closed_at_shutdown(client)
+    try:
+        # Step to the first yield; the loop now tracks the generator.
+        closer.asend(None).send(None)
+    except StopIteration:
+        pass
+    return closer
+
+
+def _close_on(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    """Close ``client`` on ``loop``, the loop its connections belong to."""
+    if client.is_closed or loop.is_closed():
+        return  # closed already, by the loop's shutdown if not before
+    loop.call_soon_threadsafe(lambda: loop.create_task(client.aclose()))
+
+
+class ClientPool:
+    """One pooled ``httpx.AsyncClient`` per origin, shared by every caller.
+
+    Clients are bound to the event loop they were created on; a caller on
+    another loop gets a fresh client, and the old one is closed on its own
+    loop. Clients still open when their loop shuts down are closed then.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.limits = limits
+        self.http2 = h2 is not None if http2 is None else http2
+        self.timeout = timeout
+        # origin -> (client, its loop, the generator closing it at loop shutdown)
+        self._clients: dict[
+            tuple[str, str, int | None], tuple[httpx.AsyncClient, asyncio.AbstractEventLoop, AsyncGenerator]
+        ] = {}
+
+    def client(self, url: str | httpx.URL) -> httpx.AsyncClient:
+        """The shared client for ``url``'s origin."""
+        key = _origin(url)
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(key)
+        if entry is None or entry[1] is not loop or entry[0].is_closed:
+            if entry is not None:
+                _close_on(entry[1], entry[0])
+            client = httpx.AsyncClient(limits=self.limits, http2=self.http2, timeout=httpx.Timeout(self.timeout))
+            self._clients[key] = entry = (client, loop, _close_with_loop(client))
+        return entry[0]
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        clients, self._clients = self._clients, {}
+        for client, client_loop, _ in clients.values():
+            if client_loop is loop:
+                await client.aclose()
+            else:
+                _close_on(client_loop, client)
+
+
+class TokenCache:
+    """OAuth tokens per credential, refreshed before they expire."""
+
+    def __init__(
+        self,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self.refreshes = 0
+        # key -> (token, expires_at, refresh_at)
+        self._tokens: dict[str, tuple[dict, float, float]] = {}
+        self._refreshers: dict[str, TokenRefresher] = {}
+        self._refreshing: SingleFlight[dict] = SingleFlight()
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._background: set[asyncio.Task] = set()
+
+    def register(self, key: str, refresh: TokenRefresher) -> None:
+        """Fetch ``key``'s tokens with ``refresh``, on first use and before each expires."""
+        self._refreshers[key] = refresh
+
+    def put(self, key: str, token: dict, refresh: TokenRefresher | None = None) -> None:
+        """Store ``token`` for ``key``; with ``refresh``, keep it current from now on."""
+        if refresh is not None:
+            self._refreshers[key] = refresh
+        now = self._clock()
+        lifetime = float(token["expires_in"]) if token.get("expires_in") is not None else math.inf
+        # Short-lived tokens are refreshed halfway through, not continuously.
+        refresh_at = now + max(lifetime - self.refresh_margin, lifetime / 2)
+        self._tokens[key] = (token, now + lifetime, refresh_at)
+        self._schedule(key, refresh_at)
+
+    def _schedule(self, key: str, refresh_at: float) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if key not in self._refreshers or math.isinf(refresh_at):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # get() refreshes on demand instead
+        delay = max(0.0, refresh_at - self._clock())
+        self._timers[key] = loop.call_later(delay, self._refresh_soon, key)
+
+    def _refresh_soon(self, key: str) -> None:
+        self._timers.pop(key, None)
+        if key in self._refreshing:
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh_in_background(key))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _refresh_in_background(self, key: str) -> None:
+        try:
+            await self.refresh(key)
+        except Exception as exc:
+            # The current token is still good until it expires; get() retries.
+            logger.warning("background token refresh for %s failed: %s", key, exc)
+
+    async def get(self, key: str) -> str:
+        """A valid access token for ``key``, waiting for a refresh only once it has expired."""
+        entry = self._tokens.get(key)
+        now = self._clock()
+        if entry is None or now >= entry[1]:
+            return (await self.refresh(key))["access_token"]
+        if now >= entry[2] and key in self._refreshers:
+            self._refresh_soon(key)
+        return entry[0]["access_token"]
+
+    async def refresh(self, key: str) -> dict:
+        """Fetch a new token for ``key``; concurrent callers share one refresh."""
+        refresher = self._refreshers.get(key)
+        if refresher is None:
+            raise LookupError(f"no token or refresher for {key!r}; authenticate first")
+        token, _ = await self._refreshing.do(key, lambda: self._refresh(key, refresher))
+        return token
+
+    async def _refresh(self, key: str, refresher: TokenRefresher) -> dict:
+        previous = self._tokens[key][0] if key in self._tokens else None
+        self.refreshes += 1
+        token = dict(await refresher(previous))
+        # Providers may omit the refresh token when it hasn't changed.
+        if previous is not None and "refresh_token" not in token and "refresh_token" in previous:
+            token["refresh_token"] = previous["refresh_token"]
+        self.put(key, token)
+        return token
+
+    def invalidate(self, key: str) -> None:
+        """Treat ``key``'s token as expired (say, after a 401); the next get() refreshes it.
+
+        The token is kept so its refresh token can still be used.
+        """
+        entry = self._tokens.get(key)
+        if entry is not None:
+            self._tokens[key] = (entry[0], -math.inf, -math.inf)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+    async def aclose(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        tasks = list(self._background)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_shared_pool: ClientPool | None = None
+_shared_tokens: TokenCache | None = None
+
+
+def shared_pool() -> ClientPool:
+    """The process-wide client pool the integrations use by default."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = ClientPool()
+    return _shared_pool
+
+
+def shared_tokens() -> TokenCache:
+    """The process-wide token cache the integrations use by default."""
+    global _shared_tokens
+    if _shared_tokens is None:
+        _shared_tokens = TokenCache()
+    return _shared_tokens
+
+
+async def request_token(pool: ClientPool, url: str, form: dict) -> dict:
+    """POST an OAuth token request and return the token response."""
+    response = await pool.client(url).post(url, data=form)
+    response.raise_for_status()
+    return response.json()
+
+
+class OAuthSession:
+    """OAuth2 authorization-code flow for one account of one app credential.
+
+    ``client`` holds the form fields identifying the app (``client_id`` or
+    ``client_key``, and ``client_secret``). Tokens live in ``tokens`` under
+    :attr:`key`, the app credential ``app`` plus the account that authorised
+    it, and are refreshed with their refresh token. Sessions naming the same
+    ``account`` share its token. Without one, the account is read from the
+    token response's ``account_field`` when the provider returns it;
+    otherwise the session's token is its own.
+    """
+
+    def __init__(
+        self,
+        app: str,
+        token_url: str,
+        client: dict[str, str],
+        pool: ClientPool | None = None,
+        tokens: TokenCache | None = None,
+        account: str | None = None,
+        account_field: str | None = None,
+    ) -> None:
+        self.app = app
+        self.token_url = token_url
+        self.client = client
+        self.pool = pool if pool is not None else shared_pool()
+        self.tokens = tokens if tokens is not None else shared_tokens()
+        self.account = account
+        self.account_field = account_field
+
+    @property
+    def key(self) -> str:
+        account = self.account if self.account is not None else f"session-{id(self):x}"
+        return f"{self.app}:{account}"
+
+    async def authenticate(self, auth_code: str, redirect_uri: str | None = None) -> str:
+        """Exchange ``auth_code`` for a token; returns the access token."""
+        form = {**self.client, "grant_type": "authorization_code", "code": auth_code}
+        if redirect_uri is not None:
+            form["redirect_uri"] = redirect_uri
+        token = await request_token(self.pool, self.token_url, form)
+        if self.account is None and self.account_field and token.get(self.account_field):
+            self.account = str(token[self.account_field])
+        self.tokens.put(self.key, token, self._refresh)
+        return token["access_token"]
+
+    async def _refresh(self, previous: dict | None) -> dict:
+        if not previous or not previous.get("refresh_token"):
+            raise LookupError(f"{self.key} has no refresh token; authenticate again")
+        form = {**self.client, "grant_type": "refresh_token", "refresh_token": previous["refresh_token"]}
+        return await request_token(self.pool, self.token_url, form)
+
+    async def access_token(self) -> str:
+        return await self.tokens.get(self.key)
+
+    def invalidate(self) -> None:
+        """The provider rejected the access token; refresh it on next use."""
+        self.tokens.invalidate(self.key)
@@ -0,0 +1,273 @@
+"""Resumable chunked video uploads.
+
+The upload protocol is a generic one, spoken by an upload gateway in front
+of the platforms; it is not YouTube's or TikTok's own upload API, so the
+endpoint must be a service that implements it. It has four calls:
+
+* ``POST {endpoint}`` with ``{"filename", "size", "chunk_size", "metadata"}``
+  opens a session and returns ``{"upload_id"}``;
+* ``PUT {endpoint}/{upload_id}/chunks/{index}`` stores one chunk;
+* ``GET {endpoint}/{upload_id}`` returns ``{"received": [index, ...]}``;
+* ``POST {endpoint}/{upload_id}/complete`` with ``{"sha256"}`` assembles
+  the file, checks its hash and returns ``{"video_id"}``
+  (``DELETE {endpoint}/{upload_id}`` abandons it).
+
+The file is memory-mapped and walked once, in order: each chunk is fed to
+the SHA-256 and then sent, with up to ``concurrency`` chunks in flight over
+the host's shared connection pool (:mod:`.transport`). Acknowledged chunks are recorded in a small state
+file, so a failed upload retried later skips what the server already has
+(still hashing it, which only reads the pages). The hash is compared with
+the approved version's before the upload is completed (DELIVERY-004).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from .transport import ClientPool, shared_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+DEFAULT_CHUNK_ATTEMPTS = 3
+DEFAULT_STATE_DIR = os.path.join(tempfile.gettempdir(), "chimera-uploads")
+
+
+class UploadError(Exception):
+    """Raised when an upload fails; it can be retried and will resume.
+
+    ``status`` and ``headers`` are the failing response's, if there was one.
+    """
+
+    def __init__(self, message: str, status: int | None = None, headers: dict[str, str] | None = None) -> None:
+        self.status = status
+        self.headers = headers
+        super().__init__(message)
+
+
+class ContentMismatch(UploadError):
+    """Raised when the file's hash differs from the approved version (DELIVERY-004)."""
+
+    def __init__(self, expected: str, actual: str) -> None:
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f"content hash {actual} does not match approved {expected}")
+
+
+class ChunkedUploader:
+    """Uploads files in concurrent chunks, resuming from persisted progress.
+
+    Requests go through ``client`` if one is given, else through the shared
+    client of ``pool`` for the endpoint's host. ``access_token``, if given,
+    supplies the bearer token for each request. A request answered with 401
+    calls ``invalidate_token`` and is retried once with a fresh token.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        client: httpx.AsyncClient | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        chunk_attempts: int = DEFAULT_CHUNK_ATTEMPTS,
+        state_dir: str = DEFAULT_STATE_DIR,
+        headers: dict[str, str] | None = None,
+        pool: ClientPool | None = None,
+        access_token: Callable[[], Awaitable[str]] | None = None,
+        invalidate_token: Callable[[], None] | None = None,
+    ) -> None:
+        self.endpoint = endpoint.rstrip("/")
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.chunk_attempts = chunk_attempts
+        self.state_dir = state_dir
+        self.headers = dict(headers or {})
+        self.access_token = access_token
+        self.invalidate_token = invalidate_token
+        self._client = client
+        self._pool = pool
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is not None:
+            return self._client
+        return (self._pool or shared_pool()).client(self.endpoint)
+
+    async def aclose(self) -> None:
+        """Nothing to release: connections belong to the caller's client or the pool."""
+
+    def _state_path(self, path: str) -> str:
+        identity = f"{self.endpoint}\0{os.path.abspath(path)}".encode("utf-8")
+        return os.path.join(self.state_dir, hashlib.blake2b(identity, digest_size=16).hexdigest() + ".json")
+
+    def _load_state(self, path: str, stat: os.stat_result) -> dict | None:
+        try:
+            with open(self._state_path(path), encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return None
+        unchanged = (state.get("size"), state.get("mtime_ns"), state.get("chunk_size")) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+            self.chunk_size,
+        )
+        return state if unchanged else None
+
+    def _save_state(self, path: str, state: dict) -> None:
+        os.makedirs(self.state_dir, exist_ok=True)
+        target = self._state_path(path)
+        temporary = f"{target}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(temporary, target)
+
+    def _clear_state(self, path: str) -> None:
+        try:
+            os.remove(self._state_path(path))
+        except FileNotFoundError:
+            pass
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = await self._send(method, url, **kwargs)
+        if response.status_code == 401 and self.invalidate_token is not None:
+            # Revoked or expired early: the token cache must not hand it out again.
+            self.invalidate_token()
+            response = await self._send(method, url, **kwargs)
+        if response.status_code >= 400:
+            raise UploadError(
+                f"{method} {url} failed with {response.status_code}: {response.text[:200]}",
+                status=response.status_code,
+                headers=dict(response.headers),
+            )
+        return response
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        headers = self.headers
+        if self.access_token is not None:
+            headers = {**headers, "Authorization": f"Bearer {await self.access_token()}"}
+        return await self.client.request(method, url, headers=headers, **kwargs)
+
+    async def _open_session(self, path: str, stat: os.stat_result, metadata: dict) -> tuple[dict, set[int]]:
+        state = self._load_state(path, stat)
+        if state is not None:
+            try:
+                status = await self._request("GET", f"{self.endpoint}/{state['upload_id']}")
+                return state, set(status.json().get("received", ()))
+            except UploadError as exc:
+                if exc.status not in (404, 410):
+                    raise
+                logger.info("upload session %s is gone, starting over", state["upload_id"])
+        body = {
+            "filename": os.path.basename(path),
+            "size": stat.st_size,
+            "chunk_size": self.chunk_size,
+            "metadata": metadata,
+        }
+        response = await self._request("POST", self.endpoint, json=body)
+        state = {
+            "upload_id": response.json()["upload_id"],
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "chunk_size": self.chunk_size,
+        }
+        self._save_state(path, state)
+        return state, set()
+
+    async def _send_chunk(self, upload_id: str, index: int, data: bytes) -> None:
+        url = f"{self.endpoint}/{upload_id}/chunks/{index}"
+        for attempt in range(1, self.chunk_attempts + 1):
+            try:
+                await self._request("PUT", url, content=data)
+                return
+            except UploadError as exc:
+                # Retrying into a rate limit only makes it worse; let the caller back off.
+                if exc.status == 429 or attempt == self.chunk_attempts:
+                    raise
+            except httpx.TransportError as exc:
+                if attempt == self.chunk_attempts:
+                    raise UploadError(f"chunk {index} failed after {attempt} attempts: {exc}") from exc
+
+    async def upload(
+        self, path: str, metadata: dict | None = None, expected_sha256: str | None = None
+    ) -> dict:
+        """Upload ``path``; returns the platform's video id, the hash and chunk counts.
+
+        ``headers`` in the result are the completing response's, which carry
+        the platform's rate-limit state.
+        """
+        stat = os.stat(path)
+        state, received = await self._open_session(path, stat, metadata or {})
+        upload_id = state["upload_id"]
+        chunks = -(-stat.st_size // self.chunk_size)
+        acknowledged = set(received)
+        slots = asyncio.Semaphore(self.concurrency)
+        sending: set[asyncio.Task] = set()
+        # Failed sends record their error here rather than on the task, which
+        # leaves ``sending`` as soon as it is done.
+        errors: list[Exception] = []
+        hasher = hashlib.sha256()
+
+        async def send(index: int, data: bytes) -> None:
+            try:
+                await self._send_chunk(upload_id, index, data)
+                acknowledged.add(index)
+                self._save_state(path, {**state, "received": sorted(acknowledged)})
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                slots.release()
+
+        try:
+            with open(path, "rb") as handle:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else None
+                try:
+                    for index in range(chunks):
+                        start = index * self.chunk_size
+                        with memoryview(mapped)[start : start + self.chunk_size] as view:
+                            # hashlib drops the GIL on large buffers, so hash off the loop.
+                            await asyncio.to_thread(hasher.update, view)
+                            if index in received:
+                                continue
+                            data = bytes(view)
+                        await slots.acquire()
+                        if errors:
+                            slots.release()
+                            raise errors[0]
+                        task = asyncio.create_task(send(index, data))
+                        sending.add(task)
+                        task.add_done_callback(sending.discard)
+                    await asyncio.gather(*sending)
+                    if errors:
+                        raise errors[0]
+                finally:
+                    if mapped is not None:
+                        mapped.close()
+        except BaseException:
+            for task in sending:
+                task.cancel()
+            await asyncio.gather(*sending, return_exceptions=True)
+            raise
+
+        digest = hasher.hexdigest()
+        if expected_sha256 is not None and digest != expected_sha256.lower():
+            await self._request("DELETE", f"{self.endpoint}/{upload_id}")
+            self._clear_state(path)
+            raise ContentMismatch(expected_sha256, digest)
+        response = await self._request("POST", f"{self.endpoint}/{upload_id}/complete", json={"sha256": digest})
+        self._clear_state(path)
+        return {
+            "video_id": response.json()["video_id"],
+            "sha256": digest,
+            "bytes": stat.st_size,
+            "chunks": chunks,
+            "resumed_chunks": len(received & set(range(chunks))),
+            "headers": dict(response.headers),
+        }
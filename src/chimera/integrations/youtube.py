@@ -1,21 +1,83 @@
 """YouTube API adapter for content publishing."""
 
+from .transport import ClientPool, OAuthSession, TokenCache
+from .uploads import ChunkedUploader
+
+TOKEN_URL = "https://oauth2.googleapis.com/token"
+
 
 class YouTubeAdapter:
-    """Adapter for YouTube Data API v3."""
+    """Adapter for YouTube Data API v3.
 
-    def __init__(self, client_id: str, client_secret: str) -> None:
-        pass
+    Videos go to ``upload_url``, an upload gateway speaking the generic
+    chunked protocol of :mod:`chimera.integrations.uploads`, not the
+    Data API's own upload flow. ``account`` names the channel that
+    authorises the adapter; adapters naming the same one share its token.
+    """
 
-    async def authenticate(self, auth_code: str) -> str:
-        """Authenticate with OAuth2."""
-        pass
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        upload_url: str | None = None,
+        uploader: ChunkedUploader | None = None,
+        pool: ClientPool | None = None,
+        tokens: TokenCache | None = None,
+        token_url: str = TOKEN_URL,
+        account: str | None = None,
+    ) -> None:
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.oauth = OAuthSession(
+            f"youtube:{client_id}",
+            token_url,
+            {"client_id": client_id, "client_secret": client_secret},
+            pool,
+            tokens,
+            account,
+        )
+        if uploader is None:
+            if upload_url is None:
+                raise ValueError("upload_url is required unless an uploader is given")
+            uploader = ChunkedUploader(
+                upload_url,
+                pool=self.oauth.pool,
+                access_token=self.oauth.access_token,
+                invalidate_token=self.oauth.invalidate,
+            )
+        self.uploader = uploader
+
+    async def authenticate(self, auth_code: str, redirect_uri: str | None = None) -> str:
+        """Authenticate with OAuth2.
+
+        The token is kept in the shared token cache and refreshed before it
+        expires, for every adapter of this app credential and account.
+        """
+        return await self.oauth.authenticate(auth_code, redirect_uri)
 
     async def upload_video(
-        self, video_path: str, title: str, description: str, tags: list[str]
+        self,
+        video_path: str,
+        title: str,
+        description: str,
+        tags: list[str],
+        expected_sha256: str | None = None,
     ) -> str:
-        """Upload a video to YouTube."""
-        pass
+        """Upload a video to YouTube in resumable chunks.
+
+        Retrying after a failure resumes from the last acknowledged chunk;
+        ``expected_sha256`` is the approved version's hash (DELIVERY-004).
+        """
+        metadata = {"title": title, "description": description, "tags": tags}
+        return (await self.upload(video_path, metadata, expected_sha256))["video_id"]
+
+    async def upload(self, video_path: str, metadata: dict, expected_sha256: str | None = None) -> dict:
+        """Upload a video and return the uploader's whole result.
+
+        Besides the ``video_id`` it has the hash, chunk counts and the
+        response ``headers``, whose rate-limit state the publisher learns from.
+        """
+        return await self.uploader.upload(video_path, metadata, expected_sha256)
 
     async def get_analytics(self, video_id: str) -> dict:
         """Get video analytics."""
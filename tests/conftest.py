@@ -1,9 +1,33 @@
 """Pytest configuration and fixtures."""
 
+import hashlib
+import json
+import re
+import threading
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow", action="store_true", default=False, help="also run tests marked slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip timing-sensitive tests unless asked for; they flake on shared runners."""
+    if config.getoption("--run-slow"):
+        return
+    skip = pytest.mark.skip(reason="slow: pass --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def mock_mcp_message():
     """Mock MCP message for testing."""
@@ -68,3 +92,154 @@ def mock_guardian_decision():
         "issues": [],
         "requires_human": False
     }
+
+
+class FakeUploadServer(ThreadingHTTPServer):
+    """A local server speaking the resumable chunked upload protocol.
+
+    ``fail_after`` makes every chunk PUT after that many succeed fail with
+    ``fail_status`` (a 503, as if the platform went away mid-upload), or
+    only the next ``failures`` of them if that is set. A 429 carries a
+    ``Retry-After``. ``POST /token`` is an OAuth token endpoint issuing
+    tokens valid for ``token_lifetime`` seconds. ``complete_headers`` are
+    sent with every successful completion. Opening an upload with a token
+    in ``revoked`` gets a 401.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _UploadHandler)
+        self.sessions: dict[str, dict] = {}
+        self.videos: dict[str, bytes] = {}
+        self.chunk_puts = 0
+        self.fail_after: int | None = None
+        self.fail_status = 503
+        self.failures: int | None = None
+        self.connections: set[tuple] = set()
+        self.token_requests: list[dict] = []
+        self.token_lifetime = 3600
+        self.authorizations: set[str] = set()
+        self.complete_headers: dict[str, str] = {}
+        self.revoked: set[str] = set()
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/upload"
+
+    @property
+    def token_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/token"
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _reply(self, status: int, body: dict | None = None, headers: dict[str, str] | None = None) -> None:
+        payload = json.dumps(body or {}).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _reply_rate_limited(self) -> None:
+        self.send_response(429)
+        self.send_header("Retry-After", "0.05")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _session(self, upload_id: str) -> dict | None:
+        return self.server.sessions.get(upload_id)
+
+    def _token(self) -> None:
+        form = dict(urllib.parse.parse_qsl(self._body().decode()))
+        self.server.token_requests.append(form)
+        count = len(self.server.token_requests)
+        self._reply(
+            200,
+            {
+                "access_token": f"token-{count}",
+                "expires_in": self.server.token_lifetime,
+                "refresh_token": "refresh",
+                "open_id": "user-1",
+            },
+        )
+
+    def do_POST(self) -> None:
+        self.server.connections.add(self.client_address)
+        if self.path == "/token":
+            return self._token()
+        if "Authorization" in self.headers:
+            self.server.authorizations.add(self.headers["Authorization"])
+        body = json.loads(self._body() or b"{}")
+        if self.headers.get("Authorization", "").removeprefix("Bearer ") in self.server.revoked:
+            return self._reply(401, {"error": "invalid_token"})
+        if self.path == "/upload":
+            upload_id = uuid.uuid4().hex
+            self.server.sessions[upload_id] = {**body, "chunks": {}}
+            return self._reply(200, {"upload_id": upload_id})
+        match = re.fullmatch(r"/upload/(\w+)/complete", self.path)
+        session = match and self._session(match.group(1))
+        if not session:
+            return self._reply(404)
+        data = b"".join(session["chunks"][index] for index in sorted(session["chunks"]))
+        if len(data) != session["size"] or hashlib.sha256(data).hexdigest() != body["sha256"]:
+            return self._reply(422, {"error": "content does not match"})
+        video_id = f"video-{match.group(1)[:8]}"
+        self.server.videos[video_id] = data
+        del self.server.sessions[match.group(1)]
+        self._reply(200, {"video_id": video_id}, self.server.complete_headers)
+
+    def do_PUT(self) -> None:
+        self.server.connections.add(self.client_address)
+        data = self._body()
+        match = re.fullmatch(r"/upload/(\w+)/chunks/(\d+)", self.path)
+        session = match and self._session(match.group(1))
+        if not session:
+            return self._reply(404)
+        with self.server.lock:
+            server = self.server
+            failing = server.fail_after is not None and server.chunk_puts >= server.fail_after
+            if failing and server.failures is not None:
+                server.failures -= 1
+                if server.failures <= 0:
+                    server.fail_after = None
+            if not failing:
+                server.chunk_puts += 1
+        if failing and server.fail_status == 429:
+            return self._reply_rate_limited()
+        if failing:
+            return self._reply(server.fail_status)
+        session["chunks"][int(match.group(2))] = data
+        self._reply(200)
+
+    def do_GET(self) -> None:
+        session = self._session(self.path.rsplit("/", 1)[-1])
+        if not session:
+            return self._reply(404)
+        self._reply(200, {"received": sorted(session["chunks"])})
+
+    def do_DELETE(self) -> None:
+        self.server.sessions.pop(self.path.rsplit("/", 1)[-1], None)
+        self._reply(200)
+
+
+@pytest.fixture
+def upload_server():
+    """A running :class:`FakeUploadServer`, shut down after the test."""
+    server = FakeUploadServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
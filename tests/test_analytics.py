@@ -0,0 +1,162 @@
+"""Tests for batched, freshness-tiered analytics collection."""
+
+import asyncio
+
+import pytest
+
+from chimera.agents.workers import DeliveryWorker
+from chimera.agents.workers.analytics import FRESHNESS_TIERS, AnalyticsCollector, refresh_interval
+from chimera.benchmarks import analytics_refresh
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fetcher(batches, fail=False):
+    async def fetch(video_ids):
+        batches.append(list(video_ids))
+        await asyncio.sleep(0)
+        if fail:
+            raise ConnectionError("analytics unavailable")
+        return {video_id: {"views": int(video_id.split("-")[1])} for video_id in video_ids if "missing" not in video_id}
+
+    return fetch
+
+
+def test_refresh_interval_follows_post_age():
+    assert refresh_interval(60) == 30
+    assert refresh_interval(3 * 3600) == 300
+    assert refresh_interval(3 * 86400) == 3600
+    assert refresh_interval(90 * 86400) == FRESHNESS_TIERS[-1][1]
+    assert refresh_interval(None) == 30
+
+
+def test_ids_are_grouped_into_platform_batches():
+    youtube, tiktok = [], []
+    collector = AnalyticsCollector({"youtube": _fetcher(youtube), "tiktok": _fetcher(tiktok)})
+    items = [(f"yt-{i}", "youtube") for i in range(120)] + [(f"tt-{i}", "tiktok") for i in range(45)]
+
+    results = asyncio.run(collector.collect(items))
+
+    assert [len(batch) for batch in youtube] == [50, 50, 20]
+    assert [len(batch) for batch in tiktok] == [20, 20, 5]
+    assert results[("yt-7", "youtube")] == {"views": 7} and len(results) == 165
+
+
+def test_recent_posts_refresh_often_and_old_posts_rarely():
+    clock = FakeClock()
+    batches = []
+    collector = AnalyticsCollector({"youtube": _fetcher(batches)}, clock=clock)
+    collector.track("new-1", "youtube", published_at=clock.now - 600)
+    collector.track("old-2", "youtube", published_at=clock.now - 10 * 86400)
+    items = [("new-1", "youtube"), ("old-2", "youtube")]
+
+    async def dashboard(cycles):
+        for _ in range(cycles):
+            await collector.collect(items)
+            clock.now += 30
+
+    asyncio.run(dashboard(10))
+
+    fetched = [video_id for batch in batches for video_id in batch]
+    assert fetched.count("new-1") == 10 and fetched.count("old-2") == 1
+    assert collector.cached("old-2", "youtube") == {"views": 2}
+
+
+def test_concurrent_reads_share_one_batch():
+    batches = []
+    collector = AnalyticsCollector({"tiktok": _fetcher(batches)})
+
+    async def scenario():
+        return await asyncio.gather(*(collector.get("tt-1", "tiktok") for _ in range(5)))
+
+    assert asyncio.run(scenario()) == [{"views": 1}] * 5
+    assert batches == [["tt-1"]]
+
+
+def test_cancelled_read_does_not_cancel_others_sharing_its_batch():
+    batches = []
+
+    async def slow(video_ids):
+        batches.append(list(video_ids))
+        await asyncio.sleep(0.02)
+        return {video_id: {"views": 1} for video_id in video_ids}
+
+    collector = AnalyticsCollector({"tiktok": slow})
+
+    async def scenario():
+        first = asyncio.create_task(collector.get("tt-1", "tiktok"))
+        await asyncio.sleep(0.005)
+        second = asyncio.create_task(collector.get("tt-1", "tiktok"))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == {"views": 1}
+    assert batches == [["tt-1"], ["tt-1"]]
+
+
+def test_failed_batch_serves_stale_metrics_or_raises():
+    clock = FakeClock()
+    batches = []
+    fetchers = {"youtube": _fetcher(batches)}
+    collector = AnalyticsCollector(fetchers, clock=clock)
+    asyncio.run(collector.collect([("yt-1", "youtube")]))
+
+    fetchers["youtube"] = _fetcher(batches, fail=True)
+    clock.now += 3600
+    assert asyncio.run(collector.collect([("yt-1", "youtube")], force=True)) == {("yt-1", "youtube"): {"views": 1}}
+    with pytest.raises(ConnectionError):
+        asyncio.run(collector.collect([("yt-2", "youtube")]))
+
+
+def test_unknown_ids_are_left_out_and_cached_as_missing():
+    clock = FakeClock()
+    batches = []
+    collector = AnalyticsCollector({"youtube": _fetcher(batches)}, clock=clock)
+    collector.track("yt-1", "youtube", clock.now)
+    collector.track("missing-2", "youtube", clock.now)
+
+    assert asyncio.run(collector.refresh()) == 2
+    assert collector.cached("missing-2", "youtube") is None
+    assert collector.due() == [] and collector.info()["missing"] == 1
+
+    # Reads within the tier interval don't ask the platform again.
+    assert asyncio.run(collector.collect([("missing-2", "youtube")])) == {}
+    assert len(batches) == 1
+    clock.now += FRESHNESS_TIERS[0][1]
+    assert collector.due() == [("yt-1", "youtube"), ("missing-2", "youtube")]
+
+
+def test_fetcher_returning_nothing_is_an_error_not_missing_posts():
+    async def fetch(video_ids):
+        return None
+
+    collector = AnalyticsCollector({"youtube": fetch})
+
+    with pytest.raises(TypeError):
+        asyncio.run(collector.get("yt-1", "youtube"))
+    assert collector.info()["cached"] == 0
+
+
+def test_delivery_worker_reads_analytics_through_the_collector():
+    batches = []
+    worker = DeliveryWorker(analytics=AnalyticsCollector({"youtube": _fetcher(batches)}))
+
+    async def scenario():
+        return [await worker.get_analytics("yt-3", "youtube") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [{"views": 3}] * 3
+    assert batches == [["yt-3"]]
+
+
+def test_benchmark_makes_far_fewer_calls():
+    report = analytics_refresh.run(posts=300, minutes=5, latency_ms=0.0)["results"]
+
+    assert report["per_video"]["api_calls"] == 300 * 10
+    assert report["batched_tiered"]["api_calls"] < report["per_video"]["api_calls"] / 50
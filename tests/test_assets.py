@@ -0,0 +1,167 @@
+"""Tests for the content-addressed asset store and render queue."""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from chimera.agents.workers import ContentWorker
+from chimera.agents.workers.assets import AssetStore, NoRenderer, RenderQueue, asset_key
+
+
+def render_bytes(text, style, params):
+    return f"{style}|{text}|{sorted(params.items())}".encode()
+
+
+def render_slowly(text, style, params):
+    time.sleep(0.05)
+    return render_bytes(text, style, params)
+
+
+RENDERERS = {kind: render_bytes for kind in ("voiceover", "broll", "thumbnail", "video")}
+
+
+def _variant(script, main_point):
+    content = [dict(segment) for segment in script["content"]]
+    content[1]["text"] = main_point
+    return {**script, "id": f"script-{main_point}", "content": content}
+
+
+def test_key_covers_text_style_and_params():
+    base = asset_key("voiceover", "Hook", "educational", {"voice": "a", "speed": 1})
+    assert base == asset_key("voiceover", "Hook", "educational", {"speed": 1, "voice": "a"})
+    assert base != asset_key("voiceover", "Hook", "casual", {"voice": "a", "speed": 1})
+    assert base != asset_key("voiceover", "Hook", "educational", {"voice": "b", "speed": 1})
+    assert base != asset_key("broll", "Hook", "educational", {"voice": "a", "speed": 1})
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = AssetStore(str(tmp_path), max_bytes=30)
+    for key in ("a1", "b2", "c3"):
+        store.put(key, b"x" * 10)
+    assert store.get("a1") is not None  # a1 is now the most recent
+
+    store.put("d4", b"x" * 10)
+
+    assert "b2" not in store and not os.path.exists(store.path("b2"))
+    assert all(key in store for key in ("a1", "c3", "d4"))
+    assert store.info()["bytes"] == 30 and store.info()["evictions"] == 1
+
+
+def test_store_survives_restart(tmp_path):
+    AssetStore(str(tmp_path)).put("ab12", b"clip")
+
+    reopened = AssetStore(str(tmp_path))
+
+    with open(reopened.get("ab12"), "rb") as handle:
+        assert handle.read() == b"clip"
+    assert reopened.info()["bytes"] == 4
+
+
+def test_identical_in_flight_renders_are_coalesced(tmp_path):
+    async def scenario():
+        with ThreadPoolExecutor(4) as pool:
+            queue = RenderQueue(AssetStore(str(tmp_path)), {"voiceover": render_slowly}, executor=pool)
+            refs = await asyncio.gather(*(queue.render("voiceover", "Hook", "casual") for _ in range(5)))
+            return queue, refs
+
+    queue, refs = asyncio.run(scenario())
+
+    assert queue.rendered == 1 and queue.coalesced == 4
+    assert len({ref["path"] for ref in refs}) == 1
+    assert [ref["cached"] for ref in refs].count(False) == 1
+
+
+def test_unknown_asset_kind(tmp_path):
+    queue = RenderQueue(AssetStore(str(tmp_path)), {})
+    with pytest.raises(NoRenderer):
+        asyncio.run(queue.render("hologram", "Hook", "casual"))
+
+
+def test_fifth_variant_reuses_every_shared_segment(tmp_path, sample_script):
+    worker = ContentWorker(RENDERERS, AssetStore(str(tmp_path)), render_workers=2)
+
+    async def scenario():
+        return [
+            await worker.edit_video(_variant(sample_script, f"Main point: angle {n}"), [])
+            for n in range(5)
+        ]
+
+    try:
+        edits = asyncio.run(scenario())
+    finally:
+        worker.close()
+
+    # voiceover + b-roll for three segments, a thumbnail and the final cut.
+    assert edits[0]["rendered"] == 8 and edits[0]["reused"] == 0
+    for edit in edits[1:]:
+        # Only the changed segment's clip and cut, plus the new final cut.
+        assert edit["rendered"] == 3 and edit["reused"] == 5
+    assert edits[4]["timeline"][0]["voiceover"] == edits[0]["timeline"][0]["voiceover"]
+    assert edits[4]["video"]["key"] != edits[0]["video"]["key"]
+    with open(edits[0]["video"]["path"], "rb") as handle:
+        assert handle.read().startswith(b"educational|")
+
+
+def test_voiceover_reused_across_platforms_but_broll_is_not(tmp_path, sample_script):
+    worker = ContentWorker(RENDERERS, AssetStore(str(tmp_path)), executor=ThreadPoolExecutor(2))
+
+    async def scenario():
+        youtube = await worker.edit_video(sample_script, [])
+        tiktok = await worker.edit_video({**sample_script, "platform": "tiktok"}, [])
+        return youtube, tiktok
+
+    youtube, tiktok = asyncio.run(scenario())
+
+    assert [e["voiceover"] for e in youtube["timeline"]] == [e["voiceover"] for e in tiktok["timeline"]]
+    assert youtube["timeline"][0]["broll"] != tiktok["timeline"][0]["broll"]
+    assert tiktok["rendered"] == 5 and tiktok["reused"] == 3
+
+
+def test_pinned_assets_are_not_evicted_until_unpinned(tmp_path):
+    store = AssetStore(str(tmp_path), max_bytes=20)
+    store.put("a1", b"x" * 10, pin=True)
+    store.put("b2", b"x" * 10)
+
+    store.put("c3", b"x" * 10)
+
+    assert "a1" in store and "b2" not in store
+    store.unpin("a1")
+    store.put("d4", b"x" * 10)
+    assert "a1" not in store and store.info()["pinned"] == 0
+
+
+def test_final_cut_reads_every_part_even_from_a_tiny_store(tmp_path, sample_script):
+    def render_video(text, style, params):
+        missing = [path for path in params["parts"] if not os.path.exists(path)]
+        assert not missing, f"parts evicted before the final cut: {missing}"
+        return render_bytes(text, style, params)
+
+    renderers = {**RENDERERS, "video": render_video}
+    # Room for about one asset, so every put evicts what the edit rendered before.
+    store = AssetStore(str(tmp_path), max_bytes=64)
+    worker = ContentWorker(renderers, store, executor=ThreadPoolExecutor(2))
+
+    edit = asyncio.run(worker.edit_video(sample_script, []))
+
+    assert edit["rendered"] == 8
+    assert store.info()["pinned"] == 0
+
+
+def test_cancelled_render_does_not_cancel_coalesced_waiters(tmp_path):
+    async def scenario():
+        with ThreadPoolExecutor(4) as pool:
+            queue = RenderQueue(AssetStore(str(tmp_path)), {"voiceover": render_slowly}, executor=pool)
+            first = asyncio.create_task(queue.render("voiceover", "Hook", "casual"))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(queue.render("voiceover", "Hook", "casual"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await waiter
+
+    ref = asyncio.run(scenario())
+
+    with open(ref["path"], "rb") as handle:
+        assert handle.read() == b"casual|Hook|[]"
@@ -0,0 +1,90 @@
+"""Tests for cached, batched gas estimation."""
+
+import asyncio
+
+import pytest
+
+from chimera.agents.workers import EconomicWorker
+from chimera.agents.workers.gas import GAS_UNITS, GasEstimator, LocalFeeOracle
+from chimera.benchmarks import gas_estimation
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_estimate_is_units_times_base_plus_priority_fee():
+    oracle = LocalFeeOracle({"base": 4e-9}, priority_fee=1e-9)
+    worker = EconomicWorker(fee_market=oracle.get_fee_market)
+
+    estimate = asyncio.run(worker.estimate_gas({"asset": "USDC", "amount": 5, "recipient": "0xabc"}))
+
+    assert estimate == pytest.approx(GAS_UNITS["USDC"] * 5e-9)
+
+
+def test_fee_market_is_cached_per_network_for_the_ttl():
+    clock = FakeClock()
+    oracle = LocalFeeOracle(block_time=2.0, step=0.125, clock=clock)
+    estimator = GasEstimator(oracle.get_fee_market, ttl=2.0, clock=clock)
+    transfer = {"asset": "ETH"}
+
+    async def scenario():
+        first = await estimator.estimate(transfer)
+        clock.now = 1.0
+        same_block = await estimator.estimate(transfer)
+        await estimator.estimate({"asset": "SOL"})
+        clock.now = 2.5
+        next_block = await estimator.estimate(transfer)
+        return first, same_block, next_block
+
+    first, same_block, next_block = asyncio.run(scenario())
+
+    assert first == same_block and next_block > first
+    assert oracle.calls == 3  # base twice (one per block), solana once
+
+
+def test_estimate_gas_many_makes_one_lookup_per_network():
+    oracle = LocalFeeOracle(latency_ms=1)
+    worker = EconomicWorker(fee_market=oracle.get_fee_market)
+    payouts = [{"asset": asset} for asset in ("USDC", "ETH", "SOL", "USDC")]
+    payouts.append({"asset": "USDC", "network": "polygon"})
+
+    async def scenario():
+        batch = await worker.estimate_gas_many(payouts)
+        singles = [await worker.estimate_gas(payout) for payout in payouts]
+        return batch, singles
+
+    batch, singles = asyncio.run(scenario())
+
+    assert batch == singles
+    assert oracle.calls == 3  # base, solana, polygon
+
+
+def test_concurrent_estimates_share_one_lookup():
+    oracle = LocalFeeOracle(latency_ms=1)
+    estimator = GasEstimator(oracle.get_fee_market)
+
+    async def scenario():
+        return await asyncio.gather(*(estimator.estimate({"asset": "USDC"}) for _ in range(20)))
+
+    assert len(set(asyncio.run(scenario()))) == 1
+    assert oracle.calls == 1
+
+
+def test_gas_limit_overrides_the_asset_default():
+    oracle = LocalFeeOracle({"base": 1e-9}, priority_fee=0.0)
+    estimator = GasEstimator(oracle.get_fee_market)
+
+    assert asyncio.run(estimator.estimate({"asset": "USDC", "gasLimit": 90_000})) == pytest.approx(9e-5)
+
+
+def test_benchmark_amortises_oracle_calls():
+    report = gas_estimation.run(payouts=50, latency_ms=0.0)["results"]
+
+    assert report["per_call"]["oracle_calls"] == 50
+    assert report["estimate_gas_many"]["oracle_calls"] == 2
+    assert report["estimate_gas_many"]["total_fees"] == report["per_call"]["total_fees"]
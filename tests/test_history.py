@@ -0,0 +1,189 @@
+"""Tests for the locally indexed transaction history."""
+
+import asyncio
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from chimera.integrations import CoinbaseAgentKit
+from chimera.integrations.history import TransactionStore
+
+DAY = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+
+
+class FakeHistoryAPI:
+    """Paginated history, newest first, counting the pages served."""
+
+    def __init__(self, count: int, page_size: int = 10) -> None:
+        self.transactions = []
+        self.page_size = page_size
+        self.pages_served = 0
+        self.fail_at_page: int | None = None
+        for index in range(count):
+            self.add(index)
+
+    def add(self, index: int, status: str = "confirmed") -> None:
+        self.transactions.insert(
+            0,
+            {
+                "hash": f"0x{index:064x}",
+                "timestamp": DAY + index * 600,
+                "recipient": f"creator-{index % 3}",
+                "asset": "USDC",
+                "amount": "0.1",
+                "type": "payment",
+                "status": status,
+            },
+        )
+
+    async def pages(self, cursor):
+        # Keyset cursors, like the real API: "older than this hash", stable as new transactions arrive.
+        remaining = self.transactions
+        if cursor is not None:
+            remaining = remaining[[transaction["hash"] for transaction in remaining].index(cursor) + 1 :]
+        while True:
+            if self.fail_at_page is not None and self.pages_served >= self.fail_at_page:
+                raise ConnectionError("history unavailable")
+            self.pages_served += 1
+            await asyncio.sleep(0)
+            chunk, remaining = remaining[: self.page_size], remaining[self.page_size :]
+            yield {"transactions": chunk, "next": chunk[-1]["hash"] if remaining else None}
+            if not remaining:
+                return
+
+
+def test_backfill_then_only_new_pages():
+    api = FakeHistoryAPI(95)
+    store = TransactionStore()
+
+    assert asyncio.run(store.sync(api.pages)) == 95
+    assert api.pages_served == 10
+
+    api.pages_served = 0
+    for index in range(95, 98):
+        api.add(index)
+    assert asyncio.run(store.sync(api.pages)) == 3
+    assert api.pages_served == 1 and store.count() == 98
+
+
+def test_interrupted_backfill_resumes_from_its_cursor():
+    api = FakeHistoryAPI(50)
+    store = TransactionStore()
+    api.fail_at_page = 3
+    with pytest.raises(ConnectionError):
+        asyncio.run(store.sync(api.pages))
+    assert store.count() == 30
+
+    api.fail_at_page, api.pages_served = None, 0
+    api.add(50)
+    assert asyncio.run(store.sync(api.pages)) == 21
+    # One page to catch up with the head, then the two pages the backfill was missing.
+    assert api.pages_served == 3 and store.count() == 51
+
+
+def test_interrupted_incremental_sync_leaves_no_gap():
+    api = FakeHistoryAPI(4, page_size=3)
+    store = TransactionStore()
+    asyncio.run(store.sync(api.pages))
+    for index in range(4, 10):
+        api.add(index)
+
+    api.pages_served, api.fail_at_page = 0, 1
+    with pytest.raises(ConnectionError):
+        asyncio.run(store.sync(api.pages))
+    assert store.count() == 7
+
+    api.fail_at_page = None
+    assert asyncio.run(store.sync(api.pages)) == 3
+    assert store.count() == 10
+
+
+def test_pending_transactions_past_the_first_page_get_their_final_status():
+    api = FakeHistoryAPI(30)
+    api.transactions[15]["status"] = "pending"
+    store = TransactionStore()
+    asyncio.run(store.sync(api.pages))
+    assert store.daily_total("USDC", date(2026, 3, 1)) == Decimal("3.0")
+
+    api.transactions[15]["status"] = "failed"
+    api.add(30)
+    api.pages_served = 0
+    asyncio.run(store.sync(api.pages))
+
+    # Walked down to the page holding the pending transaction, and no further.
+    assert api.pages_served == 2
+    assert store.get(api.transactions[16]["hash"])["status"] == "failed"
+    assert store.daily_total("USDC", date(2026, 3, 1)) == Decimal("3.0")
+
+    api.pages_served = 0
+    asyncio.run(store.sync(api.pages))
+    assert api.pages_served == 1
+
+
+def test_status_changes_update_in_place():
+    api = FakeHistoryAPI(3)
+    api.transactions[0]["status"] = "pending"
+    store = TransactionStore()
+    asyncio.run(store.sync(api.pages))
+
+    api.transactions[0]["status"] = "confirmed"
+    assert store.append(api.transactions) == 0
+
+    assert store.count() == 3
+    assert store.get(api.transactions[0]["hash"])["status"] == "confirmed"
+
+
+def test_daily_totals_and_lookups_are_local_and_exact():
+    api = FakeHistoryAPI(30)
+    api.transactions[0]["status"] = "failed"
+    store = TransactionStore()
+    asyncio.run(store.sync(api.pages))
+
+    assert store.daily_total("USDC", date(2026, 3, 1)) == Decimal("2.9")
+    assert store.daily_total("USDC", date(2026, 3, 1), recipient="creator-0") == Decimal("1.0")
+    assert store.daily_total("USDC", date(2026, 3, 2)) == 0
+    assert store.get(f"0x{7:064x}")["recipient"] == "creator-1"
+    assert [t["hash"] for t in store.recent(2, recipient="creator-2")] == [f"0x{29:064x}", f"0x{26:064x}"]
+
+    plan = store._db.execute(
+        "EXPLAIN QUERY PLAN SELECT amount FROM transactions WHERE asset = ? AND timestamp >= ? AND timestamp < ?",
+        ("USDC", 0, 1),
+    ).fetchall()
+    assert "idx_transactions_asset" in str(plan)
+
+
+def test_file_store_uses_wal_and_survives_reopening(tmp_path):
+    api = FakeHistoryAPI(25)
+    path = str(tmp_path / "history.db")
+    store = TransactionStore(path)
+    asyncio.run(store.sync(api.pages))
+    assert store._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.close()
+
+    reopened = TransactionStore(path)
+    api.pages_served = 0
+    assert asyncio.run(reopened.sync(api.pages)) == 0
+    assert api.pages_served == 1 and reopened.count() == 25
+
+
+def test_agent_kit_iterates_pages_and_reads_history_locally():
+    api = FakeHistoryAPI(23, page_size=5)
+
+    class Kit(CoinbaseAgentKit):
+        async def get_transaction_history_page(self, cursor=None, limit=100):
+            async for page in api.pages(cursor):
+                return page
+
+    kit = Kit("key", "secret")
+
+    async def scenario():
+        streamed = [transaction["hash"] async for transaction in kit.iter_transaction_history()]
+        latest = await kit.get_transaction_history(3)
+        return streamed, latest
+
+    streamed, latest = asyncio.run(scenario())
+
+    assert len(streamed) == 23 and streamed[0] == api.transactions[0]["hash"]
+    assert [transaction["hash"] for transaction in latest] == streamed[:3]
+    assert kit.history.count() == 23
@@ -0,0 +1,446 @@
+"""Tests for MCP routing and transport."""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from chimera.core import mcp
+from chimera.core.mcp import (
+    METHOD_NOT_FOUND,
+    NO_ROUTE,
+    SUBSCRIBE_METHOD,
+    MCPBusyError,
+    MCPClient,
+    MCPError,
+    MCPServer,
+    make_request,
+)
+from chimera.core.wire import (
+    CODECS,
+    DEFAULT_CODEC,
+    available_codecs,
+    decode_frame,
+    encode_frame,
+    negotiate,
+    read_frame,
+    write_frame,
+)
+
+
+def _message(sender="trend-worker-001", recipient="content-worker-001", message_type="task_request", **payload):
+    return {
+        "mcp_version": "1.0",
+        "message_type": message_type,
+        "sender": sender,
+        "recipient": recipient,
+        "payload": payload,
+    }
+
+
+async def _exchange(reader, writer, body):
+    write_frame(writer, DEFAULT_CODEC, body)
+    await writer.drain()
+    return decode_frame(DEFAULT_CODEC, await read_frame(reader))
+
+
+class TestDispatchTable:
+    """Routing by recipient and message type."""
+
+    def test_exact_route_beats_wildcards(self, mock_mcp_message):
+        server = MCPServer(port=0)
+
+        async def exact(message):
+            return {"via": "exact"}
+
+        async def by_type(message):
+            return {"via": "type"}
+
+        server.register_handler(by_type, message_type="task_request")
+        server.register_handler(exact, message_type="task_request", recipient="target_agent")
+
+        assert asyncio.run(server.route_message(mock_mcp_message)) == {"via": "exact"}
+        other = dict(mock_mcp_message, recipient="judge-001")
+        assert asyncio.run(server.route_message(other)) == {"via": "type"}
+
+    def test_unroutable_message_raises(self, mock_mcp_message):
+        server = MCPServer(port=0)
+
+        with pytest.raises(MCPError) as excinfo:
+            asyncio.run(server.route_message(mock_mcp_message))
+
+        assert excinfo.value.code == NO_ROUTE
+
+    def test_memoised_routes_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(mcp, "MAX_DISPATCH_ENTRIES", 3)
+        server = MCPServer(port=0)
+
+        async def anyone(message):
+            return {}
+
+        server.register_handler(anyone)
+
+        async def scenario():
+            for seq in range(10):
+                await server.route_message(_message(recipient=f"r{seq}"))
+            await server.route_message(_message(recipient="r7"))
+            await server.route_message(_message(recipient="r10"))
+
+        asyncio.run(scenario())
+
+        assert [recipient for recipient, _ in server._dispatch] == ["r9", "r7", "r10"]
+
+    def test_same_sender_messages_keep_order(self):
+        server = MCPServer(port=0)
+        seen = []
+
+        async def slow_then_fast(message):
+            await asyncio.sleep(message["payload"]["delay"])
+            seen.append((message["sender"], message["payload"]["seq"]))
+            return {}
+
+        server.register_handler(slow_then_fast)
+
+        async def scenario():
+            await asyncio.gather(
+                server.submit(_message(sender="a", seq=1, delay=0.02)),
+                server.submit(_message(sender="a", seq=2, delay=0)),
+                server.submit(_message(sender="b", seq=1, delay=0)),
+            )
+
+        asyncio.run(scenario())
+
+        assert seen == [("b", 1), ("a", 1), ("a", 2)]
+
+
+class TestServerTransport:
+    """JSON-RPC over TCP and Unix sockets."""
+
+    def test_batch_over_tcp(self):
+        async def scenario():
+            server = MCPServer(port=0)
+
+            async def echo(message):
+                return {"seq": message["payload"]["seq"]}
+
+            server.register_handler(echo, message_type="task_request")
+            await server.start()
+            try:
+                host, port = server.addresses[0][:2]
+                reader, writer = await asyncio.open_connection(host, port)
+                batch = [
+                    make_request(_message(seq=1), 1),
+                    make_request(_message(seq=2)),  # notification: no response
+                    {"jsonrpc": "2.0", "id": 3, "method": "mcp.unknown", "params": {}},
+                ]
+                response = await _exchange(reader, writer, batch)
+                writer.close()
+            finally:
+                await server.stop()
+            return response
+
+        response = asyncio.run(scenario())
+
+        assert response[0] == {"jsonrpc": "2.0", "id": 1, "result": {"seq": 1}}
+        assert response[1]["id"] == 3
+        assert response[1]["error"]["code"] == METHOD_NOT_FOUND
+        assert len(response) == 2
+
+    def test_single_request_over_unix_socket(self):
+        async def scenario(path):
+            server = MCPServer(port=0, unix_path=path)
+
+            async def echo(message):
+                return {"ok": True}
+
+            server.register_handler(echo)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                response = await _exchange(reader, writer, make_request(_message(), "req-1"))
+                writer.close()
+            finally:
+                await server.stop()
+            return response
+
+        with tempfile.TemporaryDirectory() as tmp:
+            response = asyncio.run(scenario(os.path.join(tmp, "mcp.sock")))
+
+        assert response == {"jsonrpc": "2.0", "id": "req-1", "result": {"ok": True}}
+
+
+class TestClient:
+    """Pooled, pipelined MCPClient against a live server."""
+
+    @staticmethod
+    async def _serve(handler, **kwargs):
+        server = MCPServer(port=0)
+        server.register_handler(handler, **kwargs)
+        await server.start()
+        host, port = server.addresses[0][:2]
+        return server, f"tcp://{host}:{port}"
+
+    def test_pipelines_requests_on_one_connection(self):
+        async def scenario():
+            async def echo(message):
+                await asyncio.sleep(0.01)
+                return {"seq": message["payload"]["seq"]}
+
+            server, url = await self._serve(echo)
+            client = MCPClient(url, pool_size=1)
+            try:
+                results = await asyncio.gather(
+                    *(client.send_message(_message(sender=f"s{i}", seq=i)) for i in range(20))
+                )
+                connections = len(client._pool)
+            finally:
+                await client.close()
+                await server.stop()
+            return results, connections
+
+        results, connections = asyncio.run(scenario())
+
+        assert results == [{"seq": i} for i in range(20)]
+        assert connections == 1
+
+    def test_timeout_drops_pending_request(self):
+        async def scenario():
+            async def stall(message):
+                await asyncio.sleep(1)
+                return {}
+
+            server, url = await self._serve(stall)
+            client = MCPClient(url)
+            try:
+                with pytest.raises(TimeoutError):
+                    await client.send_message(_message(), timeout=0.05)
+                pending = sum(len(conn.pending) for conn in client._pool)
+            finally:
+                await client.close()
+                await server.stop()
+            return pending
+
+        assert asyncio.run(scenario()) == 0
+
+    def test_send_many_returns_errors_in_place(self):
+        async def scenario():
+            async def echo(message):
+                return {"seq": message["payload"]["seq"]}
+
+            server, url = await self._serve(echo, recipient="content-worker-001")
+            client = MCPClient(url)
+            try:
+                return await client.send_many(
+                    [_message(seq=1), _message(recipient="nobody", seq=2), _message(seq=3)]
+                )
+            finally:
+                await client.close()
+                await server.stop()
+
+        first, failed, last = asyncio.run(scenario())
+
+        assert first == {"seq": 1}
+        assert isinstance(failed, MCPError) and failed.code == NO_ROUTE
+        assert last == {"seq": 3}
+
+    def test_receive_messages_streams_subscription(self):
+        async def scenario():
+            server = MCPServer(port=0)
+            await server.start()
+            host, port = server.addresses[0][:2]
+            url = f"tcp://{host}:{port}"
+            sender = MCPClient(url)
+            receiver = MCPClient(url, agent_id="judge-001")
+            received = []
+            try:
+                stream = receiver.receive_messages()
+                first = asyncio.ensure_future(stream.__anext__())
+                while "judge-001" not in {r for r, _ in server._handlers}:
+                    await asyncio.sleep(0.005)
+                await sender.send_many([_message(recipient="judge-001", seq=i) for i in range(3)])
+                received.append(await first)
+                received.append(await stream.__anext__())
+                received.append(await stream.__anext__())
+                await stream.aclose()
+            finally:
+                await sender.close()
+                await server.stop()
+            return [message["payload"]["seq"] for message in received]
+
+        assert asyncio.run(scenario()) == [0, 1, 2]
+
+    def test_resubscribed_agent_survives_the_old_connection_closing(self):
+        async def scenario():
+            server = MCPServer(port=0)
+            await server.start()
+            host, port = server.addresses[0][:2]
+            subscribe = {"jsonrpc": "2.0", "id": 1, "method": SUBSCRIBE_METHOD, "params": {"agent_id": "judge-001"}}
+            try:
+                old = await asyncio.open_connection(host, port)
+                await _exchange(*old, subscribe)
+                new = await asyncio.open_connection(host, port)
+                await _exchange(*new, subscribe)
+                old[1].close()
+                await old[1].wait_closed()
+                while len(server._connections) > 1:
+                    await asyncio.sleep(0.005)
+                result = await server.route_message(_message(recipient="judge-001", seq=1))
+                pushed = decode_frame(DEFAULT_CODEC, await read_frame(new[0]))
+                new[1].close()
+            finally:
+                await server.stop()
+            return result, pushed
+
+        result, pushed = asyncio.run(scenario())
+
+        assert result == {"status": "delivered"}
+        assert pushed["params"]["payload"] == {"seq": 1}
+
+    def test_rejects_unknown_url_scheme(self):
+        with pytest.raises(ValueError):
+            MCPClient("http://localhost:8080")
+
+
+class TestWireCodecs:
+    """Codec negotiation and attachment framing."""
+
+    def test_negotiation_prefers_callers_order(self):
+        assert negotiate(["orjson", "json"], ["json", "orjson"]).name == "orjson"
+        assert negotiate(["cbor"], ["json"]) is DEFAULT_CODEC
+        assert available_codecs(["json"]) == ["json"]
+
+    @pytest.mark.parametrize("codec_name", sorted(CODECS))
+    def test_binary_artifacts_round_trip_as_memoryviews(self, codec_name, mock_mcp_message):
+        codec = CODECS[codec_name]
+        blob = bytes(range(256)) * 1024
+        message = dict(mock_mcp_message)
+        message["payload"] = dict(
+            message["payload"], artifacts=[{"name": "clip.mp4", "data": memoryview(blob)}]
+        )
+
+        buffers = encode_frame(codec, make_request(message, 1))
+        frame = b"".join(bytes(buffer) for buffer in buffers)[4:]
+        decoded = decode_frame(codec, frame)
+
+        artifact = decoded["params"]["payload"]["artifacts"][0]
+        assert isinstance(artifact["data"], memoryview)
+        assert artifact["data"] == blob
+        assert buffers[-1].obj is blob  # written from the caller's buffer, not copied
+        assert message["payload"]["artifacts"][0]["data"].obj is blob  # input left intact
+
+    @pytest.mark.parametrize("codec_name", sorted(CODECS))
+    def test_client_and_server_agree_on_codec(self, codec_name):
+        async def scenario():
+            server = MCPServer(port=0, codecs=[codec_name])
+
+            async def echo(message):
+                return {"seq": message["payload"]["seq"]}
+
+            server.register_handler(echo)
+            await server.start()
+            host, port = server.addresses[0][:2]
+            client = MCPClient(f"tcp://{host}:{port}")
+            try:
+                result = await client.send_message(_message(seq=7))
+                negotiated = client._pool[0].codec.name
+            finally:
+                await client.close()
+                await server.stop()
+            return result, negotiated
+
+        result, negotiated = asyncio.run(scenario())
+
+        assert result == {"seq": 7}
+        assert negotiated == codec_name
+
+
+class TestFlowControl:
+    """Bounded per-recipient inboxes with credits."""
+
+    @staticmethod
+    async def _slow(message):
+        await asyncio.sleep(0.05)
+        return {"seq": message["payload"]["seq"]}
+
+    def test_saturated_recipient_returns_retry_after(self):
+        server = MCPServer(port=0, inbox_capacity=2, inbox_concurrency=1, credit_timeout=0.01)
+        server.register_handler(self._slow)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(server.route_message(_message(sender=f"s{i}", seq=i)) for i in range(6)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(scenario())
+
+        assert results[:2] == [{"seq": 0}, {"seq": 1}]
+        assert all(isinstance(r, MCPBusyError) and r.retry_after > 0 for r in results[2:])
+        inbox = server.metrics()["inboxes"]["content-worker-001"]
+        assert inbox["dropped"] == 4
+        assert inbox["accepted"] == 2
+        assert inbox["max_depth"] == 1
+        assert inbox["depth"] == inbox["in_flight"] == 0
+
+    def test_idle_inboxes_of_past_recipients_are_dropped(self):
+        server = MCPServer(port=0, max_inboxes=2)
+
+        async def scenario():
+            release = asyncio.Event()
+
+            async def handler(message):
+                if message["recipient"] == "busy":
+                    await release.wait()
+                return {}
+
+            server.register_handler(handler)
+            busy = asyncio.ensure_future(server.route_message(_message(recipient="busy")))
+            await asyncio.sleep(0)
+            for seq in range(5):
+                await server.route_message(_message(recipient=f"r{seq}"))
+            inboxes = list(server.metrics()["inboxes"])
+            release.set()
+            await busy
+            await server.route_message(_message(recipient="r5"))
+            return inboxes
+
+        during = asyncio.run(scenario())
+
+        # The busy inbox outlives newer idle ones until its message is done.
+        assert during == ["busy", "r4"]
+        assert list(server.metrics()["inboxes"]) == ["r4", "r5"]
+
+    def test_blocked_senders_proceed_as_credits_return(self):
+        server = MCPServer(port=0, inbox_capacity=1, inbox_concurrency=1, credit_timeout=1.0)
+        server.register_handler(self._slow)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(server.route_message(_message(sender=f"s{i}", seq=i)) for i in range(3))
+            )
+
+        results = asyncio.run(scenario())
+
+        assert results == [{"seq": i} for i in range(3)]
+        inbox = server.metrics()["inboxes"]["content-worker-001"]
+        assert inbox["dropped"] == 0
+        assert inbox["wait_ms_max"] >= 40
+
+    def test_client_receives_busy_error(self):
+        async def scenario():
+            server = MCPServer(port=0, inbox_capacity=1, inbox_concurrency=1, credit_timeout=0)
+            server.register_handler(self._slow)
+            await server.start()
+            host, port = server.addresses[0][:2]
+            client = MCPClient(f"tcp://{host}:{port}")
+            try:
+                return await client.send_many([_message(sender=f"s{i}", seq=i) for i in range(3)])
+            finally:
+                await client.close()
+                await server.stop()
+
+        first, *rest = asyncio.run(scenario())
+
+        assert first == {"seq": 0}
+        assert all(isinstance(error, MCPBusyError) for error in rest)
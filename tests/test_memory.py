@@ -0,0 +1,77 @@
+"""Tests for sharded vector search in MemoryManager."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from chimera.core.memory import MemoryManager
+
+
+@pytest.fixture
+def manager():
+    manager = MemoryManager(provider="local", shard_size=8, max_workers=4)
+    yield manager
+    manager.close()
+
+
+def _brute_force(corpus, query, limit):
+    normalised = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    scores = normalised @ (query / np.linalg.norm(query))
+    return list(np.argsort(scores)[::-1][:limit])
+
+
+class TestShardedSearch:
+    """Search results must match a single-shard brute-force scan."""
+
+    def test_merged_top_k_matches_brute_force(self, manager):
+        rng = np.random.default_rng(1)
+        corpus = rng.standard_normal((50, 16)).astype(np.float32)
+        query = rng.standard_normal(16).astype(np.float32)
+
+        async def scenario():
+            await manager.store_embeddings(corpus, [{"row": i} for i in range(50)], "content")
+            return await manager.search_similar(query, "content", 5)
+
+        hits = asyncio.run(scenario())
+
+        assert len(manager._namespaces["content"]) == 7
+        assert [hit["metadata"]["row"] for hit in hits] == _brute_force(corpus, query, 5)
+        assert [hit["score"] for hit in hits] == sorted((h["score"] for h in hits), reverse=True)
+
+    def test_cross_namespace_search(self, manager):
+        async def scenario():
+            await manager.store_embedding([1.0, 0.0], {"kind": "content"}, "content")
+            await manager.store_embedding([0.9, 0.1], {"kind": "agent"}, "agent")
+            await manager.store_embedding([0.0, 1.0], {"kind": "far"}, "agent")
+            return await manager.search_namespaces([1.0, 0.0], ["content", "agent"], 2)
+
+        hits = asyncio.run(scenario())
+
+        assert [(hit["namespace"], hit["metadata"]["kind"]) for hit in hits] == [
+            ("content", "content"),
+            ("agent", "agent"),
+        ]
+
+    def test_deleted_memories_are_not_returned(self, manager):
+        async def scenario():
+            keep = await manager.store_embedding([1.0, 0.0], {"name": "keep"}, "content")
+            drop = await manager.store_embedding([1.0, 0.01], {"name": "drop"}, "content")
+            assert await manager.delete_memory(drop) is True
+            assert await manager.delete_memory(drop) is False
+            return keep, await manager.search_similar([1.0, 0.0], "content", 5)
+
+        keep, hits = asyncio.run(scenario())
+
+        assert [hit["id"] for hit in hits] == [keep]
+
+    def test_rejects_mismatched_dimension(self, manager):
+        async def scenario():
+            await manager.store_embedding([1.0, 0.0], {}, "content")
+            await manager.store_embedding([1.0, 0.0, 0.0], {}, "content")
+
+        with pytest.raises(ValueError):
+            asyncio.run(scenario())
+
+    def test_unknown_namespace_returns_empty(self, manager):
+        assert asyncio.run(manager.search_similar([1.0], "missing", 3)) == []
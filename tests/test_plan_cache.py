@@ -0,0 +1,121 @@
+"""Tests for goal templating and memoised plan decomposition."""
+
+import asyncio
+
+from chimera.agents.plan_cache import PlanTemplateCache, instantiate, normalise_goal
+from chimera.agents.planner import PlannerAgent, pattern_decomposer
+
+
+def test_goals_of_one_shape_share_a_template():
+    first = normalise_goal("Respond to trend 'AI art' on TikTok")
+    second = normalise_goal('respond to  trend "lo-fi beats" on YouTube')
+
+    assert first[0] == second[0] == "respond to trend {subject_0} on {platform_0}"
+    assert first[1] == {"subject_0": "AI art", "platform_0": "tiktok"}
+    assert second[1] == {"subject_0": "lo-fi beats", "platform_0": "youtube"}
+
+
+def test_numbers_hashtags_and_braces():
+    template, bindings = normalise_goal("Run campaign #summer with 3 posts on twitter {now}")
+
+    assert template == "run campaign {hashtag_0} with {number_0} posts on {platform_0} (now)"
+    assert bindings == {"hashtag_0": "#summer", "number_0": "3", "platform_0": "twitter"}
+    assert instantiate({"a": ["{hashtag_0}x", "{missing_0}"]}, bindings) == {"a": ["#summerx", "{missing_0}"]}
+
+
+def test_repeat_shapes_decompose_once():
+    calls = []
+
+    async def counting(template):
+        calls.append(template)
+        return await pattern_decomposer(template)
+
+    planner = PlannerAgent(decomposer=counting)
+
+    async def scenario():
+        first = await planner.decompose_goal("Run campaign 'spring drop' on instagram")
+        second = await planner.decompose_goal("Run campaign 'fall drop' on tiktok")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["tasks"][1]["parameters"] == {"topic": "fall drop", "platform": "tiktok"}
+    assert first["tasks"][1]["parameters"]["topic"] == "spring drop"
+
+
+def test_concurrent_misses_share_one_decomposition():
+    calls = []
+
+    async def slow(template):
+        calls.append(template)
+        await asyncio.sleep(0.01)
+        return await pattern_decomposer(template)
+
+    planner = PlannerAgent(decomposer=slow)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(planner.decompose_goal(f"Respond to trend '{i}' on youtube") for i in range(5))
+        )
+
+    plans = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert [plan["tasks"][0]["parameters"]["topic"] for plan in plans] == ["0", "1", "2", "3", "4"]
+
+
+def test_cancelled_caller_does_not_cancel_others_waiting_on_its_decomposition():
+    calls = []
+
+    async def slow(template):
+        calls.append(template)
+        await asyncio.sleep(0.02)
+        return await pattern_decomposer(template)
+
+    planner = PlannerAgent(decomposer=slow)
+
+    async def scenario():
+        first = asyncio.create_task(planner.decompose_goal("Respond to trend 'a' on youtube"))
+        await asyncio.sleep(0)
+        others = [
+            asyncio.create_task(planner.decompose_goal(f"Respond to trend '{i}' on youtube")) for i in "bc"
+        ]
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await asyncio.gather(*others)
+
+    plans = asyncio.run(scenario())
+
+    # One of the waiters took the decomposition over; both got their plan.
+    assert len(calls) == 2
+    assert [plan["tasks"][0]["parameters"]["topic"] for plan in plans] == ["b", "c"]
+
+
+def test_lru_and_ttl_eviction(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("chimera.agents.plan_cache.time.time", lambda: clock[0])
+    cache = PlanTemplateCache(capacity=2, ttl=10)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == [1]
+    cache.put("c", [3])
+
+    assert cache.get("b") is None
+    clock[0] += 11
+    assert cache.get("a") is None and cache.get("c") is None
+
+
+def test_templates_survive_restart(tmp_path):
+    path = str(tmp_path / "plans.sqlite")
+    cache = PlanTemplateCache(path=path)
+    cache.put("respond to trend {subject_0}", [{"id": "detect"}])
+    cache.close()
+
+    reopened = PlanTemplateCache(path=path)
+    try:
+        assert reopened.get("respond to trend {subject_0}") == [{"id": "detect"}]
+        assert reopened.info()["hits"] == 1
+    finally:
+        reopened.close()
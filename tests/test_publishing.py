@@ -0,0 +1,181 @@
+"""Tests for the platform limiter and the publish retry scheduler."""
+
+import asyncio
+from email.utils import formatdate
+
+import pytest
+
+from chimera.agents.workers.publishing import PlatformLimiter, PublishEscalated, PublishScheduler
+from chimera.agents.workers.ratelimit import RateLimited, parse_rate_limit_headers
+from chimera.benchmarks import publish_burst
+
+FAST = {"youtube": (60_000.0, 100.0), "tiktok": (60_000.0, 100.0)}
+
+
+def test_rate_limit_headers_accept_seconds_epochs_and_dates():
+    now = 1_700_000_000.0
+
+    parsed = parse_rate_limit_headers(
+        {"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "7", "X-RateLimit-Reset": str(now + 30)}, now
+    )
+    assert parsed == {"limit": 100.0, "remaining": 7.0, "reset_after": 30.0}
+    assert parse_rate_limit_headers({"Retry-After": "12"}, now) == {"retry_after": 12.0}
+    dated = parse_rate_limit_headers({"retry-after": formatdate(now + 90, usegmt=True)}, now)
+    assert dated["retry_after"] == pytest.approx(90.0)
+
+
+def test_limiter_learns_from_remaining_and_reset():
+    limiter = PlatformLimiter(FAST)
+    assert limiter.delay("youtube", "channel-a") == 0
+
+    limiter.observe("youtube", "channel-a", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"})
+
+    assert limiter.delay("youtube", "channel-a") == pytest.approx(5.0, abs=0.05)
+    assert limiter.delay("youtube", "channel-b") == 0
+
+
+def _flaky(failures: int):
+    attempts = []
+
+    async def publish(job):
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) <= failures:
+            raise ConnectionError("platform unavailable")
+        return job["id"]
+
+    return publish, attempts
+
+
+def test_failed_publish_follows_the_retry_table():
+    publish, attempts = _flaky(2)
+
+    async def scenario():
+        scheduler = PublishScheduler(publish, PlatformLimiter(FAST), delays=(0.0, 0.05, 0.15))
+        result = await scheduler.publish({"platform": "youtube", "id": "v1"})
+        await scheduler.close()
+        return result, scheduler.stats
+
+    result, stats = asyncio.run(scenario())
+
+    assert result == "v1" and stats["retried"] == 2
+    assert attempts[1] - attempts[0] >= 0.05 and attempts[2] - attempts[1] >= 0.15
+
+
+def test_escalates_after_the_final_attempt():
+    publish, attempts = _flaky(10)
+    escalated = []
+
+    async def on_escalate(job, error):
+        escalated.append((job["id"], type(error)))
+
+    async def scenario():
+        scheduler = PublishScheduler(publish, PlatformLimiter(FAST), delays=(0.0, 0.01, 0.01), on_escalate=on_escalate)
+        try:
+            with pytest.raises(PublishEscalated) as info:
+                await scheduler.publish({"platform": "tiktok", "id": "v2"})
+        finally:
+            await scheduler.close()
+        return info.value
+
+    error = asyncio.run(scenario())
+
+    assert len(attempts) == 3 and error.attempts == 3
+    assert escalated == [("v2", ConnectionError)]
+
+
+def test_fatal_errors_are_not_retried():
+    calls = []
+
+    async def publish(job):
+        calls.append(job)
+        raise PermissionError("content changed")
+
+    async def scenario():
+        scheduler = PublishScheduler(publish, PlatformLimiter(FAST), fatal=(PermissionError,))
+        try:
+            await scheduler.publish({"platform": "youtube"})
+        finally:
+            await scheduler.close()
+
+    with pytest.raises(PermissionError):
+        asyncio.run(scenario())
+    assert len(calls) == 1
+
+
+def test_rate_limit_holds_back_only_the_rejected_credential():
+    calls = []
+
+    async def publish(job):
+        now = asyncio.get_running_loop().time()
+        calls.append((job["credential"], now))
+        if job["credential"] == "a" and len([c for c, _ in calls if c == "a"]) == 1:
+            raise RateLimited(headers={"Retry-After": "0.2"})
+        return job["id"]
+
+    async def scenario():
+        scheduler = PublishScheduler(publish, PlatformLimiter(FAST))
+        start = asyncio.get_running_loop().time()
+        jobs = [{"platform": "youtube", "credential": credential, "id": i} for i, credential in enumerate("aabb")]
+        results = await asyncio.gather(*(scheduler.submit(job) for job in jobs))
+        await scheduler.close()
+        return start, results, scheduler.stats
+
+    start, results, stats = asyncio.run(scenario())
+
+    assert results == [0, 1, 2, 3] and stats["rate_limited"] == 1
+    assert all(at - start < 0.1 for credential, at in calls if credential == "b")
+    # The second "a" publish was already in flight; the rejected one waited out Retry-After.
+    assert max(at for credential, at in calls if credential == "a") - start >= 0.2
+
+
+def test_publish_refused_by_a_busy_bucket_waits_in_its_lane():
+    limiter = PlatformLimiter(FAST)
+
+    async def publish(job):
+        return job["id"]
+
+    async def scenario():
+        platform, credential = limiter.buckets("youtube", "a")
+        scheduler = PublishScheduler(publish, limiter)
+        # A caller waiting in acquire() holds the credential's bucket.
+        async with credential._lock:
+            refused = limiter.try_acquire("youtube", "a")
+            tokens = platform.tokens
+            pending = scheduler.submit({"platform": "youtube", "credential": "a", "id": 7})
+            await asyncio.sleep(0.05)
+            during = pending.done()
+        result = await asyncio.wait_for(pending, 1.0)
+        await scheduler.close()
+        return refused, tokens, during, result
+
+    refused, tokens, during, result = asyncio.run(scenario())
+
+    assert refused is False and tokens == pytest.approx(100.0)
+    assert during is False and result == 7
+
+
+def test_backoffs_wait_in_the_queue_not_in_coroutines():
+    publish, _ = _flaky(50)
+
+    async def scenario():
+        scheduler = PublishScheduler(publish, PlatformLimiter(FAST), delays=(0.0, 0.2, 0.2))
+        futures = [scheduler.submit({"platform": "youtube", "id": i}) for i in range(50)]
+        await asyncio.sleep(0.1)
+        waiting = scheduler.queued(), len(asyncio.all_tasks())
+        await asyncio.gather(*futures)
+        await scheduler.close()
+        return waiting
+
+    queued, tasks = asyncio.run(scenario())
+
+    assert queued == 50
+    assert tasks == 2  # this coroutine and the dispatcher
+
+
+@pytest.mark.slow
+def test_burst_benchmark_stays_under_the_cap():
+    report = publish_burst.run(publishes=200, cap=1000.0, latency_ms=1.0)["results"]
+
+    assert report["scheduled"]["rejected_429"] == 0
+    assert report["naive"]["rejected_429"] > 0
+    assert report["scheduled"]["cap_utilisation"] > 0.5
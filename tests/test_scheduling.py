@@ -0,0 +1,301 @@
+"""Tests for DAG critical-path scheduling and dispatch."""
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from chimera.agents.scheduling import (
+    CancellationScope,
+    PlanCycleError,
+    PlanError,
+    TaskGraph,
+    current_scope,
+    execute,
+    list_schedule,
+)
+from chimera.agents.workers import ContentWorker
+from chimera.agents.workers.dispatch import WorkStealingDispatcher
+
+
+def _diamond():
+    return [
+        {"id": "a", "agent": "w", "duration": 1},
+        {"id": "b", "agent": "w", "duration": 5, "depends_on": ["a"]},
+        {"id": "c", "agent": "w", "duration": 2, "depends_on": ["a"]},
+        {"id": "d", "agent": "w", "duration": 1, "depends_on": ["b", "c"]},
+    ]
+
+
+def _random_plan(size, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"t{i}",
+            "agent": f"agent-{i % 6}",
+            "duration": rng.randint(1, 10),
+            "priority": rng.choice(["low", "medium", "high"]),
+            "depends_on": [f"t{j}" for j in rng.sample(range(max(0, i - 50), i), min(i, 3))],
+        }
+        for i in range(size)
+    ]
+
+
+class TestTaskGraph:
+    def test_critical_path_and_slack(self):
+        graph = TaskGraph(_diamond())
+        timeline, makespan = list_schedule(graph)
+        slack = {entry["id"]: entry["slack"] for entry in timeline}
+
+        assert graph.critical_path() == ["a", "b", "d"]
+        assert graph.critical_length == makespan == 7
+        assert slack == {"a": 0, "b": 0, "c": 3, "d": 0}
+
+    def test_cycle_is_reported_with_its_path(self):
+        tasks = _diamond() + [{"id": "e", "depends_on": ["d"]}]
+        tasks[0]["depends_on"] = ["e"]
+
+        with pytest.raises(PlanCycleError) as excinfo:
+            TaskGraph(tasks)
+
+        cycle = excinfo.value.cycle
+        assert cycle[0] == cycle[-1]
+        assert set(cycle) <= {"a", "b", "c", "d", "e"} and {"a", "d", "e"} <= set(cycle)
+        assert "dependency cycle" in str(excinfo.value)
+
+    def test_unknown_dependency_and_duplicate_ids(self):
+        with pytest.raises(PlanError):
+            TaskGraph([{"id": "a", "depends_on": ["missing"]}])
+        with pytest.raises(PlanError):
+            TaskGraph([{"id": "a"}, {"id": "a"}])
+
+
+class TestListSchedule:
+    def test_caps_queue_excess_and_favour_critical_path(self):
+        tasks = [
+            {"id": "short", "agent": "w", "duration": 1},
+            {"id": "long", "agent": "w", "duration": 4},
+            {"id": "after-long", "agent": "x", "duration": 4, "depends_on": ["long"]},
+        ]
+        timeline, makespan = list_schedule(TaskGraph(tasks), caps={"w": 1})
+        starts = {entry["id"]: entry["start"] for entry in timeline}
+
+        assert starts == {"long": 0, "short": 4, "after-long": 4}
+        assert makespan == 8
+
+    def test_non_positive_caps_are_rejected(self):
+        graph = TaskGraph(_diamond())
+        with pytest.raises(ValueError):
+            list_schedule(graph, caps={"w": 0})
+        with pytest.raises(ValueError):
+            list_schedule(graph, default_cap=-1)
+        with pytest.raises(ValueError):
+            asyncio.run(execute(graph, lambda task: asyncio.sleep(0), caps={"w": 0}))
+
+    def test_large_plan_respects_dependencies_and_caps(self):
+        tasks = _random_plan(10_000)
+        started = time.perf_counter()
+        graph = TaskGraph(tasks)
+        timeline, makespan = list_schedule(graph, caps={"agent-0": 2}, default_cap=4)
+        elapsed = time.perf_counter() - started
+
+        ends = {entry["id"]: entry["end"] for entry in timeline}
+        assert all(entry["start"] >= ends[p] for entry in timeline for p in entry["depends_on"])
+        events = sorted([(e["end"], -1, e["agent"]) for e in timeline] + [(e["start"], 1, e["agent"]) for e in timeline])
+        running, peak = {}, {}
+        for _, delta, agent in events:
+            running[agent] = running.get(agent, 0) + delta
+            peak[agent] = max(peak.get(agent, 0), running[agent])
+        assert peak["agent-0"] <= 2 and max(peak.values()) <= 4
+        assert makespan >= graph.critical_length
+        assert elapsed < 2.0
+
+
+class TestExecute:
+    def test_dispatches_when_ready_and_honours_caps(self):
+        running = {"w": 0}
+        peak = {"w": 0}
+        order = []
+
+        async def run_task(task):
+            running[task["agent"]] += 1
+            peak[task["agent"]] = max(peak[task["agent"]], running[task["agent"]])
+            await asyncio.sleep(0.001 * task["duration"])
+            running[task["agent"]] -= 1
+            order.append(task["id"])
+            return task["id"].upper()
+
+        report = asyncio.run(execute(TaskGraph(_diamond()), run_task, caps={"w": 1}))
+
+        assert report["results"] == {"a": "A", "b": "B", "c": "C", "d": "D"}
+        assert order[0] == "a" and order[-1] == "d"
+        assert peak["w"] == 1
+
+    def test_failed_task_skips_only_its_descendants(self):
+        tasks = _diamond() + [{"id": "side", "agent": "w"}]
+
+        async def run_task(task):
+            if task["id"] == "c":
+                raise RuntimeError("render failed")
+            return task["id"]
+
+        report = asyncio.run(execute(TaskGraph(tasks), run_task))
+
+        assert set(report["results"]) == {"a", "b", "side"}
+        assert isinstance(report["errors"]["c"], RuntimeError)
+        assert report["skipped"] == ["d"]
+
+
+def _campaign():
+    return [
+        {"id": "brief", "agent": "planner", "duration": 1},
+        {"id": "script", "agent": "content", "duration": 5, "depends_on": ["brief"]},
+        {"id": "research", "agent": "trend", "duration": 2, "depends_on": ["brief"]},
+        {"id": "thumbnail", "agent": "content", "duration": 1, "depends_on": ["research"]},
+        {"id": "publish", "agent": "delivery", "duration": 1, "depends_on": ["script", "thumbnail"]},
+    ]
+
+
+class TestFailFast:
+    def test_critical_failure_cancels_in_flight_work_promptly(self):
+        ticks = {"research": 0}
+        notified = []
+
+        async def run_task(task):
+            if task["id"] == "script":
+                await asyncio.sleep(0.02)
+                raise RuntimeError("generation failed")
+            if task["id"] == "research":
+                for _ in range(200):
+                    await asyncio.sleep(0.005)
+                    ticks["research"] += 1
+            return task["id"]
+
+        async def scenario():
+            start = time.perf_counter()
+            report = await execute(TaskGraph(_campaign()), run_task, on_fail_fast=notified.append)
+            elapsed = time.perf_counter() - start
+            after = ticks["research"]
+            await asyncio.sleep(0.05)
+            return report, elapsed, after
+
+        report, elapsed, ticks_at_return = asyncio.run(scenario())
+
+        assert "script" in TaskGraph(_campaign()).critical_path()
+        assert report["cancelled"] == ["research"]
+        assert sorted(report["skipped"]) == ["publish", "thumbnail"]
+        assert isinstance(report["errors"]["script"], RuntimeError)
+        assert report["fail_fast"]["task"] == "script"
+        assert report["fail_fast"]["cancellation_ms"] < 50
+        assert notified == [report["fail_fast"]]
+        # Wasted work is bounded by the failure time, not the sibling's runtime.
+        assert elapsed < 0.2
+        assert ticks_at_return <= 10
+        assert ticks["research"] == ticks_at_return
+
+    def test_off_critical_path_failure_does_not_cancel(self):
+        async def run_task(task):
+            if task["id"] == "research":
+                raise RuntimeError("trend api down")
+            return task["id"]
+
+        report = asyncio.run(execute(TaskGraph(_campaign()), run_task))
+
+        assert set(report["results"]) == {"brief", "script"}
+        assert report["cancelled"] == [] and report["fail_fast"] is None
+        assert sorted(report["skipped"]) == ["publish", "thumbnail"]
+
+    def test_explicitly_critical_task_and_disabled_fail_fast(self):
+        tasks = _campaign()
+        tasks[2]["critical"] = True
+
+        async def run_task(task):
+            if task["id"] == "research":
+                raise RuntimeError("trend api down")
+            await asyncio.sleep(0.01)
+            return task["id"]
+
+        report = asyncio.run(execute(TaskGraph(tasks), run_task))
+        assert report["cancelled"] == ["script"]
+        assert report["fail_fast"]["task"] == "research"
+
+        report = asyncio.run(execute(TaskGraph(tasks), run_task, fail_fast=False))
+        assert set(report["results"]) == {"brief", "script"} and report["fail_fast"] is None
+
+    def test_compensating_hooks_run_most_recent_first(self):
+        released = []
+
+        async def run_task(task):
+            scope = current_scope()
+            if task["id"] == "brief":
+                scope.on_cancel(lambda: released.append("brief-budget"))
+                drop = scope.on_cancel(lambda: released.append("never"))
+                drop()
+                return task["id"]
+            if task["id"] == "research":
+
+                async def release_quota():
+                    released.append("trend-quota")
+
+                scope.on_cancel(release_quota)
+                await asyncio.sleep(1)
+            if task["id"] == "script":
+                await asyncio.sleep(0.01)
+                raise RuntimeError("generation failed")
+            return task["id"]
+
+        report = asyncio.run(execute(TaskGraph(_campaign()), run_task))
+
+        assert released == ["trend-quota", "brief-budget"]
+        assert report["fail_fast"]["hook_errors"] == []
+
+    def test_external_cancel_stops_the_plan(self):
+        scope = CancellationScope()
+
+        async def run_task(task):
+            await asyncio.sleep(1 if task["id"] == "script" else 0.001)
+            return task["id"]
+
+        async def scenario():
+            plan = asyncio.ensure_future(execute(TaskGraph(_campaign()), run_task, scope=scope))
+            await asyncio.sleep(0.05)
+            await scope.cancel("supervisor halted campaign")
+            return await plan
+
+        report = asyncio.run(scenario())
+
+        assert "script" in report["cancelled"]
+        assert "publish" in report["skipped"]
+        assert report["fail_fast"]["reason"] == "supervisor halted campaign"
+
+    def test_cancellation_reaches_tasks_running_on_workers(self):
+        started, finished = [], []
+
+        async def handler(worker, task):
+            started.append(task["id"])
+            await asyncio.sleep(task["seconds"])
+            if task["id"] == "script":
+                raise RuntimeError("generation failed")
+            finished.append(task["id"])
+            return task["id"]
+
+        async def scenario():
+            dispatcher = WorkStealingDispatcher([ContentWorker(), ContentWorker()], handler=handler)
+            dispatcher.start()
+
+            async def run_task(task):
+                seconds = {"script": 0.02, "research": 1.0}.get(task["id"], 0.0)
+                return await dispatcher.submit({"id": task["id"], "action": "generate_script", "seconds": seconds})
+
+            report = await execute(TaskGraph(_campaign()), run_task)
+            await asyncio.sleep(0.02)
+            metrics = dispatcher.metrics()
+            await dispatcher.stop()
+            return report, metrics
+
+        report, metrics = asyncio.run(scenario())
+
+        assert report["cancelled"] == ["research"]
+        assert "research" in started and "research" not in finished
+        assert metrics["queued"] == 0
@@ -0,0 +1,87 @@
+"""Tests for precompiled script templates and incremental regeneration."""
+
+import asyncio
+
+from chimera.agents.workers.script_templates import CompiledTemplate, ScriptTemplateEngine
+from chimera.benchmarks import script_generation
+
+
+def _counting_writer():
+    calls = []
+
+    async def writer(role, draft, inputs):
+        calls.append((role, draft))
+        await asyncio.sleep(0)
+        return draft
+
+    return writer, calls
+
+
+def test_template_is_compiled_into_parts_and_inputs():
+    template = CompiledTemplate("Main point: {topic} in {seconds} seconds about {topic}.")
+
+    assert template.fields == ("seconds", "topic")
+    assert template.render({"topic": "AI art", "seconds": 36}) == "Main point: AI art in 36 seconds about AI art."
+
+
+def test_script_matches_the_fixture_shape(sample_script):
+    script = asyncio.run(ScriptTemplateEngine().render("AI", 60, "educational", "youtube"))
+
+    assert set(sample_script) <= set(script)
+    assert [segment["segment"] for segment in script["content"]] == ["hook", "main", "conclusion", "cta"]
+    timestamps = [segment["timestamp"] for segment in script["content"]]
+    assert timestamps == sorted(timestamps) and timestamps[0] == 0 and timestamps[-1] < 60
+    assert script["content"][0]["text"].startswith("Hook: AI")
+
+
+def test_platforms_share_their_common_segments():
+    writer, calls = _counting_writer()
+    engine = ScriptTemplateEngine(writer)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(engine.render("ai art", 60, "educational", p) for p in ("tiktok", "youtube", "instagram", "twitter"))
+        )
+
+    scripts = asyncio.run(scenario())
+
+    hooks = {script["content"][0]["text"] for script in scripts}
+    assert len(hooks) == 1
+    assert [role for role, _ in calls].count("hook") == 1
+    # Three shared hooks, plus the main point tiktok and instagram give the same length.
+    assert sum(script["segmentsReused"] for script in scripts) == 4
+
+
+def test_only_segments_with_changed_inputs_are_regenerated():
+    writer, calls = _counting_writer()
+    engine = ScriptTemplateEngine(writer)
+    asyncio.run(engine.render("ai art", 60, "educational", "youtube"))
+    calls.clear()
+
+    shorter = asyncio.run(engine.render("ai art", 45, "educational", "youtube"))
+    assert [role for role, _ in calls] == ["main"]
+    assert shorter["segmentsRendered"] == 1 and shorter["segmentsReused"] == 3
+
+    calls.clear()
+    asyncio.run(engine.render("lo-fi beats", 45, "educational", "twitter"))
+    asyncio.run(engine.render("ai art", 45, "educational", "twitter"))
+    # The new topic needs both segments; the old one only a main point of twitter's length.
+    assert [role for role, _ in calls] == ["hook", "main", "main"]
+
+
+def test_skeletons_are_compiled_once():
+    engine = ScriptTemplateEngine()
+    first = engine.skeleton("tiktok", "news")
+
+    asyncio.run(engine.render("x", 30, "news", "tiktok"))
+
+    assert engine.skeleton("tiktok", "news") is first
+    assert engine.info()["skeletons"] == 1
+
+
+def test_benchmark_shows_fewer_writes_per_variant():
+    report = script_generation.run(latency_ms=0.0, durations=(60, 45))["results"]
+
+    full, incremental = report["full_rebuild"], report["incremental"]
+    assert incremental["duration_60s"]["segments_written_per_variant"] < full["duration_60s"]["segments_written_per_variant"]
+    assert incremental["duration_45s"]["segments_written_per_variant"] < 1
@@ -0,0 +1,82 @@
+"""Tests for the vectorised lexicon sentiment engine."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from chimera.agents.workers import TrendWorker
+from chimera.agents.workers.sentiment import Lexicon, SentimentEngine, aggregate
+from chimera.benchmarks import sentiment as bench
+
+
+@pytest.fixture(scope="module")
+def lexicon():
+    return Lexicon.load()
+
+
+def test_negators_and_boosters_shape_the_score(lexicon):
+    good, not_good, very_good, barely_good, unknown = lexicon.score(
+        ["good", "not good", "very good", "barely good", "zxqv blorp"]
+    )
+
+    assert good > 0 > not_good
+    assert very_good > good > barely_good > 0
+    assert unknown == 0.0
+
+
+def test_negation_does_not_leak_across_posts(lexicon):
+    scores = lexicon.score(["this is not", "great"])
+    assert scores[1] == pytest.approx(lexicon.score(["great"])[0])
+
+
+def test_tokenisation_edge_cases(lexicon):
+    scores = lexicon.score(["", "LOVE!!!", "don't love", "café love", "love\x00hate", "🔥 love 🔥"])
+    love = lexicon.score(["love"])[0]
+
+    assert scores[0] == 0.0
+    assert scores[1] == pytest.approx(love)
+    assert scores[2] < 0
+    assert scores[3] == pytest.approx(love)
+    assert len(scores) == 6 and scores[5] == pytest.approx(love)
+
+
+def test_matches_per_post_reference(lexicon):
+    posts = bench.posts_for(lexicon, 5_000, seed=4)
+    np.testing.assert_allclose(lexicon.score(posts), bench.score_loop(lexicon, posts), atol=1e-12)
+
+
+def test_aggregates_per_topic(lexicon):
+    posts = ["love it", "great stuff", "meh", "awful", "terrible and boring", "the video"]
+    topics = ["a", "a", "a", "b", "b", "b"]
+
+    profiles = aggregate(lexicon.score(posts), topics)
+
+    assert profiles["a"]["posts"] == 3 and profiles["a"]["sentiment"] > 0
+    assert profiles["b"]["sentiment"] < 0
+    assert profiles["b"]["negative"] == pytest.approx(2 / 3, abs=1e-4)
+    assert profiles["b"]["neutral"] == pytest.approx(1 / 3, abs=1e-4)
+
+
+def test_process_pool_gives_the_same_scores(lexicon):
+    posts = bench.posts_for(lexicon, 3_000, seed=5)
+    engine = SentimentEngine(lexicon, process_threshold=1_000, max_workers=2)
+    try:
+        pooled = engine.score(posts)
+        pooled_async = asyncio.run(engine.score_async(posts))
+    finally:
+        engine.close()
+
+    np.testing.assert_allclose(pooled, lexicon.score(posts))
+    np.testing.assert_allclose(pooled_async, pooled)
+
+
+def test_trend_worker_analyzes_a_batch_of_posts(lexicon):
+    worker = TrendWorker(sentiment=SentimentEngine(lexicon))
+
+    profile = asyncio.run(worker.analyze_sentiment("ai art", ["love this", "so good", "not great"]))
+    empty = asyncio.run(worker.analyze_sentiment("ai art"))
+
+    assert profile["posts"] == 3 and -1 <= profile["sentiment"] <= 1
+    assert profile["positive"] == pytest.approx(2 / 3, abs=1e-4)
+    assert empty == {"topic": "ai art", "sentiment": 0.0, "positive": 0.0, "negative": 0.0, "neutral": 1.0, "posts": 0}
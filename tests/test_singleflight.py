@@ -0,0 +1,82 @@
+"""Tests for shared single-flight calls."""
+
+import asyncio
+
+import pytest
+
+from chimera.core.singleflight import SingleFlight
+
+
+class Call:
+    def __init__(self, latency: float = 0.02, error: Exception | None = None) -> None:
+        self.latency = latency
+        self.error = error
+        self.runs = 0
+
+    async def __call__(self) -> int:
+        self.runs += 1
+        await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return self.runs
+
+
+def test_concurrent_callers_share_one_call():
+    flights, call = SingleFlight(), Call()
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("key", call) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert call.runs == 1
+    assert [shared for _, shared in results] == [False] + [True] * 9
+    assert {value for value, _ in results} == {1}
+    assert len(flights) == 0
+
+
+def test_failure_is_shared_with_every_waiter():
+    flights, call = SingleFlight(), Call(error=ConnectionError("down"))
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("key", call) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert call.runs == 1 and all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_cancelling_the_caller_running_the_call_does_not_cancel_waiters():
+    flights, call = SingleFlight(), Call()
+
+    async def scenario():
+        leader = asyncio.create_task(flights.do("key", call))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flights.do("key", call)) for _ in range(3)]
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(scenario())
+
+    # The first follower took over; the others shared its call.
+    assert call.runs == 2
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert {value for value, _ in results} == {2}
+
+
+def test_cancelled_waiter_leaves_the_call_running():
+    flights, call = SingleFlight(), Call()
+
+    async def scenario():
+        leader = asyncio.create_task(flights.do("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("key", call))
+        await asyncio.sleep(0.005)
+        follower.cancel()
+        return await leader
+
+    assert asyncio.run(scenario()) == (1, False)
+    assert call.runs == 1
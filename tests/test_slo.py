@@ -0,0 +1,73 @@
+"""Latency SLO gate for the Judge and Guardian (specs/agent_rules.md budgets).
+
+The budget checks measure wall-clock time and only run with ``--run-slow``.
+
+Set CHIMERA_SLO_BASELINE to a results file written by
+``chimera bench slo --baseline <path> --write-baseline`` to also fail on
+regressions against it; CHIMERA_SLO_MARGIN overrides the allowed margin.
+"""
+
+import json
+import os
+
+import pytest
+
+from chimera.benchmarks import slo
+from chimera.cli import main
+
+
+@pytest.fixture(scope="module")
+def results():
+    return slo.run(iterations=10, large_rules=2_000)
+
+
+@pytest.mark.slow
+def test_every_case_meets_its_budget(results):
+    assert slo.check(results) == []
+    assert {"guardian.evaluate/near_miss_flood", "judge.evaluate/script_50000"} <= set(results["cases"])
+
+
+@pytest.mark.slow
+def test_no_regression_against_stored_baseline(results):
+    path = os.environ.get("CHIMERA_SLO_BASELINE")
+    if not path:
+        pytest.skip("CHIMERA_SLO_BASELINE not set")
+    with open(path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    margin = float(os.environ.get("CHIMERA_SLO_MARGIN", slo.DEFAULT_MARGIN))
+    assert slo.check(results, baseline, margin) == []
+
+
+def test_regression_gate_respects_margin():
+    def results_with(p95, memory):
+        case = {
+            "p50_ms": 1.0,
+            "p95_ms": p95,
+            "p99_ms": p95,
+            "peak_memory_kb": memory,
+            "budget_ms": 500.0,
+            "within_budget": True,
+        }
+        return {"cases": {"judge.evaluate/x": case}}
+
+    baseline = results_with(10.0, 100.0)
+
+    assert slo.check(results_with(12.0, 110.0), baseline, margin=0.25) == []
+    failures = slo.check(results_with(13.0, 140.0), baseline, margin=0.25)
+    assert [failure.split(":")[1].split()[0] for failure in failures] == ["p95_ms", "peak_memory_kb"]
+
+
+def test_cli_writes_results_and_gates_on_baseline(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    output = tmp_path / "results.json"
+    args = ["bench", "slo", "--iterations", "3", "--large-rules", "0"]
+
+    assert main(args + ["--baseline", str(baseline), "--write-baseline"]) == 0
+    stored = json.loads(baseline.read_text())
+    for case in stored["cases"].values():
+        case["p50_ms"] = case["p95_ms"] = 0.0001
+    baseline.write_text(json.dumps(stored))
+
+    assert main(args + ["--baseline", str(baseline), "--output", str(output)]) == 1
+    assert json.loads(output.read_text())["failures"]
+    capsys.readouterr()
@@ -0,0 +1,295 @@
+"""Tests for the shared integration transport: client pool and token cache."""
+
+import asyncio
+import time
+
+import pytest
+
+from chimera.integrations import CoinbaseAgentKit, TikTokAdapter, YouTubeAdapter
+from chimera.integrations.transport import ClientPool, OAuthSession, TokenCache, h2
+
+
+class Refresher:
+    """Issues numbered tokens after ``latency`` seconds, or fails while ``failing``."""
+
+    def __init__(self, lifetime: float = 3600, latency: float = 0.01) -> None:
+        self.lifetime = lifetime
+        self.latency = latency
+        self.calls: list[dict | None] = []
+        self.failing = False
+
+    async def __call__(self, previous: dict | None) -> dict:
+        self.calls.append(previous)
+        await asyncio.sleep(self.latency)
+        if self.failing:
+            raise ConnectionError("token endpoint unavailable")
+        return {"access_token": f"token-{len(self.calls)}", "expires_in": self.lifetime}
+
+
+def test_pool_shares_one_client_per_origin():
+    pool = ClientPool()
+
+    async def scenario():
+        try:
+            first = pool.client("https://www.googleapis.com/upload/youtube/v3/videos")
+            same = pool.client("https://www.googleapis.com/youtube/v3/videos")
+            other = pool.client("https://open.tiktokapis.com/v2/oauth/token/")
+            return first, same, other, len(pool)
+        finally:
+            await pool.aclose()
+
+    first, same, other, clients = asyncio.run(scenario())
+
+    assert first is same and first is not other and clients == 2
+    assert pool.http2 == (h2 is not None)
+
+
+def test_pool_gives_each_event_loop_its_own_client():
+    pool = ClientPool()
+
+    async def get():
+        return pool.client("https://api.cdp.coinbase.com")
+
+    first = asyncio.run(get())
+    second = asyncio.run(get())
+    assert first is not second
+    # Each was closed as its loop shut down.
+    assert first.is_closed and second.is_closed
+
+
+def test_pool_closes_a_replaced_client_on_its_own_loop():
+    pool = ClientPool()
+
+    async def get():
+        return pool.client("https://api.cdp.coinbase.com")
+
+    loop = asyncio.new_event_loop()
+    try:
+        old = loop.run_until_complete(get())
+        asyncio.run(get())
+        assert not old.is_closed
+        loop.run_until_complete(asyncio.sleep(0.01))
+        assert old.is_closed
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def test_adapters_share_connections_through_the_pool(upload_server, tmp_path):
+    pool, tokens = ClientPool(), TokenCache()
+    options = {
+        "upload_url": upload_server.endpoint,
+        "pool": pool,
+        "tokens": tokens,
+        "token_url": upload_server.token_url,
+        "account": "channel-1",
+    }
+    adapters = [YouTubeAdapter("id", "secret", **options) for _ in range(2)]
+    videos = []
+    for index, adapter in enumerate(adapters):
+        adapter.uploader.state_dir = str(tmp_path / "state")
+        adapter.uploader.concurrency = 1
+        video = tmp_path / f"video-{index}.mp4"
+        video.write_bytes(b"frame" * 4000)
+        videos.append(str(video))
+
+    async def scenario():
+        try:
+            await adapters[0].authenticate("code")
+            for adapter, video in zip(adapters, videos):
+                await adapter.upload_video(video, "title", "description", [])
+            return adapters[0].uploader.client is adapters[1].uploader.client
+        finally:
+            await pool.aclose()
+            await tokens.aclose()
+
+    assert asyncio.run(scenario())
+    # One authentication serves both adapters of the same app and account,
+    # and every request rode the same keep-alive connection.
+    assert len(upload_server.token_requests) == 1
+    assert upload_server.authorizations == {"Bearer token-1"}
+    assert len(upload_server.connections) == 1
+
+
+def test_accounts_of_one_app_do_not_share_a_token(upload_server):
+    tokens = TokenCache()
+    options = {"tokens": tokens, "token_url": upload_server.token_url, "upload_url": upload_server.endpoint}
+    first, second = (YouTubeAdapter("id", "secret", account=account, **options) for account in ("a", "b"))
+
+    async def scenario():
+        try:
+            await first.authenticate("code")
+            with pytest.raises(LookupError):
+                await second.oauth.access_token()
+            return await first.oauth.access_token()
+        finally:
+            await tokens.aclose()
+
+    assert asyncio.run(scenario()) == "token-1"
+    assert first.oauth.key == "youtube:id:a" and second.oauth.key == "youtube:id:b"
+
+
+def test_rejected_token_is_invalidated_and_the_request_retried(upload_server, tmp_path):
+    tokens = TokenCache()
+    adapter = YouTubeAdapter(
+        "id", "secret", upload_server.endpoint, tokens=tokens, token_url=upload_server.token_url, account="a"
+    )
+    adapter.uploader.state_dir = str(tmp_path / "state")
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"frame" * 4000)
+
+    async def scenario():
+        try:
+            await adapter.authenticate("code")
+            upload_server.revoked.add("token-1")
+            return await adapter.upload_video(str(video), "title", "description", [])
+        finally:
+            await tokens.aclose()
+
+    video_id = asyncio.run(scenario())
+
+    assert upload_server.videos[video_id] == video.read_bytes()
+    assert [request["grant_type"] for request in upload_server.token_requests] == [
+        "authorization_code",
+        "refresh_token",
+    ]
+
+
+def test_concurrent_callers_share_one_refresh():
+    tokens = TokenCache()
+    refresher = Refresher(latency=0.05)
+    tokens.register("youtube:id", refresher)
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(tokens.get("youtube:id") for _ in range(50)))
+        finally:
+            await tokens.aclose()
+
+    assert set(asyncio.run(scenario())) == {"token-1"}
+    assert len(refresher.calls) == 1
+
+
+def test_tokens_are_refreshed_in_the_background_before_they_expire():
+    tokens = TokenCache(refresh_margin=0.2)
+    refresher = Refresher(lifetime=0.6, latency=0.05)
+
+    async def scenario():
+        try:
+            tokens.put("tiktok:key", {"access_token": "initial", "expires_in": 0.6}, refresher)
+            await asyncio.sleep(0.55)
+            # The background refresh ran at 0.4s, so the token is current without waiting.
+            start = time.perf_counter()
+            token = await tokens.get("tiktok:key")
+            return token, time.perf_counter() - start
+        finally:
+            await tokens.aclose()
+
+    token, waited = asyncio.run(scenario())
+
+    assert token == "token-1" and waited < 0.01
+    assert refresher.calls == [{"access_token": "initial", "expires_in": 0.6}]
+
+
+def test_failed_background_refresh_keeps_the_current_token():
+    tokens = TokenCache(refresh_margin=0.1)
+    refresher = Refresher(lifetime=0.3, latency=0)
+    refresher.failing = True
+
+    async def scenario():
+        try:
+            tokens.put("youtube:id", {"access_token": "initial", "expires_in": 0.3}, refresher)
+            await asyncio.sleep(0.22)
+            during = await tokens.get("youtube:id")
+            await asyncio.sleep(0.01)
+            refresher.failing = False
+            await asyncio.sleep(0.1)
+            after = await tokens.get("youtube:id")
+            return during, after
+        finally:
+            await tokens.aclose()
+
+    during, after = asyncio.run(scenario())
+
+    assert during == "initial"
+    assert after.startswith("token-")
+
+
+def test_invalidated_token_is_refreshed_with_its_refresh_token():
+    tokens = TokenCache()
+    refresher = Refresher()
+
+    async def scenario():
+        try:
+            tokens.put("youtube:id", {"access_token": "a", "refresh_token": "r", "expires_in": 3600}, refresher)
+            tokens.invalidate("youtube:id")
+            first = await tokens.get("youtube:id")
+            tokens.invalidate("youtube:id")
+            await tokens.get("youtube:id")
+            return first
+        finally:
+            await tokens.aclose()
+
+    assert asyncio.run(scenario()) == "token-1"
+    # The provider left the refresh token out; the cached one was carried forward.
+    assert [previous["refresh_token"] for previous in refresher.calls] == ["r", "r"]
+
+
+def test_unknown_credential_needs_authentication():
+    with pytest.raises(LookupError):
+        asyncio.run(TokenCache().get("tiktok:nobody"))
+
+
+def test_oauth_session_exchanges_the_code_then_refreshes(upload_server):
+    pool, tokens = ClientPool(), TokenCache()
+    session = OAuthSession(
+        "tiktok:key",
+        upload_server.token_url,
+        {"client_key": "key", "client_secret": "secret"},
+        pool,
+        tokens,
+        account_field="open_id",
+    )
+
+    async def scenario():
+        try:
+            issued = await session.authenticate("code", "https://example.com/callback")
+            tokens.invalidate(session.key)
+            return issued, await session.access_token()
+        finally:
+            await pool.aclose()
+            await tokens.aclose()
+
+    assert asyncio.run(scenario()) == ("token-1", "token-2")
+    assert session.key == "tiktok:key:user-1"
+    exchange, refresh = upload_server.token_requests
+    assert exchange["grant_type"] == "authorization_code" and exchange["code"] == "code"
+    assert exchange["redirect_uri"] == "https://example.com/callback" and exchange["client_key"] == "key"
+    assert refresh["grant_type"] == "refresh_token" and refresh["refresh_token"] == "refresh"
+
+
+def test_adapter_defaults_share_the_process_wide_pool_and_cache():
+    gateway = "https://uploads.example.com/upload"
+    youtube, tiktok = YouTubeAdapter("id", "secret", gateway), TikTokAdapter("key", "secret", gateway)
+    assert youtube.oauth.pool is tiktok.oauth.pool
+    assert youtube.oauth.tokens is tiktok.oauth.tokens
+
+
+def test_agent_kits_with_one_api_key_share_a_token():
+    tokens = TokenCache()
+    issued = Refresher(latency=0.02)
+
+    class Kit(CoinbaseAgentKit):
+        async def _issue_token(self, previous):
+            return await issued(previous)
+
+    kits = [Kit("key", "secret", tokens=tokens) for _ in range(3)]
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(kit.access_token() for kit in kits for _ in range(5)))
+        finally:
+            await tokens.aclose()
+
+    assert set(asyncio.run(scenario())) == {"token-1"}
+    assert len(issued.calls) == 1
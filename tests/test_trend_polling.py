@@ -0,0 +1,170 @@
+"""Tests for adaptive trend polling and the Trend Worker."""
+
+import asyncio
+
+import pytest
+
+from chimera.agents.workers import TrendWorker
+from chimera.agents.workers.ratelimit import TokenBucket
+from chimera.agents.workers.trend_polling import AdaptivePollingScheduler, RateLimited, urgency_for
+from chimera.benchmarks import trend_polling
+
+
+def _recorder(responses):
+    """Fetcher returning ``responses[(platform, niche)](call_number)`` and logging call times."""
+    calls = {}
+
+    async def fetch(platform, niche):
+        times = calls.setdefault((platform, niche), [])
+        times.append(asyncio.get_running_loop().time())
+        return responses[(platform, niche)](len(times))
+
+    return fetch, calls
+
+
+def test_urgency_follows_velocity_thresholds():
+    assert [urgency_for(v) for v in (50, 250, 700, 1500)] == ["low", "medium", "high", "critical"]
+
+
+def test_rising_feed_speeds_up_and_quiet_feed_backs_off():
+    responses = {
+        ("tiktok", "fitness"): lambda n: [{"topic": "quiet", "velocity": 0.0}],
+        ("tiktok", "gaming"): lambda n: [{"topic": "rising", "velocity": 40.0 * n}],
+    }
+    fetch, calls = _recorder(responses)
+    scheduler = AdaptivePollingScheduler(
+        fetch, ["tiktok"], ["fitness", "gaming"], check_every=0.02, alert_threshold=200,
+        requests_per_minute=60_000, max_interval=0.06, seed=1,
+    )
+
+    detected = asyncio.run(scheduler.run(0.5))
+
+    feeds = scheduler.stats()["feeds"]
+    assert feeds["tiktok/fitness"]["interval"] == pytest.approx(0.06)
+    assert feeds["tiktok/gaming"]["interval"] == pytest.approx(0.005)
+    assert len(calls[("tiktok", "gaming")]) > 2 * len(calls[("tiktok", "fitness")])
+    assert [trend["topic"] for trend in detected] == ["rising"]
+
+
+def test_start_times_are_jittered():
+    responses = {("youtube", f"n{i}"): (lambda n: []) for i in range(8)}
+    fetch, calls = _recorder(responses)
+    scheduler = AdaptivePollingScheduler(
+        fetch, ["youtube"], [f"n{i}" for i in range(8)], check_every=0.1,
+        requests_per_minute=60_000, seed=2,
+    )
+
+    asyncio.run(scheduler.run(0.09))
+
+    first = sorted(times[0] for times in calls.values())
+    assert len(first) >= 4
+    assert first[-1] - first[0] > 0.02
+
+
+def test_global_budget_caps_requests():
+    responses = {("twitter", f"n{i}"): (lambda n: []) for i in range(6)}
+    fetch, calls = _recorder(responses)
+    scheduler = AdaptivePollingScheduler(
+        fetch, ["twitter"], [f"n{i}" for i in range(6)], check_every=0.005,
+        requests_per_minute=1200, adaptive=False, seed=3,
+    )
+
+    asyncio.run(scheduler.run(0.3))
+
+    # 20 requests/s for 0.3s plus the initial burst of 3.
+    assert scheduler.calls <= 3 + 20 * 0.3 + 1
+
+
+def test_rate_limited_feed_waits_for_retry_after():
+    async def fetch(platform, niche):
+        fetch.times.append(asyncio.get_running_loop().time())
+        if len(fetch.times) == 1:
+            raise RateLimited(retry_after=0.15)
+        return []
+
+    fetch.times = []
+    scheduler = AdaptivePollingScheduler(
+        fetch, ["twitter"], ["ai"], check_every=0.01, requests_per_minute=60_000, max_interval=0.02,
+    )
+
+    asyncio.run(scheduler.run(0.25))
+
+    assert scheduler.stats()["rate_limited"] == 1
+    assert fetch.times[1] - fetch.times[0] >= 0.15
+
+
+def test_token_bucket_refills_at_its_rate():
+    async def scenario():
+        bucket = TokenBucket(rate=100, capacity=2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(7):
+            await bucket.acquire()
+        return loop.time() - start, bucket.try_acquire()
+
+    elapsed, immediate = asyncio.run(scenario())
+    assert 0.045 <= elapsed < 0.2
+    assert immediate is False
+
+
+def test_discover_trends_filters_merges_and_ranks():
+    observations = {
+        "tiktok": [
+            {"topic": "AI Art filters", "velocity": 650, "keywords": ["ai art"], "engagement": 0.4},
+            {"topic": "cat videos", "velocity": 900},
+            {"topic": "slow burn", "velocity": 50, "keywords": ["ai art"]},
+        ],
+        "youtube": [
+            {"topic": "ai art  filters", "velocity": 1200, "keywords": ["filters"], "engagement": 0.4},
+            {"topic": "ai art tutorials", "velocity": 300, "keywords": ["ai art"], "engagement": 0.9},
+        ],
+    }
+
+    async def fetch(platform, niche):
+        return observations[platform]
+
+    worker = TrendWorker(fetcher=fetch, requests_per_minute=6000)
+    trends = asyncio.run(
+        worker.discover_trends(["tiktok", "youtube"], ["ai art"], {"checkEvery": 10, "alertThreshold": 200})
+    )
+
+    assert [trend["topic"] for trend in trends] == ["ai art tutorials", "AI Art filters"]
+    merged = trends[1]
+    assert merged["platform"] == "youtube" and merged["urgency"] == "critical"
+    assert merged["keywords"] == ["ai art", "filters"]
+    assert worker.last_poll_stats["calls"] == 2
+
+
+def test_discoveries_keep_their_polling_state_and_share_one_budget():
+    volumes = iter([100.0, 400.0, 400.0])
+
+    async def fetch(platform, niche):
+        return [{"topic": "ai art drops", "volume": next(volumes)}]
+
+    worker = TrendWorker(fetcher=fetch, requests_per_minute=6000)
+    time_range = {"checkEvery": 10, "alertThreshold": 200}
+    first = asyncio.run(worker.discover_trends(["tiktok"], ["ai art"], time_range))
+    second = asyncio.run(worker.discover_trends(["tiktok"], ["ai art"], time_range))
+
+    # The second poll measured its velocity against the first one's volume.
+    assert first == [] and [trend["topic"] for trend in second] == ["ai art drops"]
+    assert len(worker._schedulers) == 1
+    scheduler = next(iter(worker._schedulers.values()))
+    assert scheduler.budget is worker.budget
+    # Each run keeps only its own detections.
+    assert asyncio.run(scheduler.run(0)) == [] and scheduler.detections == []
+    assert scheduler.stats()["detections"] == 1
+
+
+def test_discover_trends_needs_a_fetcher():
+    with pytest.raises(RuntimeError):
+        asyncio.run(TrendWorker().discover_trends(["tiktok"], ["ai"], {}))
+
+
+def test_adaptive_polling_beats_fixed_interval_in_simulation():
+    report = trend_polling.run(duration=420.0, spikes=4, scale=500.0)
+    fixed, adaptive = report["results"]["fixed_interval"], report["results"]["adaptive"]
+
+    assert adaptive["detected"] == adaptive["spikes"]
+    assert adaptive["latency_max_s"] < 30
+    assert adaptive["upstream_calls"] < fixed["upstream_calls"]
@@ -0,0 +1,187 @@
+"""Tests for resumable chunked uploads against a local fake upload server."""
+
+import asyncio
+import hashlib
+import os
+
+import httpx
+import pytest
+
+from chimera.agents.workers.delivery_worker import DeliveryWorker
+from chimera.agents.workers.publishing import PlatformLimiter
+from chimera.integrations import TikTokAdapter, YouTubeAdapter
+from chimera.integrations.transport import TokenCache
+from chimera.integrations.uploads import ChunkedUploader, ContentMismatch, UploadError
+
+CHUNK = 64 * 1024
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(os.urandom(CHUNK * 5 + CHUNK // 2))
+    return path
+
+
+def _uploader(server, tmp_path, **kwargs) -> ChunkedUploader:
+    return ChunkedUploader(server.endpoint, chunk_size=CHUNK, state_dir=str(tmp_path / "state"), **kwargs)
+
+
+def _upload(uploader: ChunkedUploader, *args, **kwargs) -> dict:
+    async def scenario():
+        try:
+            return await uploader.upload(*args, **kwargs)
+        finally:
+            await uploader.aclose()
+
+    return asyncio.run(scenario())
+
+
+def test_upload_sends_every_chunk_and_hashes_in_the_same_pass(upload_server, video, tmp_path):
+    result = _upload(_uploader(upload_server, tmp_path, concurrency=3), str(video), {"title": "t"})
+
+    data = video.read_bytes()
+    assert result["sha256"] == hashlib.sha256(data).hexdigest()
+    assert result["chunks"] == 6 and result["resumed_chunks"] == 0
+    assert upload_server.videos[result["video_id"]] == data
+    # Chunks share the pooled keep-alive connections.
+    assert len(upload_server.connections) <= 3
+    assert not os.listdir(tmp_path / "state")
+
+
+def test_failed_upload_resumes_from_the_last_acknowledged_chunk(upload_server, video, tmp_path):
+    upload_server.fail_after = 2
+    with pytest.raises(UploadError):
+        _upload(_uploader(upload_server, tmp_path, concurrency=1, chunk_attempts=1), str(video))
+    assert len(os.listdir(tmp_path / "state")) == 1
+
+    upload_server.fail_after = None
+    result = _upload(_uploader(upload_server, tmp_path, concurrency=2), str(video))
+
+    assert result["resumed_chunks"] == 2
+    assert upload_server.chunk_puts == result["chunks"]
+    assert upload_server.videos[result["video_id"]] == video.read_bytes()
+
+
+def test_a_failed_chunk_fails_the_upload_at_any_concurrency(video, tmp_path):
+    requests = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        if request.url.path == "/upload":
+            return httpx.Response(200, json={"upload_id": "u1"})
+        if request.url.path == "/upload/u1/chunks/1":
+            return httpx.Response(503)
+        return httpx.Response(200, json={"video_id": "v1"})
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(respond)) as client:
+            uploader = ChunkedUploader(
+                "http://platform.test/upload", client, chunk_size=CHUNK, concurrency=3, state_dir=str(tmp_path)
+            )
+            await uploader.upload(str(video))
+
+    with pytest.raises(UploadError) as failure:
+        asyncio.run(scenario())
+
+    assert failure.value.status == 503
+    assert ("POST", "/upload/u1/complete") not in requests
+
+
+def test_changed_file_starts_a_new_upload(upload_server, video, tmp_path):
+    upload_server.fail_after = 2
+    with pytest.raises(UploadError):
+        _upload(_uploader(upload_server, tmp_path, concurrency=1, chunk_attempts=1), str(video))
+
+    upload_server.fail_after = None
+    video.write_bytes(os.urandom(CHUNK * 2))
+    result = _upload(_uploader(upload_server, tmp_path), str(video))
+
+    assert result["resumed_chunks"] == 0
+    assert upload_server.videos[result["video_id"]] == video.read_bytes()
+
+
+def test_hash_mismatch_abandons_the_upload(upload_server, video, tmp_path):
+    with pytest.raises(ContentMismatch):
+        _upload(_uploader(upload_server, tmp_path), str(video), expected_sha256="0" * 64)
+
+    assert upload_server.sessions == {} and upload_server.videos == {}
+
+
+def test_empty_file_uploads(upload_server, tmp_path):
+    path = tmp_path / "empty.mp4"
+    path.write_bytes(b"")
+
+    result = _upload(_uploader(upload_server, tmp_path), str(path))
+
+    assert result["chunks"] == 0 and result["sha256"] == hashlib.sha256(b"").hexdigest()
+
+
+def test_delivery_worker_uploads_through_platform_adapters(upload_server, video, tmp_path):
+    state = str(tmp_path / "state")
+    youtube = YouTubeAdapter(
+        "id", "secret", upload_url=upload_server.endpoint, tokens=TokenCache(), token_url=upload_server.token_url
+    )
+    worker = DeliveryWorker(
+        {
+            "youtube": youtube,
+            "tiktok": TikTokAdapter("key", "secret", uploader=_uploader(upload_server, tmp_path)),
+        }
+    )
+    worker.adapters["youtube"].uploader.state_dir = state
+    approved = hashlib.sha256(video.read_bytes()).hexdigest()
+
+    async def scenario():
+        assert await worker.authenticate("youtube", {"auth_code": "code"}) == "token-1"
+        metadata = {"title": "AI art", "tags": ["ai"], "contentHash": approved}
+        ids = [await worker.upload_video(str(video), metadata, p) for p in ("youtube", "tiktok")]
+        for adapter in worker.adapters.values():
+            await adapter.uploader.aclose()
+        return ids
+
+    ids = asyncio.run(scenario())
+
+    assert len(set(ids)) == 2 and all(upload_server.videos[i] == video.read_bytes() for i in ids)
+    assert upload_server.authorizations == {"Bearer token-1"}
+    with pytest.raises(ValueError):
+        TikTokAdapter("key", "secret")
+    with pytest.raises(ValueError):
+        asyncio.run(worker.upload_video(str(video), {}, "instagram"))
+
+
+def test_rate_limited_upload_is_rescheduled_and_resumes(upload_server, video, tmp_path):
+    upload_server.fail_after, upload_server.fail_status, upload_server.failures = 3, 429, 1
+    uploader = _uploader(upload_server, tmp_path, concurrency=1)
+    worker = DeliveryWorker(
+        {"tiktok": TikTokAdapter("key", "secret", uploader=uploader)},
+        limiter=PlatformLimiter({"tiktok": (60_000.0, 10.0)}),
+    )
+
+    async def scenario():
+        try:
+            return await worker.upload_video(str(video), {"title": "AI art", "credential": "acct"}, "tiktok")
+        finally:
+            await worker.publisher.close()
+            await uploader.aclose()
+
+    video_id = asyncio.run(scenario())
+
+    assert upload_server.videos[video_id] == video.read_bytes()
+    assert worker.publisher.stats["rate_limited"] == 1 and worker.publisher.stats["retried"] == 0
+    assert upload_server.chunk_puts == 6
+
+
+def test_worker_publishes_from_successive_event_loops_and_learns_from_success(upload_server, video, tmp_path):
+    worker = DeliveryWorker(
+        {"tiktok": TikTokAdapter("key", "secret", uploader=_uploader(upload_server, tmp_path))},
+        limiter=PlatformLimiter({"tiktok": (60_000.0, 10.0)}),
+    )
+    metadata = {"title": "AI art", "credential": "acct"}
+
+    first = asyncio.run(worker.upload_video(str(video), metadata, "tiktok"))
+    upload_server.complete_headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"}
+    second = asyncio.run(worker.upload_video(str(video), metadata, "tiktok"))
+
+    assert first != second and upload_server.videos[second] == video.read_bytes()
+    # The successful upload's headers said the quota is spent.
+    assert worker.limiter.delay("tiktok", "acct") > 25
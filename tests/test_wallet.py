@@ -0,0 +1,159 @@
+"""Tests for the local wallet state and concurrent transfers."""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from chimera.agents.workers import EconomicWorker
+from chimera.agents.workers.wallet import InsufficientFunds, WalletState
+from chimera.benchmarks import wallet_transfers
+from chimera.benchmarks.wallet_transfers import SimulatedAgentKit
+
+
+def test_concurrent_transfers_read_the_balance_once_and_use_distinct_nonces():
+    kit = SimulatedAgentKit({"USDC": 100}, latency_ms=1)
+    worker = EconomicWorker(kit)
+
+    async def scenario():
+        results = await asyncio.gather(*(worker.transfer(f"0x{i:040x}", 1.5, "USDC") for i in range(40)))
+        return results, await worker.get_balance()
+
+    results, balance = asyncio.run(scenario())
+
+    assert kit.balance_reads == 1
+    assert sorted(result["nonce"] for result in results) == list(range(40))
+    assert balance["balances"]["USDC"] == float(kit.balances["USDC"]) == 40.0
+    assert balance["reserved"]["USDC"] == 0
+
+
+def test_reservations_stop_concurrent_overdraft_before_sending():
+    kit = SimulatedAgentKit({"USDC": 10})
+    worker = EconomicWorker(kit)
+
+    async def scenario():
+        return await asyncio.gather(*(worker.transfer("0xabc", 4, "USDC") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert sum(isinstance(result, InsufficientFunds) for result in results) == 1
+    assert kit.sends == 2 and kit.balances["USDC"] == Decimal(2)
+
+
+def test_failed_send_releases_funds_and_nonce_and_refreshes():
+    kit = SimulatedAgentKit({"USDC": 10})
+    worker = EconomicWorker(kit)
+    kit.used_nonces.add(0)  # someone else used nonce 0 behind our back
+
+    async def scenario():
+        await worker.get_balance()
+        kit.used_nonces.add(1)
+        with pytest.raises(wallet_transfers.NonceError):
+            await worker.transfer("0xabc", 3, "USDC")
+        return await worker.transfer("0xabc", 3, "USDC")
+
+    result = asyncio.run(scenario())
+
+    assert kit.balance_reads == 2
+    assert result["nonce"] == 2 and result["status"] == "confirmed"
+    assert worker.wallet.available("USDC") == Decimal(7)
+
+
+def test_send_that_may_have_been_broadcast_keeps_its_nonce():
+    class TimeoutAfterBroadcastKit(SimulatedAgentKit):
+        timing_out = True
+
+        async def send_transaction(self, recipient, amount, asset, nonce=None):
+            receipt = await super().send_transaction(recipient, amount, asset, nonce)
+            if self.timing_out:
+                raise TimeoutError("no receipt")
+            return receipt
+
+    kit = TimeoutAfterBroadcastKit({"USDC": 10})
+    worker = EconomicWorker(kit)
+
+    async def scenario():
+        with pytest.raises(TimeoutError):
+            await worker.transfer("0xabc", 3, "USDC")
+        reads = kit.balance_reads
+        kit.timing_out = False
+        return reads, await worker.transfer("0xabc", 3, "USDC")
+
+    reads, result = asyncio.run(scenario())
+
+    # The wallet was fetched again before the error surfaced, and nonce 0 was not reused.
+    assert reads == 2
+    assert result["nonce"] == 1 and result["status"] == "confirmed"
+    assert worker.wallet.available("USDC") == Decimal(4)
+
+
+def test_pending_transfer_holds_funds_until_reconciled():
+    kit = SimulatedAgentKit({"USDC": 10}, status="pending")
+    worker = EconomicWorker(kit)
+
+    async def scenario():
+        sent = await worker.transfer("0xabc", 6, "USDC")
+        during = worker.wallet.available("USDC")
+        # A refresh after it was mined must not count it twice.
+        await worker.wallet.refresh()
+        worker.reconcile(sent["transactionId"], "confirmed")
+        return during, await worker.get_balance()
+
+    during, balance = asyncio.run(scenario())
+
+    assert during == Decimal(4)
+    assert balance["available"]["USDC"] == 4.0 and balance["pending"] == 0
+
+
+def test_state_refreshes_on_schedule_not_per_call():
+    now = [0.0]
+    reads = []
+
+    async def fetch():
+        reads.append(now[0])
+        return {"balances": {"ETH": "1.0"}, "nonce": 0}
+
+    wallet = WalletState(fetch, refresh_interval=30, clock=lambda: now[0])
+
+    async def scenario():
+        for step in range(10):
+            now[0] = step * 10.0
+            reservation = await wallet.reserve("ETH", "0.01")
+            wallet.confirm(reservation)
+
+    asyncio.run(scenario())
+
+    assert reads == [0.0, 30.0, 60.0, 90.0]
+
+
+def test_confirmation_during_a_refresh_is_not_lost():
+    release = asyncio.Event()
+    chain = {"balances": {"USDC": "10"}, "nonce": 0}
+
+    async def fetch():
+        snapshot = {"balances": dict(chain["balances"]), "nonce": chain["nonce"]}
+        await release.wait()
+        return snapshot
+
+    wallet = WalletState(fetch)
+
+    async def scenario():
+        release.set()
+        reservation = await wallet.reserve("USDC", 4)
+        release.clear()
+        refreshing = asyncio.create_task(wallet.refresh())
+        await asyncio.sleep(0)
+        wallet.confirm(reservation)  # the fetch started before this landed
+        release.set()
+        await refreshing
+        return wallet.available("USDC")
+
+    assert asyncio.run(scenario()) == Decimal(6)
+
+
+def test_benchmark_reads_the_balance_once():
+    report = wallet_transfers.run(transfers=50, latency_ms=0.0)["results"]
+
+    assert report["per_call"]["balance_reads"] == 50
+    assert report["wallet_state"]["balance_reads"] == 1
+    assert report["wallet_state"]["final_balance"] == report["per_call"]["final_balance"]
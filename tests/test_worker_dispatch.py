@@ -0,0 +1,107 @@
+"""Tests for work-stealing dispatch across worker agents."""
+
+import asyncio
+
+import pytest
+
+from chimera.agents.workers import (
+    ContentWorker,
+    DeliveryWorker,
+    NoCapableWorker,
+    TrendWorker,
+    WorkStealingDispatcher,
+)
+from chimera.agents.workers.dispatch import capabilities_of
+
+
+async def _sleep_handler(worker, task):
+    await asyncio.sleep(task.get("service", 0))
+    return type(worker).__name__
+
+
+def test_capabilities_come_from_worker_methods():
+    assert {"generate_script", "edit_video", "synthesize_voiceover"} == capabilities_of(ContentWorker())
+
+
+def test_tasks_only_run_on_capable_workers():
+    async def scenario():
+        dispatcher = WorkStealingDispatcher([TrendWorker(), ContentWorker(), ContentWorker()], _sleep_handler)
+        dispatcher.start()
+        try:
+            ran_on = await asyncio.gather(
+                dispatcher.submit({"action": "generate_script"}),
+                dispatcher.submit({"action": "discover_trends"}),
+            )
+            with pytest.raises(NoCapableWorker):
+                dispatcher.submit({"action": "upload_video"})
+        finally:
+            await dispatcher.stop()
+        return ran_on
+
+    assert asyncio.run(scenario()) == ["ContentWorker", "TrendWorker"]
+
+
+def test_idle_peers_steal_from_a_backed_up_worker():
+    async def scenario():
+        dispatcher = WorkStealingDispatcher([DeliveryWorker() for _ in range(4)], _sleep_handler)
+        dispatcher.start()
+        futures = [
+            dispatcher.submit({"action": "upload_video", "service": 0.01}, worker_id="DeliveryWorker-1")
+            for _ in range(20)
+        ]
+        await asyncio.gather(*futures)
+        metrics = dispatcher.metrics()
+        await dispatcher.stop()
+        return metrics
+
+    metrics = asyncio.run(scenario())
+
+    assert metrics["executed"] == 20
+    assert metrics["steals"] > 0
+    assert metrics["workers"]["DeliveryWorker-1"]["stolen_from"] == metrics["steals"]
+    assert all(stats["executed"] > 0 for stats in metrics["workers"].values())
+    assert all(0 < stats["utilisation"] <= 1 for stats in metrics["workers"].values())
+
+
+def test_higher_priority_lanes_run_first():
+    order = []
+
+    async def record(worker, task):
+        order.append(task["priority"])
+
+    async def scenario():
+        dispatcher = WorkStealingDispatcher([TrendWorker()], record)
+        futures = [
+            dispatcher.submit({"action": "map_topics", "priority": priority})
+            for priority in ("low", "medium", "critical", "high")
+        ]
+        dispatcher.start()
+        await asyncio.gather(*futures)
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+
+    assert order == ["critical", "high", "medium", "low"]
+
+
+def test_handler_errors_reach_the_caller_and_stop_cancels_queued():
+    async def boom(worker, task):
+        if task.get("fail"):
+            raise RuntimeError("quota exceeded")
+        await asyncio.sleep(1)
+
+    async def scenario():
+        dispatcher = WorkStealingDispatcher([TrendWorker()], boom)
+        dispatcher.start()
+        failing = dispatcher.submit({"action": "map_topics", "priority": "critical", "fail": True})
+        with pytest.raises(RuntimeError):
+            await failing
+        slow = dispatcher.submit({"action": "map_topics"})
+        queued = dispatcher.submit({"action": "map_topics"})
+        await asyncio.sleep(0)
+        await dispatcher.stop()
+        return slow, queued
+
+    slow, queued = asyncio.run(scenario())
+
+    assert slow.cancelled() and queued.cancelled()